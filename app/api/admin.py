@@ -1,10 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, Optional
 
 from app.application.active_ingestion_service import TenderIngestionService
 from app.application.daily_ingestion_runner import DailyIngestionRunner
-from app.dependencies import get_active_ingestion_service, require_admin_token, get_daily_ingestion_runner
-from app.domain.schemas import LicitacionEstado
+from app.dependencies import (
+    get_active_ingestion_service,
+    require_admin_token,
+    get_daily_ingestion_runner,
+    get_mp_rate_limiter,
+    get_mp_detail_cache,
+    get_mp_http_pool,
+    get_solr_http_pool,
+    get_checkpoint_journal,
+    get_search_cache,
+    get_tender_cache,
+    get_facet_cache,
+    get_response_encoder,
+    get_suggester,
+)
+from app.domain.schemas import CommitPolicy, LicitacionEstado
 
 # Protect all admin endpoints with the admin token
 router = APIRouter(
@@ -22,6 +37,10 @@ router = APIRouter(
 )
 async def ingest_delta(
     status: LicitacionEstado = LicitacionEstado.activas,
+    fetch_concurrency: Optional[int] = Query(None, ge=1, le=64, description="Concurrent detail fetches for new items"),
+    commit_policy: Optional[CommitPolicy] = Query(None, description="Solr commit policy: hard, soft, within, end"),
+    resume: bool = Query(True, description="Resume an interrupted run for this status from the checkpoint journal"),
+    refresh_details: bool = Query(False, description="Bypass the detail cache and fetch every detail from the API"),
     service: TenderIngestionService = Depends(get_active_ingestion_service)
 ) -> Dict[str, Any]:
     """
@@ -29,9 +48,19 @@ async def ingest_delta(
     
     Args:
         status: activas, publicada, cerrada, desierta, adjudicada, revocada, suspendida.
+        fetch_concurrency: Optional override of INGEST_FETCH_CONCURRENCY for this run.
+        commit_policy: Optional override of SOLR_COMMIT_POLICY for this run.
+        resume: When an unfinished checkpointed run exists, only its remaining work is done.
+        refresh_details: Force fresh detail fetches (the detail cache is still updated).
     """
     # service is injected as TenderIngestionService instance provided by get_active_ingestion_service
-    result = await service.ingest_by_status_delta(status.value)
+    result = await service.ingest_by_status_delta(
+        status.value,
+        fetch_concurrency=fetch_concurrency,
+        commit_policy=commit_policy,
+        resume=resume,
+        refresh_details=refresh_details
+    )
     
     if result.get("status") == "error":
         raise HTTPException(status_code=500, detail=result)
@@ -47,6 +76,8 @@ async def ingest_delta(
     }
 )
 async def run_daily_ingestion_now(
+    commit_policy: Optional[CommitPolicy] = Query(None, description="Solr commit policy: hard, soft, within, end"),
+    consolidated: Optional[bool] = Query(None, description="Fetch all lists concurrently and sync them in one pass"),
     runner: DailyIngestionRunner = Depends(get_daily_ingestion_runner)
 ) -> Dict[str, Any]:
     """
@@ -54,11 +85,140 @@ async def run_daily_ingestion_now(
     This runs ingestion for all statuses in order:
     activas -> publicada -> cerrada -> desierta -> adjudicada -> revocada -> suspendida
     
+    With `consolidated=true` (or DAILY_CONSOLIDATED) all lists are fetched
+    concurrently, deduplicated by CodigoExterno and synced in a single pass.
+    
     If a run is already in progress, returns 409 Conflict.
     """
     try:
-        return await runner.run_daily_sequence()
+        return await runner.run_daily_sequence(commit_policy=commit_policy, consolidated=consolidated)
     except RuntimeError as e:
         if "already running" in str(e):
             raise HTTPException(status_code=409, detail="Daily ingestion already running")
         raise e
+
+@router.get("/mercadopublico/rate-limiter")
+async def get_rate_limiter_status() -> Dict[str, Any]:
+    """
+    Current state of the shared Mercado Público rate limiter
+    (request rate, concurrency limit and overload counters).
+    """
+    limiter = get_mp_rate_limiter()
+    if limiter is None:
+        return {"enabled": False}
+    return {"enabled": True, **limiter.snapshot()}
+
+@router.get("/ingestion/runs/resumable")
+async def list_resumable_runs() -> Dict[str, Any]:
+    """
+    Interrupted ingestion runs recorded in the checkpoint journal,
+    with the work still pending for each one.
+    """
+    journal = get_checkpoint_journal()
+    if journal is None:
+        return {"enabled": False}
+    runs = await run_in_threadpool(journal.list_resumable)
+    return {"enabled": True, "runs": runs}
+
+@router.get("/mercadopublico/http-pool")
+async def get_http_pool_status() -> Dict[str, Any]:
+    """
+    Limits, request counters and open connections of the shared
+    Mercado Público HTTP connection pool.
+    """
+    return get_mp_http_pool().snapshot()
+
+@router.get("/solr/http-pool")
+async def get_solr_http_pool_status() -> Dict[str, Any]:
+    """
+    Connection pool of the async Solr repository (SOLR_ASYNC_CLIENT=true).
+    """
+    return get_solr_http_pool().snapshot()
+
+@router.get("/mercadopublico/detail-cache")
+async def get_detail_cache_status() -> Dict[str, Any]:
+    """
+    Hit/miss counters and size of the on-disk Mercado Público detail cache.
+    """
+    cache = get_mp_detail_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **await run_in_threadpool(cache.snapshot)}
+
+@router.get("/search-cache")
+async def get_search_cache_status() -> Dict[str, Any]:
+    """
+    Hit/miss counters, memory and index generation of the /search response cache.
+    """
+    cache = get_search_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.snapshot()}
+
+@router.get("/tender-cache")
+async def get_tender_cache_status() -> Dict[str, Any]:
+    """
+    Hit/miss counters, invalidations and memory of the per-tender response cache.
+    """
+    cache = get_tender_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.snapshot()}
+
+@router.get("/facet-cache")
+async def get_facet_cache_status() -> Dict[str, Any]:
+    """
+    Hit/miss counters, memory and index generation of the /search/facets response cache.
+    """
+    cache = get_facet_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.snapshot()}
+
+@router.get("/response-encoding")
+async def get_response_encoding_status() -> Dict[str, Any]:
+    """
+    Compression (per content coding, bytes saved), 304 counters and ETag
+    settings of the read endpoints.
+    """
+    encoder = get_response_encoder()
+    if not encoder.enabled:
+        return {"enabled": False}
+    return {"enabled": True, **encoder.snapshot()}
+
+@router.get("/suggest")
+async def get_suggest_status() -> Dict[str, Any]:
+    """
+    Readiness, sizes and last build time of the in-memory /suggest index.
+    """
+    suggester = get_suggester()
+    if suggester is None:
+        return {"enabled": False}
+    return {"enabled": True, **suggester.snapshot()}
+
+@router.post("/suggest/reload")
+async def reload_suggest_index() -> Dict[str, Any]:
+    """
+    Rebuild the /suggest index from a full scan of Solr (it is otherwise only
+    refreshed with the documents each ingestion run writes).
+    """
+    suggester = get_suggester()
+    if suggester is None:
+        return {"enabled": False}
+    result = await suggester.load()
+    if result.get("status") == "error":
+        raise HTTPException(status_code=500, detail=result)
+    return result
+
+@router.post("/state/reconcile")
+async def reconcile_state_store(
+    service: TenderIngestionService = Depends(get_active_ingestion_service)
+) -> Dict[str, Any]:
+    """
+    Rebuild the local ingestion state store from a full scan of Solr.
+    Use after restoring/wiping the core or when the store may have drifted.
+    """
+    result = await service.reconcile_state_store()
+    if result.get("status") == "error":
+        raise HTTPException(status_code=500, detail=result)
+    return result
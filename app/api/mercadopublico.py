@@ -54,9 +54,14 @@ async def test_real(fecha: str, client: MercadoPublicoClient = Depends(get_merca
         503: {"description": "Service Unavailable - Mercado Público API is overloaded"}
     }
 )
-async def test_real_detail(codigo: str, client: MercadoPublicoClient = Depends(get_mercado_publico_client)):
+async def test_real_detail(
+    codigo: str,
+    refresh: bool = False,
+    client: MercadoPublicoClient = Depends(get_mercado_publico_client)
+):
     # Consumir directamente la API real (Detalle de licitación) sin filtro Pydantic
-    return await _handle_mp_request(client.get_raw_by_code, codigo, client=client)
+    # refresh=true ignora la caché de detalles
+    return await _handle_mp_request(client.get_raw_by_code, codigo, refresh=refresh, client=client)
 
 @router.get(
     "/detail/dto",
@@ -66,12 +71,17 @@ async def test_real_detail(codigo: str, client: MercadoPublicoClient = Depends(g
         503: {"description": "Service Unavailable - Mercado Público API is overloaded"}
     }
 )
-async def test_real_detail_dto(codigo: str, client: MercadoPublicoClient = Depends(get_mercado_publico_client)):
+async def test_real_detail_dto(
+    codigo: str,
+    refresh: bool = False,
+    client: MercadoPublicoClient = Depends(get_mercado_publico_client)
+):
     """
     Obtiene el detalle de una licitación y lo transforma a DTO simplificado para API.
     
     Args:
         codigo: Código de la licitación (ej: 2732-49-LE25)
+        refresh: Ignora la caché de detalles y consulta la API
     
     Returns:
         TenderSummaryDTO: Objeto transformado listo para list view
@@ -79,7 +89,7 @@ async def test_real_detail_dto(codigo: str, client: MercadoPublicoClient = Depen
     from app.application.transformer_service import TenderTransformer
     
     async def transform_to_dto(codigo: str):
-        response = await client.get_by_code(codigo)
+        response = await client.get_by_code(codigo, refresh=refresh)
         if response.listado:
             licitacion = response.listado[0]
             dto = TenderTransformer.to_summary_dto(licitacion)
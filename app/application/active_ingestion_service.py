@@ -1,23 +1,95 @@
+import asyncio
+import inspect
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional, Tuple
 from datetime import datetime, timezone
 import math
+from functools import partial
 
 from starlette.concurrency import run_in_threadpool
 
-from app.domain.ports import SolrTenderRepositoryPort
+from app.domain.ports import SolrTenderRepositoryPort, TenderStateStorePort
+from app.infrastructure.checkpoint.journal import CheckpointJournal
+from app.infrastructure.solr.result_cache import IndexGeneration, ResultCache
 from app.infrastructure.mercadopublico.client import MercadoPublicoClient
 from app.application.transformer_service import TenderTransformer
-from app.domain.schemas import TenderIndexDoc
+from app.application.ingestion_pipeline import IngestionPipeline
+from app.application.repository_calls import call_repository
+from app.application.suggest_service import TenderSuggester
+from app.domain.schemas import CodigoEstado, CommitPolicy, Licitacion, LicitacionItem, TenderIndexDoc
+from app.domain.state_index import TenderStateIndex
+from app.domain.suggest_index import SUGGEST_FIELDS
 
 logger = logging.getLogger(__name__)
 
+
+class ListFetchError(Exception):
+    """A Mercado Público status listing could not be fetched or parsed."""
+
+
 class TenderIngestionService:
-    def __init__(self, mp_client: MercadoPublicoClient, solr_repo: SolrTenderRepositoryPort):
+    # Lifecycle order used to keep the most advanced state when a tender
+    # appears in several status lists (terminal states rank highest)
+    STATUS_RANK = {
+        CodigoEstado.PUBLICADA: 0,
+        CodigoEstado.CERRADA: 1,
+        CodigoEstado.SUSPENDIDA: 2,
+        CodigoEstado.DESIERTA: 3,
+        CodigoEstado.ADJUDICADA: 3,
+        CodigoEstado.REVOCADA: 3,
+    }
+    # Listing items diffed per state lookup while streaming a status list
+    LIST_CHUNK_SIZE = 500
+    # Written fields kept for the suggest index refresh
+    SUGGEST_DOC_FIELDS = ("id", *SUGGEST_FIELDS.values())
+
+    def __init__(
+        self,
+        mp_client: MercadoPublicoClient,
+        solr_repo: SolrTenderRepositoryPort,
+        fetch_concurrency: int = 1,
+        pipeline_queue_size: int = 100,
+        commit_policy: CommitPolicy = CommitPolicy.hard,
+        state_store: Optional[TenderStateStorePort] = None,
+        refetch_on_change: bool = False,
+        journal: Optional[CheckpointJournal] = None,
+        snapshot_ratio: float = 0.0,
+        index_generation: Optional[IndexGeneration] = None,
+        document_cache: Optional[ResultCache] = None,
+        suggester: Optional[TenderSuggester] = None,
+        commit_within_ms: int = 10000,
+    ):
         self.mp_client = mp_client
         self.solr_repo = solr_repo
         self.batch_size = 50
+        # Number of concurrent detail fetches used for NEW items (1 = serial)
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        # Bound of the queues between pipeline stages (backpressure)
+        self.pipeline_queue_size = pipeline_queue_size
+        # Default commit policy for Solr writes (overridable per run)
+        self.commit_policy = commit_policy
+        # Optional local copy of the indexed state, used for the diff instead of Solr
+        self.state_store = state_store
+        # Re-fetch details of changed tenders and re-index them if their detail data moved
+        self.refetch_on_change = refetch_on_change
+        # Optional checkpoint journal that makes interrupted runs resumable
+        self.journal = journal
+        # Load a full Solr state snapshot once the listing reaches this fraction
+        # of the index size, instead of looking ids up chunk by chunk (0 = never)
+        self.snapshot_ratio = snapshot_ratio
+        # Bumped whenever new data becomes visible, invalidating cached search results
+        self.index_generation = index_generation
+        # commitWithin of the repository: `within` writes are only visible after it
+        self.commit_within_ms = commit_within_ms
+        self._bump_due: Optional[float] = None
+        self._bump_handle: Optional[asyncio.TimerHandle] = None
+        # Per-tender response cache; entries are dropped when their id is written
+        self.document_cache = document_cache
+        # Autocomplete index, refreshed with the suggestion fields written by each run
+        self.suggester = suggester
+        self._suggest_pending: List[Dict[str, Any]] = []
 
     @staticmethod
     def chunk_list(data: List[Any], size: int) -> List[List[Any]]:
@@ -67,13 +139,287 @@ class TenderIngestionService:
         """Wrapper to ingest active tenders using delta sync."""
         return await self.ingest_by_status_delta("activas")
 
-    async def ingest_by_status_delta(self, status_filter: str) -> Dict[str, Any]:
+    async def _fetch_detail(self, tender_id: str, refresh: bool = False) -> Optional[Licitacion]:
         """
-        Incremental ingestion (delta sync) by status.
-        Status options: activas, publicada, cerrada, desierta, adjudicada, revocada, suspendida.
+        Fetches the detail of a tender (`refresh` bypasses the client detail cache).
+        Returns None when the API has no detail for the given code.
+        """
+        detail_response = await self.mp_client.get_by_code(tender_id, refresh=refresh)
+        if not detail_response.listado:
+            return None
+        return detail_response.listado[0]
+
+    def _to_index_payload(self, licitacion: Licitacion) -> Dict[str, Any]:
+        """
+        Transforms a tender detail into the JSON payload sent to Solr,
+        including the listing and detail fingerprints.
+        """
+        payload = TenderTransformer.to_index_doc(licitacion).model_dump(mode='json')
+        listing = self._listing_fields(payload["title"], payload["status_code"], payload["closing_date"])
+        payload["listing_fingerprint"] = TenderTransformer.listing_fingerprint(listing)
+        payload["detail_fingerprint"] = TenderTransformer.detail_fingerprint(payload)
+        return payload
+
+    async def _write(self, write_fn, payload: List[Dict[str, Any]], commit_policy: CommitPolicy, stats: Dict[str, Any]) -> None:
+        """
+        Sends a write batch to Solr with the given commit policy.
+        For per-batch policies (hard/soft) the request carries the commit, so its
+        duration is accounted as commit time.
+        """
+        started = time.perf_counter()
+        try:
+            await call_repository(write_fn, payload, commit_policy=commit_policy)
+        finally:
+            # Real-time get sees the write before any commit; a failed batch may be partially applied
+            if self.document_cache is not None:
+                self.document_cache.invalidate([doc["id"] for doc in payload])
+        stats["solr_writes"] += 1
+        if self.suggester is not None:
+            for doc in payload:
+                fields = {field: doc[field] for field in self.SUGGEST_DOC_FIELDS if field in doc}
+                if len(fields) > 1:
+                    self._suggest_pending.append(fields)
+        if commit_policy in (CommitPolicy.hard, CommitPolicy.soft):
+            stats["commit_count"] += 1
+            stats["commit_time_ms"] += int((time.perf_counter() - started) * 1000)
+            # Visible now
+            self._bump_generation()
+        elif commit_policy == CommitPolicy.within:
+            self._schedule_generation_bump()
+
+    def _bump_generation(self) -> None:
+        if self.index_generation is not None:
+            self.index_generation.bump()
+
+    def _schedule_generation_bump(self) -> None:
+        """
+        Bumps the generation once a `within` write is visible, commit_within_ms
+        after it. Writes made while a bump is pending push the deadline, and the
+        pending bump fires again until it has covered the latest write.
+        """
+        if self.index_generation is None:
+            return
+        loop = asyncio.get_running_loop()
+        self._bump_due = loop.time() + self.commit_within_ms / 1000
+        if self._bump_handle is None:
+            self._bump_handle = loop.call_at(self._bump_due, self._deferred_bump)
+
+    def _deferred_bump(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._bump_generation()
+        if self._bump_due is not None and self._bump_due > loop.time():
+            # Written after this bump was scheduled and not visible yet
+            self._bump_handle = loop.call_at(self._bump_due, self._deferred_bump)
+        else:
+            self._bump_handle = None
+
+    async def commit(self, stats: Dict[str, Any]) -> None:
+        """
+        Issues the single hard commit used by the `end` commit policy and
+        records it in `stats`.
+        """
+        started = time.perf_counter()
+        try:
+            await call_repository(self.solr_repo.commit)
+            stats["commit_count"] += 1
+            self._bump_generation()
+        except Exception as e:
+            logger.error(f"Error committing ingestion run: {e}")
+            stats["commit_error"] = str(e)
+        stats["commit_time_ms"] += int((time.perf_counter() - started) * 1000)
+
+    async def _run_pipeline(
+        self, ids: List[str], index_batch, concurrency: int, refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Runs the fetch -> transform -> index pipeline over `ids`."""
+        pipeline = IngestionPipeline(
+            fetch=partial(self._fetch_detail, refresh=refresh),
+            transform=self._to_index_payload,
+            index=index_batch,
+            fetch_concurrency=min(concurrency, len(ids)),
+            batch_size=self.batch_size,
+            queue_size=self.pipeline_queue_size,
+        )
+        result = await pipeline.run(ids)
+        result["fetch_concurrency"] = pipeline.fetch_concurrency
+        return result
+
+    async def _ingest_new_items(
+        self,
+        new_ids: List[str],
+        stats: Dict[str, Any],
+        concurrency: int,
+        commit_policy: CommitPolicy,
+        run_id: Optional[str] = None,
+        refresh: bool = False,
+    ) -> None:
         """
+        Fetches, transforms and indexes NEW items through the streaming pipeline.
+        Documents are flushed to Solr in batches of `batch_size`.
+        """
+        async def index_batch(docs: List[Dict[str, Any]]) -> None:
+            await self._write(self.solr_repo.upsert_many, docs, commit_policy, stats)
+            await self._journal_call("record_batch", run_id, "new", [d["id"] for d in docs])
+            await self._record_state(docs, stats)
+
+        result = await self._run_pipeline(new_ids, index_batch, concurrency, refresh)
+
+        stats["indexed_new"] += result["indexed"]
+        stats["errors_count"] += result["errors"]
+        stats["fetched_count"] += result["stages"]["fetch"]["processed"]
+        stats["fetch_concurrency"] = result["fetch_concurrency"]
+        stats["fetch_time_ms"] = result["elapsed_ms"]
+        stats["fetch_throughput_per_s"] = result["fetch_throughput_per_s"]
+        stats["pipeline"] = result["stages"]
+        if result["aborted"]:
+            stats["pipeline_aborted"] = True
+
+    def _state_record(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalizes a Solr/index document into a state store record."""
+        fields = self._listing_fields(None, doc.get("status_code"), doc.get("closing_date"))
+        return {
+            "id": doc["id"],
+            "status_code": fields["status_code"],
+            "closing_date": fields["closing_date"],
+            "content_hash": TenderTransformer._first_or_none(doc.get("listing_fingerprint")),
+        }
+
+    async def _record_state(self, docs: List[Dict[str, Any]], stats: Dict[str, Any]) -> None:
+        """Records the state of documents Solr already accepted in the local store."""
+        if self.state_store is None or not docs:
+            return
+        try:
+            await run_in_threadpool(self.state_store.upsert_many, [self._state_record(d) for d in docs])
+        except Exception as e:
+            # The next run will simply see these ids as new/changed again
+            logger.error(f"Error recording state for {len(docs)} documents: {e}")
+            stats["state_store_errors"] = stats.get("state_store_errors", 0) + len(docs)
+
+    async def _state_source(self, stats: Dict[str, Any]) -> str:
+        """
+        Picks where the current state is read from for a whole run: the local
+        state store once a reconcile made it complete; the store plus Solr
+        lookups for the ids it lacks while it only holds previously ingested
+        tenders ("local_partial"); Solr otherwise.
+        """
+        stats["state_source"] = "solr"
+        if self.state_store is not None:
+            if await run_in_threadpool(self.state_store.is_complete):
+                stats["state_source"] = "local"
+            elif await run_in_threadpool(self.state_store.count) > 0:
+                # A missing id may still be indexed (e.g. listed under another status)
+                logger.info("Local state store is not reconciled, using Solr lookups for ids it does not hold")
+                stats["state_source"] = "local_partial"
+            else:
+                logger.info("Local state store is empty, falling back to Solr lookups")
+        return stats["state_source"]
+
+    async def _snapshot_threshold(self, stats: Dict[str, Any]) -> Optional[int]:
+        """
+        Number of listed ids from which a full Solr snapshot is cheaper than
+        per-id lookups, or None when snapshots are disabled or unavailable.
+        """
+        if self.snapshot_ratio <= 0:
+            return None
+        try:
+            indexed = await call_repository(self.solr_repo.count)
+        except Exception as e:
+            logger.warning(f"Could not count indexed documents, using per-id lookups: {e}")
+            return None
+        stats["indexed_count"] = indexed
+        return int(indexed * self.snapshot_ratio)
+
+    async def _load_state_snapshot(self, stats: Dict[str, Any]) -> Optional[TenderStateIndex]:
+        """Loads the whole indexed state from Solr; None (per-id lookups) on failure."""
+        started = time.time()
+        try:
+            snapshot = await call_repository(self.solr_repo.fetch_min_fields_snapshot)
+        except Exception as e:
+            logger.warning(f"Could not load Solr state snapshot, using per-id lookups: {e}")
+            return None
+        stats["state_source"] = "solr_snapshot"
+        stats["snapshot_docs"] = len(snapshot)
+        stats["snapshot_time_ms"] = int((time.time() - started) * 1000)
+        return snapshot
+
+    async def _load_current_state(
+        self,
+        all_ids: List[str],
+        stats: Dict[str, Any],
+        source: Optional[str] = None,
+        snapshot: Optional[TenderStateIndex] = None,
+    ) -> Mapping[str, Dict[str, Any]]:
+        """
+        Returns the indexed state for `all_ids`. Uses the local state store when
+        it is complete; otherwise a full Solr snapshot when one was loaded, or
+        real-time get lookups for the ids a partial store does not hold (and
+        seeds the store with the result).
+        """
+        if source is None:
+            source = await self._state_source(stats)
+        if source == "local":
+            return await run_in_threadpool(self.state_store.get_many, all_ids)
+
+        if snapshot is not None:
+            # The index already tells "no value" from "not stored"
+            return await self._seed_state(snapshot.subset(all_ids), stats)
+
+        stored: Dict[str, Dict[str, Any]] = {}
+        if source == "local_partial":
+            stored = await run_in_threadpool(self.state_store.get_many, all_ids)
+        missing = [doc_id for doc_id in all_ids if doc_id not in stored] if stored else all_ids
+
+        # One call: the repository splits the ids into real-time get chunks
+        # and runs them with bounded concurrency
+        solr_state_map = await call_repository(self.solr_repo.fetch_min_fields_by_ids, missing) if missing else {}
+
+        # Every listing field was requested, so a missing key means "no value" (not "unknown")
+        for doc in solr_state_map.values():
+            for field in TenderTransformer.LISTING_FIELDS:
+                doc.setdefault(field, None)
+
+        await self._seed_state(solr_state_map, stats)
+        stored.update(solr_state_map)
+        return stored
+
+    async def _seed_state(self, state_map: Mapping[str, Dict[str, Any]], stats: Dict[str, Any]) -> Mapping[str, Dict[str, Any]]:
+        """Records state read from Solr in the local store (if configured) and returns it."""
+        if self.state_store is not None:
+            await self._record_state(list(state_map.values()), stats)
+        return state_map
+
+    async def reconcile_state_store(self) -> Dict[str, Any]:
+        """
+        Rebuilds the local state store from a full cursorMark scan of Solr.
+        """
+        if self.state_store is None:
+            return {"status": "error", "error_detail": "State store is not configured (STATE_STORE_PATH)"}
+
         start_time = time.time()
-        stats = {
+        try:
+            if inspect.isasyncgenfunction(self.solr_repo.iter_min_fields):
+                # The async repository streams on the event loop; the store is rebuilt in one transaction
+                records = [self._state_record(doc) async for doc in self.solr_repo.iter_min_fields()]
+                total = await run_in_threadpool(self.state_store.replace_all, records)
+            else:
+                total = await run_in_threadpool(
+                    lambda: self.state_store.replace_all(
+                        self._state_record(doc) for doc in self.solr_repo.iter_min_fields()
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Error reconciling state store from Solr: {e}")
+            return {"status": "error", "error_detail": str(e)}
+
+        return {
+            "status": "ok",
+            "records": total,
+            "execution_time_ms": int((time.time() - start_time) * 1000),
+        }
+
+    @staticmethod
+    def _new_run_stats(policy: CommitPolicy) -> Dict[str, Any]:
+        return {
             "status": "processing",
             "total_found_api": 0,
             "new_count": 0,
@@ -81,153 +427,472 @@ class TenderIngestionService:
             "updated_count": 0,
             "skipped_count": 0,
             "errors_count": 0,
+            "fetched_count": 0,
+            "fetch_concurrency": 0,
+            "fetch_time_ms": 0,
+            "fetch_throughput_per_s": 0.0,
+            "commit_policy": policy.value,
+            "solr_writes": 0,
+            "commit_count": 0,
+            "commit_time_ms": 0,
+            "changed_fields": {},
             "execution_time_ms": 0
         }
 
+    @classmethod
+    def _listing_fields(cls, title: Any, status_code: Any, closing_date: Any) -> Dict[str, Any]:
+        """
+        Normalizes listing-level values so listings, index payloads and Solr
+        documents compare (and fingerprint) alike. Dates are truncated to seconds.
+        """
+        title = TenderTransformer._first_or_none(title)
+        status_code = TenderTransformer._first_or_none(status_code)
+        closing_date = TenderTransformer._first_or_none(closing_date)
+
         try:
+            status_code = int(status_code) if status_code is not None else None
+        except (ValueError, TypeError):
+            status_code = None
+
+        if isinstance(closing_date, str):
+            try:
+                closing_date = datetime.fromisoformat(closing_date.replace("Z", "+00:00"))
+            except ValueError:
+                pass
+
+        return {
+            "title": title.strip() if isinstance(title, str) else title,
+            "status_code": status_code,
+            "closing_date": cls.normalize_date(closing_date),
+        }
+
+    def _build_incoming_map(
+        self, api_list: List[LicitacionItem], incoming_map: Optional[TenderStateIndex] = None
+    ) -> TenderStateIndex:
+        """
+        Builds the incoming map {id: {title, status_code, closing_date, listing_fingerprint}}
+        from a listing, as a compact index (or adds to `incoming_map`).
+        """
+        if incoming_map is None:
+            incoming_map = TenderStateIndex(keep_titles=True)
+        for item in api_list:
+            # Normalizamos fechas y status desde el listado
+            # item.CodigoEstado is int
+            # item.FechaCierre is datetime or None
+            fields = self._listing_fields(item.nombre, item.codigo_estado, item.fecha_cierre)
+            fields["listing_fingerprint"] = TenderTransformer.listing_fingerprint(fields)
+            incoming_map[item.codigo_externo] = fields
+        return incoming_map
+
+    def _changed_listing_fields(self, incoming: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns the listing fields whose value differs from the indexed state.
+
+        A matching fingerprint short-circuits the comparison. Fields missing from
+        the listing (None) are never treated as changes; fields the current state
+        does not carry (e.g. title in the local store) are only set when the
+        fingerprint moved and nothing comparable explains it.
+        """
+        current_fingerprint = TenderTransformer._first_or_none(
+            current.get("listing_fingerprint") or current.get("content_hash")
+        )
+        if current_fingerprint and current_fingerprint == incoming["listing_fingerprint"]:
+            return {}
+
+        current_fields = self._listing_fields(current.get("title"), current.get("status_code"), current.get("closing_date"))
+        changed = {}
+        unknown = {}
+        for field in TenderTransformer.LISTING_FIELDS:
+            value = incoming[field]
+            if value is None:
+                continue
+            if field not in current:
+                unknown[field] = value
+            elif current_fields[field] != value:
+                changed[field] = value
+
+        if current_fingerprint and not changed:
+            return unknown
+        return changed
+
+    async def _refresh_changed_items(
+        self,
+        updates_payload: List[Dict[str, Any]],
+        current_state: Dict[str, Dict[str, Any]],
+        stats: Dict[str, Any],
+        concurrency: int,
+        policy: CommitPolicy,
+        run_id: Optional[str] = None,
+    ) -> None:
+        """
+        Re-fetches the detail of changed tenders. Documents whose detail
+        fingerprint is unchanged only receive the listing atomic update; the
+        rest are fully re-indexed.
+        """
+        updates_by_id = {u["id"]: u for u in updates_payload}
+
+        async def index_batch(docs: List[Dict[str, Any]]) -> None:
+            full_docs, partials = [], []
+            for doc in docs:
+                stored = TenderTransformer._first_or_none(current_state[doc["id"]].get("detail_fingerprint"))
+                if stored and stored == doc["detail_fingerprint"]:
+                    partials.append(updates_by_id[doc["id"]])
+                else:
+                    full_docs.append(doc)
+            if full_docs:
+                await self._write(self.solr_repo.upsert_many, full_docs, policy, stats)
+                stats["reindexed_changed"] += len(full_docs)
+            if partials:
+                await self._write(self.solr_repo.atomic_update_many, partials, policy, stats)
+            stats["updated_count"] += len(docs)
+            await self._journal_call("record_batch", run_id, "update", [d["id"] for d in docs])
+            await self._record_state(docs, stats)
+
+        logger.info(f"Re-fetching {len(updates_payload)} changed items...")
+        stats["reindexed_changed"] = 0
+        # The listing moved, so a cached detail would be stale
+        result = await self._run_pipeline(list(updates_by_id), index_batch, concurrency, refresh=True)
+        if result["aborted"]:
+            stats["pipeline_aborted"] = True
+        stats["errors_count"] += result["errors"]
+        stats["fetched_count"] += result["stages"]["fetch"]["processed"]
+        stats["refetch_pipeline"] = result["stages"]
+
+    @staticmethod
+    def _new_plan() -> Dict[str, Any]:
+        """
+        Empty diff plan. Only NEW ids, changed ids (with their incoming and
+        current state) and the set of listed ids are kept, not the listing itself.
+        """
+        return {"new_ids": [], "updates": [], "incoming": {}, "current": {}, "seen": set()}
+
+    def _diff_chunk(
+        self,
+        incoming_map: Mapping[str, Dict[str, Any]],
+        current_state: Mapping[str, Dict[str, Any]],
+        stats: Dict[str, Any],
+        plan: Dict[str, Any],
+    ) -> None:
+        """Compares a chunk of the listing with its current state and adds the result to `plan`."""
+        seen = plan["seen"]
+        if isinstance(incoming_map, TenderStateIndex) and isinstance(current_state, TenderStateIndex):
+            # Two compact indexes are compared column-wise: unchanged rows are never unpacked
+            new_ids, changed_ids, unchanged_ids = incoming_map.diff(current_state)
+            # A code listed twice (in an earlier chunk) is only diffed once
+            repeated = seen.intersection(incoming_map) if seen else ()
+            if repeated:
+                new_ids = [doc_id for doc_id in new_ids if doc_id not in repeated]
+                changed_ids = [doc_id for doc_id in changed_ids if doc_id not in repeated]
+                unchanged_ids = [doc_id for doc_id in unchanged_ids if doc_id not in repeated]
+            seen.update(incoming_map)
+            plan["new_ids"].extend(new_ids)
+            stats["new_count"] += len(new_ids)
+            stats["skipped_count"] += len(unchanged_ids)
+            for doc_id in changed_ids:
+                self._plan_update(doc_id, incoming_map[doc_id], current_state[doc_id], stats, plan)
+            return
+
+        for doc_id in incoming_map:
+            # A code listed twice is only diffed once
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+
+            if doc_id not in current_state:
+                # NEW
+                plan["new_ids"].append(doc_id)
+                stats["new_count"] += 1
+                continue
+
+            self._plan_update(doc_id, incoming_map[doc_id], current_state[doc_id], stats, plan)
+
+    def _plan_update(
+        self,
+        doc_id: str,
+        incoming_data: Dict[str, Any],
+        current: Dict[str, Any],
+        stats: Dict[str, Any],
+        plan: Dict[str, Any],
+    ) -> None:
+        """Adds the atomic update of an existing tender to `plan`, if any listing field changed."""
+        changed = self._changed_listing_fields(incoming_data, current)
+        if not changed:
+            stats["skipped_count"] += 1
+            return
+
+        for field in changed:
+            stats["changed_fields"][field] = stats["changed_fields"].get(field, 0) + 1
+
+        update_doc = {"id": doc_id}
+        for field, value in changed.items():
+            update_doc[field] = {"set": value}
+        update_doc["listing_fingerprint"] = {"set": incoming_data["listing_fingerprint"]}
+        plan["updates"].append(update_doc)
+        plan["incoming"][doc_id] = incoming_data
+        plan["current"][doc_id] = current
+        # stats["updated_count"] += 1  <-- Moved to after successful update
+
+    async def _execute_plan(
+        self,
+        plan: Dict[str, Any],
+        stats: Dict[str, Any],
+        concurrency: int,
+        policy: CommitPolicy,
+        scope: str,
+        refresh: bool = False,
+    ) -> Dict[str, List[str]]:
+        """
+        Applies a diff plan (checkpointed under `scope` when a journal is
+        configured) and refreshes last-seen times in the state store.
+
+        Returns:
+            {"new_ids": [...], "changed_ids": [...]}
+        """
+        new_ids, updates_payload = plan["new_ids"], plan["updates"]
+        run_id = await self._journal_call("start", scope, new_ids, updates_payload)
+        await self._apply_plan(
+            new_ids, updates_payload, stats, concurrency, policy,
+            run_id=run_id, current_state=plan["current"], incoming_map=plan["incoming"], refresh=refresh
+        )
+
+        if self.state_store is not None:
+            try:
+                await run_in_threadpool(self.state_store.mark_seen, list(plan["seen"]))
+            except Exception as e:
+                logger.error(f"Error refreshing last-seen times in state store: {e}")
+
+        return {"new_ids": new_ids, "changed_ids": [u["id"] for u in updates_payload]}
+
+    async def _sync_incoming(
+        self,
+        incoming_map: Mapping[str, Dict[str, Any]],
+        stats: Dict[str, Any],
+        concurrency: int,
+        policy: CommitPolicy,
+        scope: str,
+        refresh: bool = False,
+    ) -> Dict[str, List[str]]:
+        """
+        Diffs an in-memory incoming map against the current state and applies
+        the result: full ingestion for NEW ids and atomic updates for changed ones.
+
+        Returns:
+            The diff plan: {"new_ids": [...], "changed_ids": [...]}
+        """
+        # 3. Fetch current state (local state store when available, Solr otherwise)
+        source = await self._state_source(stats)
+        snapshot = None
+        if source != "local":
+            threshold = await self._snapshot_threshold(stats)
+            if threshold is not None and len(incoming_map) >= threshold:
+                snapshot = await self._load_state_snapshot(stats)
+        current_state = await self._load_current_state(list(incoming_map), stats, source, snapshot)
+
+        # 4. Compare and categorize
+        plan = self._new_plan()
+        self._diff_chunk(incoming_map, current_state, stats, plan)
+        return await self._execute_plan(plan, stats, concurrency, policy, scope, refresh)
+
+    async def _iter_status_chunks(self, status_filter: str) -> AsyncIterator[List[LicitacionItem]]:
+        """
+        Streams a status listing in chunks of LIST_CHUNK_SIZE items.
+        Any failure while fetching or parsing is raised as ListFetchError.
+        """
+        chunk: List[LicitacionItem] = []
+        try:
+            async with aclosing(self.mp_client.iter_by_status(status_filter)) as items:
+                async for item in items:
+                    chunk.append(item)
+                    if len(chunk) >= self.LIST_CHUNK_SIZE:
+                        yield chunk
+                        chunk = []
+        except Exception as e:
+            raise ListFetchError(str(e)) from e
+        if chunk:
+            yield chunk
+
+    async def _diff_status_stream(self, status_filter: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Streams a status listing and diffs it chunk by chunk, so memory grows
+        with the number of changes instead of the size of the listing.
+        Once the listing turns out to be large compared with the index, the
+        remaining chunks are diffed against a full Solr snapshot.
+        """
+        plan = self._new_plan()
+        source = await self._state_source(stats)
+        threshold = await self._snapshot_threshold(stats) if source != "local" else None
+        snapshot = None
+        async with aclosing(self._iter_status_chunks(status_filter)) as chunks:
+            async for items in chunks:
+                stats["total_found_api"] += len(items)
+                if threshold is not None and stats["total_found_api"] >= threshold:
+                    snapshot = await self._load_state_snapshot(stats)
+                    # Loaded at most once; on failure keep using per-id lookups
+                    threshold = None
+                incoming_map = self._build_incoming_map(items)
+                current_state = await self._load_current_state(list(incoming_map), stats, source, snapshot)
+                self._diff_chunk(incoming_map, current_state, stats, plan)
+        return plan
+
+    async def _collect_status_map(self, status_filter: str) -> Tuple[TenderStateIndex, int]:
+        """
+        Streams a status listing into a compact incoming map.
+
+        Returns:
+            (incoming map, number of listed items)
+        """
+        incoming_map = TenderStateIndex(keep_titles=True)
+        total = 0
+        async with aclosing(self._iter_status_chunks(status_filter)) as chunks:
+            async for items in chunks:
+                total += len(items)
+                self._build_incoming_map(items, incoming_map)
+        return incoming_map, total
+
+    async def _apply_plan(
+        self,
+        new_ids: List[str],
+        updates_payload: List[Dict[str, Any]],
+        stats: Dict[str, Any],
+        concurrency: int,
+        policy: CommitPolicy,
+        run_id: Optional[str] = None,
+        current_state: Optional[Dict[str, Dict[str, Any]]] = None,
+        incoming_map: Optional[Dict[str, Dict[str, Any]]] = None,
+        refresh: bool = False,
+    ) -> None:
+        """
+        Applies a diff plan: full ingestion for NEW ids and atomic updates for
+        changed ones. Every batch accepted by Solr is checkpointed under `run_id`.
+        """
+        # Changed docs may be re-fetched; only those whose detail data moved are re-indexed
+        if self.refetch_on_change and updates_payload and current_state is not None:
+            await self._refresh_changed_items(updates_payload, current_state, stats, concurrency, policy, run_id)
+            updates_payload = []
+
+        # 5. Process NEW items (Full Ingestion)
+        if new_ids:
+            logger.info(f"Processing {len(new_ids)} NEW items (concurrency={concurrency})...")
+            await self._ingest_new_items(new_ids, stats, concurrency, policy, run_id, refresh)
+
+        # 6. Process UPDATED items (Atomic Updates)
+        if updates_payload:
+            logger.info(f"Processing {len(updates_payload)} updates...")
+            # Batch atomic updates
+            update_chunks = self.chunk_list(updates_payload, 500)
+            for chunk in update_chunks:
+                try:
+                    await self._write(self.solr_repo.atomic_update_many, chunk, policy, stats)
+                    stats["updated_count"] += len(chunk)
+                except Exception as e:
+                    logger.error(f"Error sending batch updates: {e}")
+                    stats["errors_count"] += len(chunk)
+                    continue
+                await self._journal_call("record_batch", run_id, "update", [u["id"] for u in chunk])
+                if incoming_map is not None:
+                    await self._record_state(
+                        [{"id": u["id"], **incoming_map[u["id"]]} for u in chunk], stats
+                    )
+
+        # A run is only closed once all planned work went through
+        if run_id and not stats.get("pipeline_aborted"):
+            await self._journal_call("finish", run_id, "ok")
+
+    async def _journal_call(self, method: str, *args) -> Any:
+        """
+        Calls the checkpoint journal (if configured). Journal failures are logged
+        and never interrupt ingestion; they only make the run non-resumable.
+        """
+        if self.journal is None or (method != "start" and args[0] is None):
+            return None
+        try:
+            return await run_in_threadpool(getattr(self.journal, method), *args)
+        except Exception as e:
+            logger.error(f"Checkpoint journal error ({method}): {e}")
+            return None
+
+    async def _resume_from_journal(
+        self, scope: str, stats: Dict[str, Any], concurrency: int, policy: CommitPolicy, refresh: bool = False
+    ) -> bool:
+        """
+        Resumes the latest unfinished run for `scope`, skipping the list fetch
+        and the diff. Returns False when there is nothing to resume.
+        """
+        if self.journal is None:
+            return False
+        state = await self._journal_call("find_resumable", scope)
+        if state is None:
+            return False
+
+        remaining = self.journal.remaining(state)
+        logger.info(
+            f"Resuming run {state['run_id']} ({scope}): {len(remaining['new_ids'])} new, "
+            f"{len(remaining['updates'])} updates left"
+        )
+        stats["resumed_run_id"] = state["run_id"]
+        # Ids the interrupted run already wrote; with the `end` policy they may never have been committed
+        stats["resumed_written"] = sum(len(ids) for ids in state["committed"].values())
+        stats["new_count"] = len(remaining["new_ids"])
+        await self._apply_plan(
+            remaining["new_ids"], remaining["updates"], stats, concurrency, policy,
+            run_id=state["run_id"], refresh=refresh
+        )
+        return True
+
+    async def ingest_by_status_delta(
+        self,
+        status_filter: str,
+        fetch_concurrency: Optional[int] = None,
+        commit_policy: Optional[CommitPolicy] = None,
+        final_commit: bool = True,
+        resume: bool = True,
+        refresh_details: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Incremental ingestion (delta sync) by status.
+        Status options: activas, publicada, cerrada, desierta, adjudicada, revocada, suspendida.
+
+        Args:
+            status_filter: Status list to sync.
+            fetch_concurrency: Optional override of the number of concurrent detail fetches.
+            commit_policy: Optional override of the Solr commit policy for this run.
+            final_commit: With the `end` policy, whether this run issues the final commit.
+                Callers chaining several runs pass False and call `commit()` themselves.
+            resume: Resume an unfinished checkpointed run for this status, if any.
+            refresh_details: Bypass the detail cache for every fetch of this run.
+        """
+        start_time = time.time()
+        concurrency = max(1, fetch_concurrency or self.fetch_concurrency)
+        policy = commit_policy or self.commit_policy
+        stats = self._new_run_stats(policy)
+        scope = f"status:{status_filter}"
+
+        try:
+            if resume and await self._resume_from_journal(scope, stats, concurrency, policy, refresh_details):
+                stats["status"] = "ok"
+                await self._finish_run(stats, policy, final_commit, start_time)
+                logger.info(f"Resumed delta ingestion finished: {stats}")
+                return stats
+
             logger.info(f"Starting delta ingestion for status='{status_filter}'...")
             
-            # 1. Fetch from API
+            # 1-4. Stream the list from the API and diff it against the current state chunk by chunk
             try:
-                response = await self.mp_client.get_by_status(status_filter)
-                api_list = response.listado
-            except Exception as e:
+                plan = await self._diff_status_stream(status_filter, stats)
+            except ListFetchError as e:
                 logger.error(f"Failed to fetch list from MercadoPublico: {e}")
                 stats["status"] = "error"
                 stats["error_detail"] = f"API fetch failed: {str(e)}"
                 return stats
 
-            stats["total_found_api"] = len(api_list)
-            logger.info(f"API returned {len(api_list)} items.")
-
-            # 2. Build incoming map: {id: {status_code, closing_date}}
-            incoming_map = {}
-            for item in api_list:
-                # Normalizamos fechas y status desde el listado
-                # item.CodigoEstado is int
-                # item.FechaCierre is datetime or None
-                incoming_map[item.codigo_externo] = {
-                    "status_code": item.codigo_estado,
-                    "closing_date": self.normalize_date(item.fecha_cierre)
-                }
+            logger.info(f"API returned {stats['total_found_api']} items.")
 
-            if not incoming_map:
+            if not plan["seen"]:
                 logger.info("No items to process.")
                 stats["status"] = "ok"
                 return stats
 
-            all_ids = list(incoming_map.keys())
-
-            # 3. Fetch current state from Solr (Chunks of 200)
-            solr_state_map = {}
-            id_chunks = self.chunk_list(all_ids, 200)
-            
-            for chunk in id_chunks:
-                # fetch_min_fields_by_ids runs in threadpool ideally if blocking, 
-                # but repo is sync. We should use run_in_threadpool.
-                chunk_docs = await run_in_threadpool(
-                    self.solr_repo.fetch_min_fields_by_ids, 
-                    chunk
-                )
-                solr_state_map.update(chunk_docs)
-
-            # 4. Compare and categorize
-            new_ids = []
-            updates_payload = []
-            
-            for doc_id, incoming_data in incoming_map.items():
-                if doc_id not in solr_state_map:
-                    # NEW
-                    new_ids.append(doc_id)
-                    stats["new_count"] += 1
-                else:
-                    # EXISTING - Check for changes
-                    solr_doc = solr_state_map[doc_id]
-                    
-                    # Solr fields
-                    # Solr might return list or scalar for pint/tdate fields depending on schema/pysolr
-                    current_status_raw = solr_doc.get("status_code")
-                    if isinstance(current_status_raw, list):
-                        current_status_code = current_status_raw[0] if current_status_raw else None
-                    else:
-                        current_status_code = current_status_raw
-
-                    # Incoming fields
-                    new_status_code = incoming_data["status_code"]
-                    
-                    # Compare
-                    # status_code is ONLY trigger for update
-                    
-                    # Ensure numeric comparison for status code (handle None/string from Solr)
-                    try:
-                        current_status_int = int(current_status_code) if current_status_code is not None else -1
-                    except (ValueError, TypeError):
-                        current_status_int = -1
-                        
-                    needs_update = False
-                    update_doc = {"id": doc_id}
-                    
-                    if current_status_int != new_status_code:
-                        # logger.info(f"Status change for {doc_id}: Solr={current_status_int} vs API={new_status_code}")
-                        update_doc["status_code"] = {"set": new_status_code}
-                        needs_update = True
-                        
-                    if needs_update:
-                        updates_payload.append(update_doc)
-                        # stats["updated_count"] += 1  <-- Moved to after successful update
-                    else:
-                        stats["skipped_count"] += 1          
-            # 5. Process NEW items (Full Ingestion)
-            if new_ids:
-                logger.info(f"Processing {len(new_ids)} NEW items...")
-                
-                new_docs_batch = []
-                
-                for new_id in new_ids:
-                    try:
-                        detail_response = await self.mp_client.get_by_code(new_id)
-                        if detail_response.listado:
-                            licitacion = detail_response.listado[0]
-                            doc_model = TenderTransformer.to_index_doc(licitacion)
-                            new_docs_batch.append(doc_model.model_dump(mode='json'))
-                        else:
-                            logger.warning(f"No detail found for new item {new_id}")
-                            stats["errors_count"] += 1
-                    except Exception as e:
-                        logger.error(f"Error fetching/transforming new item {new_id}: {e}")
-                        stats["errors_count"] += 1
-                    
-                    # Flush batch to Solr periodically (e.g., every 50)
-                    if len(new_docs_batch) >= 50:
-                        try:
-                            await run_in_threadpool(self.solr_repo.upsert_many, new_docs_batch)
-                            stats["indexed_new"] += len(new_docs_batch)
-                        except Exception as e:
-                            logger.error(f"Error indexing batch of new items: {e}")
-                            stats["errors_count"] += len(new_docs_batch)
-                        new_docs_batch = []
-                
-                # Flush remaining
-                if new_docs_batch:
-                    try:
-                        await run_in_threadpool(self.solr_repo.upsert_many, new_docs_batch)
-                        stats["indexed_new"] += len(new_docs_batch)
-                    except Exception as e:
-                        logger.error(f"Error indexing final batch of new items: {e}")
-                        stats["errors_count"] += len(new_docs_batch)
-
-            # 6. Process UPDATED items (Atomic Updates)
-            if updates_payload:
-                logger.info(f"Processing {len(updates_payload)} updates...")
-                # Batch atomic updates
-                update_chunks = self.chunk_list(updates_payload, 500)
-                for chunk in update_chunks:
-                    try:
-                        await run_in_threadpool(self.solr_repo.atomic_update_many, chunk)
-                        stats["updated_count"] += len(chunk)
-                    except Exception as e:
-                        logger.error(f"Error sending batch updates: {e}")
-                        stats["errors_count"] += len(chunk)
+            await self._execute_plan(plan, stats, concurrency, policy, scope, refresh_details)
 
             stats["status"] = "ok"
 
@@ -235,9 +900,127 @@ class TenderIngestionService:
             logger.error(f"Critical error during delta ingestion: {e}")
             stats["status"] = "error"
             stats["error_detail"] = str(e)
-        
+
+        await self._finish_run(stats, policy, final_commit, start_time)
+        logger.info(f"Delta ingestion finished: {stats}")
+        return stats
+
+    async def _finish_run(self, stats: Dict[str, Any], policy: CommitPolicy, final_commit: bool, start_time: float) -> None:
+        # Make everything written so far visible, even after a partial failure
+        # (including the writes of a resumed run made before it was interrupted)
+        written = stats["solr_writes"] > 0 or stats.get("resumed_written", 0) > 0
+        if policy == CommitPolicy.end and final_commit and written:
+            await self.commit(stats)
+
+        if self._suggest_pending:
+            pending, self._suggest_pending = self._suggest_pending, []
+            try:
+                stats["suggest_changes"] = await self.suggester.refresh(pending)
+            except Exception as e:
+                logger.error(f"Error refreshing suggest index: {e}")
+
         end_time = time.time()
         stats["execution_time_ms"] = int((end_time - start_time) * 1000)
-        
-        logger.info(f"Delta ingestion finished: {stats}")
+
+    @classmethod
+    def _status_rank(cls, status_code: int) -> int:
+        return cls.STATUS_RANK.get(status_code, -1)
+
+    async def ingest_consolidated_delta(
+        self,
+        statuses: List[str],
+        fetch_concurrency: Optional[int] = None,
+        commit_policy: Optional[CommitPolicy] = None,
+        final_commit: bool = True,
+        resume: bool = True,
+        refresh_details: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Consolidated delta sync over several status lists.
+
+        All lists are fetched concurrently and merged into a single incoming map
+        keyed by CodigoExterno, keeping the most advanced state when a tender
+        shows up in more than one list. The merged map goes through one Solr
+        diff and one indexing pass. Per-status counters are kept in `by_status`.
+        """
+        start_time = time.time()
+        concurrency = max(1, fetch_concurrency or self.fetch_concurrency)
+        policy = commit_policy or self.commit_policy
+        stats = self._new_run_stats(policy)
+        stats["by_status"] = {}
+        scope = f"consolidated:{','.join(statuses)}"
+
+        try:
+            if resume and await self._resume_from_journal(scope, stats, concurrency, policy, refresh_details):
+                # The journal does not keep the source list of each id: every status was listed by the interrupted run
+                stats["by_status"] = {
+                    status_filter: {"ok": True, "resumed": True, "total_found_api": 0, "new_count": 0, "changed_count": 0}
+                    for status_filter in statuses
+                }
+                stats["status"] = "ok"
+                await self._finish_run(stats, policy, final_commit, start_time)
+                logger.info(f"Resumed consolidated delta ingestion finished: {stats}")
+                return stats
+
+            logger.info(f"Starting consolidated delta ingestion for statuses={statuses}...")
+
+            # 1. Fetch every list concurrently
+            results = await asyncio.gather(
+                *(self._collect_status_map(status_filter) for status_filter in statuses),
+                return_exceptions=True
+            )
+
+            # 2. Merge into a single incoming map (most advanced state wins)
+            merged = TenderStateIndex(keep_titles=True)
+            source_status: Dict[str, str] = {}
+            for status_filter, result in zip(statuses, results):
+                entry = {"ok": True, "total_found_api": 0, "new_count": 0, "changed_count": 0}
+                stats["by_status"][status_filter] = entry
+
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to fetch list '{status_filter}' from MercadoPublico: {result}")
+                    entry["ok"] = False
+                    entry["error"] = f"API fetch failed: {str(result)}"
+                    continue
+
+                incoming_map, total = result
+                entry["total_found_api"] = total
+                stats["total_found_api"] += total
+                for doc_id in incoming_map:
+                    if doc_id not in merged or (
+                        self._status_rank(incoming_map.status_code(doc_id)) > self._status_rank(merged.status_code(doc_id))
+                    ):
+                        merged[doc_id] = incoming_map[doc_id]
+                        source_status[doc_id] = status_filter
+
+            stats["unique_ids"] = len(merged)
+            logger.info(f"API returned {stats['total_found_api']} items, {len(merged)} unique.")
+
+            if all(not entry["ok"] for entry in stats["by_status"].values()):
+                stats["status"] = "error"
+                stats["error_detail"] = "API fetch failed for every status"
+            elif merged:
+                # 3. One diff and one indexing pass for the merged map
+                plan = await self._sync_incoming(
+                    merged, stats, concurrency, policy, scope, refresh_details
+                )
+                for doc_id in plan["new_ids"]:
+                    stats["by_status"][source_status[doc_id]]["new_count"] += 1
+                for doc_id in plan["changed_ids"]:
+                    stats["by_status"][source_status[doc_id]]["changed_count"] += 1
+                stats["status"] = "ok"
+            else:
+                logger.info("No items to process.")
+                stats["status"] = "ok"
+
+            if stats["status"] == "ok" and not all(entry["ok"] for entry in stats["by_status"].values()):
+                stats["status"] = "partial_error"
+
+        except Exception as e:
+            logger.error(f"Critical error during consolidated delta ingestion: {e}")
+            stats["status"] = "error"
+            stats["error_detail"] = str(e)
+
+        await self._finish_run(stats, policy, final_commit, start_time)
+        logger.info(f"Consolidated delta ingestion finished: {stats}")
         return stats
@@ -2,45 +2,64 @@ import asyncio
 import logging
 import time
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from app.application.active_ingestion_service import TenderIngestionService
-from app.domain.schemas import LicitacionEstado
+from app.domain.schemas import CommitPolicy, LicitacionEstado
 
 logger = logging.getLogger(__name__)
 
 class DailyIngestionRunner:
-    def __init__(self, ingestion_service: TenderIngestionService):
+    # Order strictly as requested
+    STATUS_ORDER = [
+        LicitacionEstado.activas,
+        LicitacionEstado.publicada,
+        LicitacionEstado.cerrada,
+        LicitacionEstado.desierta,
+        LicitacionEstado.adjudicada,
+        LicitacionEstado.revocada,
+        LicitacionEstado.suspendida
+    ]
+
+    def __init__(self, ingestion_service: TenderIngestionService, consolidated: bool = False):
         self.ingestion_service = ingestion_service
+        # Default mode: one consolidated pass instead of one delta run per status
+        self.consolidated = consolidated
         self._lock = asyncio.Lock()
 
-    async def run_daily_sequence(self) -> Dict[str, Any]:
+    async def run_daily_sequence(
+        self,
+        commit_policy: Optional[CommitPolicy] = None,
+        consolidated: Optional[bool] = None,
+    ) -> Dict[str, Any]:
         """
         Runs the daily ingestion sequence for all statuses.
         Prevent concurrent runs using a lock.
+
+        Args:
+            commit_policy: Optional override of the Solr commit policy. With `end`,
+                a single commit is issued after the whole sequence.
+            consolidated: Optional override of the run mode. When True all status
+                lists are fetched concurrently and synced in a single pass.
         """
         if self._lock.locked():
             raise RuntimeError("Daily ingestion already running")
 
         async with self._lock:
+            use_consolidated = self.consolidated if consolidated is None else consolidated
+            if use_consolidated:
+                return await self._run_consolidated(commit_policy)
+
             start_time = datetime.now(timezone.utc)
             logger.info(f"Starting daily ingestion sequence at {start_time.isoformat()}")
-            
-            # Order strictly as requested
-            status_order = [
-                LicitacionEstado.activas,
-                LicitacionEstado.publicada,
-                LicitacionEstado.cerrada,
-                LicitacionEstado.desierta,
-                LicitacionEstado.adjudicada,
-                LicitacionEstado.revocada,
-                LicitacionEstado.suspendida
-            ]
 
             runs_results = []
             param_status = "ok"
+            policy = commit_policy or self.ingestion_service.commit_policy
+            commit_stats = {"commit_policy": policy.value, "commit_count": 0, "commit_time_ms": 0}
+            pending_writes = 0
 
-            for status_enum in status_order:
+            for status_enum in self.STATUS_ORDER:
                 status_str = status_enum.value
                 run_entry = {
                     "estado": status_str,
@@ -50,7 +69,13 @@ class DailyIngestionRunner:
                 try:
                     logger.info(f"Starting ingestion for status: {status_str}")
                     # Call the existing delta method
-                    result = await self.ingestion_service.ingest_by_status_delta(status_str)
+                    result = await self.ingestion_service.ingest_by_status_delta(
+                        status_str, commit_policy=policy, final_commit=False
+                    )
+                    # A resumed run may only carry writes made before it was interrupted
+                    pending_writes += result.get("solr_writes", 0) + result.get("resumed_written", 0)
+                    commit_stats["commit_count"] += result.get("commit_count", 0)
+                    commit_stats["commit_time_ms"] += result.get("commit_time_ms", 0)
                     
                     # Check if result indicates success (the service returns a dict with 'status')
                     if result.get("status") == "error":
@@ -69,6 +94,10 @@ class DailyIngestionRunner:
                 
                 runs_results.append(run_entry)
 
+            # Single commit for the whole sequence
+            if policy == CommitPolicy.end and pending_writes > 0:
+                await self.ingestion_service.commit(commit_stats)
+
             finish_time = datetime.now(timezone.utc)
             
             # Determine final status
@@ -87,10 +116,62 @@ class DailyIngestionRunner:
 
             summary = {
                 "status": final_status,
+                "mode": "sequential",
                 "started_at": start_time.isoformat(),
                 "finished_at": finish_time.isoformat(),
+                "commit": commit_stats,
                 "runs": runs_results
             }
             
             logger.info(f"Daily ingestion sequence finished with status: {final_status}")
             return summary
+
+    async def _run_consolidated(self, commit_policy: Optional[CommitPolicy]) -> Dict[str, Any]:
+        """
+        Consolidated daily run: every status list is fetched concurrently,
+        deduplicated and synced with a single diff and indexing pass.
+        Must be called with the lock held.
+        """
+        start_time = datetime.now(timezone.utc)
+        logger.info(f"Starting consolidated daily ingestion at {start_time.isoformat()}")
+
+        status_names = [status_enum.value for status_enum in self.STATUS_ORDER]
+        try:
+            result = await self.ingestion_service.ingest_consolidated_delta(
+                status_names, commit_policy=commit_policy
+            )
+        except Exception as e:
+            logger.error(f"Exception during consolidated ingestion: {e}", exc_info=True)
+            result = {"status": "error", "error_detail": str(e), "by_status": {}}
+
+        by_status = result.pop("by_status", {})
+        runs_results = []
+        for status_str in status_names:
+            entry = by_status.get(status_str)
+            run_entry = {"estado": status_str, "ok": bool(entry and entry["ok"])}
+            if entry is None:
+                run_entry["error"] = result.get("error_detail", "Unknown error from service")
+            elif entry["ok"]:
+                run_entry["result"] = entry
+            else:
+                run_entry["error"] = entry.get("error", "Unknown error from service")
+            runs_results.append(run_entry)
+
+        finish_time = datetime.now(timezone.utc)
+        final_status = result.get("status", "error")
+        summary = {
+            "status": final_status,
+            "mode": "consolidated",
+            "started_at": start_time.isoformat(),
+            "finished_at": finish_time.isoformat(),
+            "commit": {
+                "commit_policy": result.get("commit_policy"),
+                "commit_count": result.get("commit_count", 0),
+                "commit_time_ms": result.get("commit_time_ms", 0),
+            },
+            "result": result,
+            "runs": runs_results
+        }
+
+        logger.info(f"Consolidated daily ingestion finished with status: {final_status}")
+        return summary
@@ -0,0 +1,98 @@
+import json
+import math
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+_DATETIME = TypeAdapter(datetime)
+
+
+class _NotPlain(Exception):
+    """A value that needs the model to be validated/serialized."""
+
+
+@lru_cache(maxsize=16384)
+def _json_datetime(value: str) -> str:
+    # Validated and dumped by pydantic itself: same parsing and format as the model field
+    return _DATETIME.dump_python(_DATETIME.validate_python(value), mode="json")
+
+
+def _str(value: Any) -> str:
+    if type(value) is not str:
+        raise _NotPlain
+    return value
+
+
+def _int(value: Any) -> int:
+    if type(value) is not int:
+        raise _NotPlain
+    return value
+
+
+def _float(value: Any) -> float:
+    if type(value) is int:
+        return float(value)
+    if type(value) is not float or not math.isfinite(value):
+        raise _NotPlain
+    return value
+
+
+def _datetime(value: Any) -> str:
+    if type(value) is not str:
+        raise _NotPlain
+    return _json_datetime(value)
+
+
+_CONVERTERS: Dict[Any, Callable[[Any], Any]] = {str: _str, int: _int, float: _float, datetime: _datetime}
+
+
+def _optional(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def convert_optional(value: Any) -> Any:
+        return None if value is None else convert(value)
+    return convert_optional
+
+
+def _converter(annotation: Any) -> Callable[[Any], Any]:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1 and args[0] in _CONVERTERS:
+            return _optional(_CONVERTERS[args[0]])
+    elif annotation in _CONVERTERS:
+        return _CONVERTERS[annotation]
+    raise TypeError(f"No fast JSON converter for {annotation!r}")
+
+
+class FlatModelEncoder:
+    """
+    Builds the JSON-ready dict of a flat DTO (str / int / float / datetime
+    fields, optionally None) straight from its constructor values, without
+    instantiating the model: same keys, order and values as
+    `jsonable_encoder(model(**values))`.
+
+    Values of any other type (e.g. an int where a str is expected, NaN) make
+    it fall back to the model for that object, so validation and output stay
+    exactly those of the model.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self._fields: List[Tuple[str, Callable[[Any], Any]]] = [
+            (field.alias or name, _converter(field.annotation)) for name, field in model.model_fields.items()
+        ]
+
+    def encode(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """`values` are the model's constructor arguments, keyed by alias."""
+        try:
+            return {key: convert(values[key]) for key, convert in self._fields}
+        except (_NotPlain, KeyError):
+            return self.model(**values).model_dump(mode="json", by_alias=True)
+
+
+def render_json(content: Any) -> bytes:
+    """
+    JSON body as JSONResponse renders it, for content that is already made of
+    JSON types (no jsonable_encoder pass).
+    """
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
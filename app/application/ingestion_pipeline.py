@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream between stages
+_END = object()
+
+
+class IngestionPipeline:
+    """
+    Streaming fetch -> transform -> index pipeline for new tenders.
+
+    Stages are connected by bounded asyncio queues, so network fetches,
+    CPU transforms and Solr writes overlap while a slow stage applies
+    backpressure upstream instead of letting buffers grow. Transforms run a
+    batch at a time in the threadpool: a batch is cheap (~1.5 ms for 50
+    typical details) but grows with the size of the payloads, and must not
+    stall the event loop that serves the fetches and the API.
+
+    Per-item failures are counted and never stop the pipeline. After
+    `max_index_failures` consecutive failed Solr batches the pipeline is
+    aborted: remaining IDs are drained without being fetched, queued work is
+    discarded (and counted) and every stage still closes its output queue.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Optional[Any]]],
+        transform: Callable[[Any], Dict[str, Any]],
+        index: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        fetch_concurrency: int = 1,
+        batch_size: int = 50,
+        queue_size: int = 100,
+        max_index_failures: int = 3,
+    ):
+        self.fetch = fetch
+        self.transform = transform
+        self.index = index
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.max_index_failures = max_index_failures
+
+    @staticmethod
+    def _new_stats() -> Dict[str, Dict[str, Any]]:
+        return {
+            "fetch": {"processed": 0, "empty": 0, "errors": 0, "skipped": 0, "busy_ms": 0},
+            "transform": {"processed": 0, "errors": 0, "skipped": 0, "busy_ms": 0},
+            "index": {"batches": 0, "docs": 0, "errors": 0, "skipped": 0, "busy_ms": 0},
+        }
+
+    def _transform_batch(self, entries: List[Tuple[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Transforms fetched items (in the threadpool). Returns the documents and the number of failures."""
+        docs: List[Dict[str, Any]] = []
+        errors = 0
+        for tender_id, item in entries:
+            try:
+                docs.append(self.transform(item))
+            except Exception as e:
+                logger.error(f"Error transforming new item {tender_id}: {e}")
+                errors += 1
+        return docs, errors
+
+    async def run(self, ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Runs the pipeline over `ids` until every stage has drained.
+
+        Returns:
+            Dict with per-stage counters plus `indexed`, `errors`, `aborted`
+            and `elapsed_ms`. Every input ID ends up either indexed or counted
+            as an error.
+        """
+        stats = self._new_stats()
+        ids_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        fetched_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        # Only a couple of batches may wait for Solr at any time
+        batch_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        aborted = asyncio.Event()
+
+        async def feed() -> None:
+            for tender_id in ids:
+                await ids_queue.put(tender_id)
+            for _ in range(self.fetch_concurrency):
+                await ids_queue.put(_END)
+
+        active_fetchers = self.fetch_concurrency
+
+        async def fetch_worker() -> None:
+            nonlocal active_fetchers
+            counters = stats["fetch"]
+            while True:
+                tender_id = await ids_queue.get()
+                if tender_id is _END:
+                    break
+                if aborted.is_set():
+                    counters["skipped"] += 1
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    item = await self.fetch(tender_id)
+                    if item is None:
+                        logger.warning(f"No detail found for new item {tender_id}")
+                        counters["empty"] += 1
+                except Exception as e:
+                    logger.error(f"Error fetching new item {tender_id}: {e}")
+                    counters["errors"] += 1
+                    item = None
+                counters["processed"] += 1
+                counters["busy_ms"] += int((time.perf_counter() - started) * 1000)
+
+                if item is not None:
+                    await fetched_queue.put((tender_id, item))
+
+            active_fetchers -= 1
+            if active_fetchers == 0:
+                await fetched_queue.put(_END)
+
+        async def transform_stage() -> None:
+            counters = stats["transform"]
+            pending: List[Tuple[str, Any]] = []
+            done = False
+            while not done:
+                entry = await fetched_queue.get()
+                if entry is _END:
+                    # Hand over whatever was already fetched, then close the stream
+                    done = True
+                elif aborted.is_set():
+                    counters["skipped"] += 1
+                else:
+                    pending.append(entry)
+                if not pending or (len(pending) < self.batch_size and not done):
+                    continue
+                if aborted.is_set():
+                    counters["skipped"] += len(pending)
+                    pending = []
+                    continue
+
+                started = time.perf_counter()
+                batch, errors = await run_in_threadpool(self._transform_batch, pending)
+                counters["processed"] += len(batch)
+                counters["errors"] += errors
+                counters["busy_ms"] += int((time.perf_counter() - started) * 1000)
+                pending = []
+                if batch:
+                    await batch_queue.put(batch)
+
+            await batch_queue.put(_END)
+
+        async def index_stage() -> None:
+            counters = stats["index"]
+            consecutive_failures = 0
+            while True:
+                batch = await batch_queue.get()
+                if batch is _END:
+                    break
+                if aborted.is_set():
+                    # Keep draining so upstream stages never block on a full queue
+                    counters["skipped"] += len(batch)
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    await self.index(batch)
+                    counters["batches"] += 1
+                    counters["docs"] += len(batch)
+                    consecutive_failures = 0
+                except Exception as e:
+                    logger.error(f"Error indexing batch of new items: {e}")
+                    counters["errors"] += len(batch)
+                    consecutive_failures += 1
+                    if consecutive_failures >= self.max_index_failures:
+                        logger.error(
+                            f"Aborting ingestion pipeline after {consecutive_failures} consecutive Solr failures"
+                        )
+                        aborted.set()
+                counters["busy_ms"] += int((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(feed()),
+            *(asyncio.create_task(fetch_worker()) for _ in range(self.fetch_concurrency)),
+            asyncio.create_task(transform_stage()),
+            asyncio.create_task(index_stage()),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Shutdown or unexpected failure: make sure no stage outlives the pipeline
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        fetch, transform, index = stats["fetch"], stats["transform"], stats["index"]
+        elapsed = time.perf_counter() - started
+        return {
+            "stages": stats,
+            "indexed": index["docs"],
+            "errors": (
+                fetch["errors"] + fetch["empty"] + fetch["skipped"]
+                + transform["errors"] + transform["skipped"]
+                + index["errors"] + index["skipped"]
+            ),
+            "aborted": aborted.is_set(),
+            "elapsed_ms": int(elapsed * 1000),
+            "fetch_throughput_per_s": round(fetch["processed"] / elapsed, 2) if elapsed > 0 else 0.0,
+        }
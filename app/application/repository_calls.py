@@ -0,0 +1,15 @@
+import inspect
+from typing import Any, Callable
+
+from starlette.concurrency import run_in_threadpool
+
+
+async def call_repository(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Calls a repository method that may be blocking (pysolr) or native async
+    (AsyncSolrTenderRepository): coroutine functions are awaited directly,
+    blocking ones run in the threadpool.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args, **kwargs)
+    return await run_in_threadpool(fn, *args, **kwargs)
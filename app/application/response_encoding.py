@@ -0,0 +1,228 @@
+import hashlib
+import importlib.util
+import logging
+import os
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.infrastructure.solr.result_cache import IndexGeneration, ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Content codings offered, preferred first on equal q-values
+ENCODINGS = ("br", "gzip")
+
+
+@lru_cache(maxsize=256)
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    weights = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def _opaque_tag(tag: str) -> str:
+    # `W/"abc"` -> `abc`: If-None-Match uses the weak comparison
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag.strip('"')
+
+
+class StreamCompressor:
+    """Incremental gzip or brotli compressor for streamed bodies."""
+
+    def __init__(self, encoding: str, gzip_level: int = 6, brotli_quality: int = 4):
+        self.encoding = encoding
+        if encoding == "br":
+            import brotli
+
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, wbits=31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compresses and flushes `chunk`, so the client can decode everything sent so far."""
+        if self.encoding == "br":
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._brotli.finish() if self.encoding == "br" else self._zlib.flush()
+
+
+class ResponseEncoder:
+    """
+    Content-Encoding negotiation and conditional GET for the pre-rendered
+    read endpoints (/search, /search/facets, /tenders, /search/export).
+
+    Bodies are compressed with brotli (when the optional `brotli` package is
+    installed) or gzip, as the client's Accept-Encoding prefers; compressed
+    bodies are kept in a small cache keyed by the body digest, so repeated
+    responses (search/tender cache hits) are only compressed once.
+
+    ETags are derived from the request (route + canonical query) and the index
+    generation, never from the body, so `If-None-Match` is answered with 304
+    before Solr is queried. Like the result caches, the generation only tracks
+    ingestion in this process: ETags also carry a process epoch (restarts and
+    other workers never match). They are weak (W/"<tag>"): every content coding
+    of a response shares the tag, which is not byte-for-byte the same entity.
+    """
+
+    def __init__(
+        self,
+        generation: Optional[IndexGeneration] = None,
+        compression: bool = True,
+        min_bytes: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        etags: bool = True,
+        compressed_cache: Optional[ResultCache] = None,
+    ):
+        self.generation = generation
+        self.compression = compression
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.etags = etags
+        self.compressed_cache = compressed_cache
+        self.encodings = tuple(
+            encoding for encoding in ENCODINGS if encoding != "br" or importlib.util.find_spec("brotli") is not None
+        )
+        if compression and "br" not in self.encodings:
+            logger.info("The 'brotli' package is not installed: responses are only gzip-compressed")
+        self.epoch = f"{os.getpid()}:{time.time_ns()}"
+        self._stats = {"responses": 0, "not_modified": 0, "identity_bytes": 0, "sent_bytes": 0}
+        self._stats.update({encoding: 0 for encoding in ENCODINGS})
+
+    @property
+    def enabled(self) -> bool:
+        return self.compression or self.etags
+
+    def negotiate(self, request: Request) -> Optional[str]:
+        """Content coding to use for the request (None: identity)."""
+        if not self.compression:
+            return None
+        weights = _parse_accept_encoding(request.headers.get("accept-encoding", ""))
+        default = weights.get("*", 0.0)
+        best, best_weight = None, 0.0
+        for encoding in self.encodings:
+            weight = weights.get(encoding, default)
+            if weight > best_weight:
+                best, best_weight = encoding, weight
+        return best
+
+    def etag(self, scope: str, key: Hashable) -> Optional[str]:
+        """Opaque tag of the response to `key` at the current index generation (None when disabled)."""
+        if not self.etags:
+            return None
+        generation = self.generation.value if self.generation is not None else None
+        raw = repr((self.epoch, generation, scope, key)).encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=12).hexdigest()
+
+    def _headers(self, etag: Optional[str]) -> Dict[str, str]:
+        headers = {}
+        if self.compression:
+            headers["Vary"] = "Accept-Encoding"
+        if etag is not None:
+            headers["ETag"] = f'W/"{etag}"'
+            # Always revalidated: the tag, not a max-age, decides freshness
+            headers["Cache-Control"] = "private, no-cache"
+        return headers
+
+    def not_modified(self, request: Request, etag: Optional[str]) -> Optional[Response]:
+        """
+        304 response when the request's If-None-Match holds `etag`, else None.
+
+        `If-None-Match: *` is ignored: it is evaluated before the resource is
+        looked up, so it cannot tell whether there is a current representation.
+        """
+        if etag is None:
+            return None
+        header = request.headers.get("if-none-match")
+        if not header:
+            return None
+        if not any(tag.strip() != "*" and _opaque_tag(tag) == etag for tag in header.split(",")):
+            return None
+        self._stats["not_modified"] += 1
+        return Response(status_code=304, headers=self._headers(etag))
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        if self.compressed_cache is not None:
+            cached = self.compressed_cache.get(key)
+            if cached is not None:
+                return cached
+        if encoding == "br":
+            import brotli
+
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = zlib.compress(body, self.gzip_level, wbits=31)
+        if self.compressed_cache is not None:
+            self.compressed_cache.put(key, compressed)
+        return compressed
+
+    def respond(
+        self,
+        request: Request,
+        body: bytes,
+        etag: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        media_type: str = "application/json",
+    ) -> Response:
+        """Response for a pre-rendered body, compressed as negotiated and tagged with `etag`."""
+        encoding = self.negotiate(request) if len(body) >= self.min_bytes else None
+        content = self._compress(body, encoding) if encoding else body
+        response_headers = {**(headers or {}), **self._headers(etag)}
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+            self._stats[encoding] += 1
+        self._stats["responses"] += 1
+        self._stats["identity_bytes"] += len(body)
+        self._stats["sent_bytes"] += len(content)
+        return Response(content=content, media_type=media_type, headers=response_headers)
+
+    def stream_headers(self, etag: Optional[str], encoding: Optional[str]) -> Dict[str, str]:
+        """Headers of a streamed response compressed with `encoding` (see `stream_compressor`)."""
+        headers = self._headers(etag)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            self._stats[encoding] += 1
+        self._stats["responses"] += 1
+        return headers
+
+    def stream_compressor(self, encoding: Optional[str]) -> Optional[StreamCompressor]:
+        if not encoding:
+            return None
+        return StreamCompressor(encoding, gzip_level=self.gzip_level, brotli_quality=self.brotli_quality)
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        return {
+            **stats,
+            "compression_ratio": round(stats["sent_bytes"] / stats["identity_bytes"], 3) if stats["identity_bytes"] else None,
+            "compression": self.compression,
+            "encodings": list(self.encodings) if self.compression else [],
+            "min_bytes": self.min_bytes,
+            "etags": self.etags,
+            "generation": self.generation.value if self.generation is not None else None,
+            "compressed_cache": self.compressed_cache.snapshot() if self.compressed_cache is not None else None,
+        }
@@ -0,0 +1,120 @@
+import csv
+import io
+import logging
+import time
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.application.fast_json import render_json
+from app.application.repository_calls import call_repository
+from app.application.response_encoding import StreamCompressor
+from app.application.transformer_service import TenderTransformer
+from app.domain.ports import SolrTenderRepositoryPort
+from app.domain.schemas import SearchProfile, TenderSummaryDTO
+from app.infrastructure.solr.search_cursor import CURSOR_START
+
+logger = logging.getLogger(__name__)
+
+# CSV columns: the TenderSummaryDTO fields, by their API names
+CSV_COLUMNS = [field.alias or name for name, field in TenderSummaryDTO.model_fields.items()]
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class SearchExporter:
+    """
+    Streams every result of a search as NDJSON or CSV.
+
+    Solr is walked with cursorMark, `batch_size` documents per request, and
+    each batch is mapped to TenderSummaryDTO JSON, encoded (and compressed)
+    and handed out before the next one is read, so memory stays constant no
+    matter how many tenders match.
+    """
+
+    MEDIA_TYPES = {ExportFormat.ndjson: "application/x-ndjson", ExportFormat.csv: "text/csv; charset=utf-8"}
+
+    def __init__(self, solr_repo: SolrTenderRepositoryPort, batch_size: int = 1000):
+        self.solr_repo = solr_repo
+        self.batch_size = max(1, batch_size)
+
+    def media_type(self, export_format: ExportFormat, gzip: bool = False) -> str:
+        return "application/gzip" if gzip else self.MEDIA_TYPES[export_format]
+
+    async def _iter_docs(self, query: str, status_codes: List[int]) -> AsyncIterator[List[Dict[str, Any]]]:
+        cursor_mark = CURSOR_START
+        while True:
+            raw_result = await call_repository(
+                self.solr_repo.search,
+                query=query,
+                size=self.batch_size,
+                status_codes=status_codes,
+                fl=TenderTransformer.profile_fl(SearchProfile.full),
+                cursorMark=cursor_mark,
+                # search() caps `size` at a page of 100; exports read bigger batches
+                rows=self.batch_size,
+            )
+            docs = raw_result.get("docs", [])
+            if docs:
+                yield docs
+            next_cursor_mark = raw_result.get("next_cursor_mark")
+            if len(docs) < self.batch_size or not next_cursor_mark or next_cursor_mark == cursor_mark:
+                return
+            cursor_mark = next_cursor_mark
+
+    @staticmethod
+    def _encode_ndjson(items: List[Dict[str, Any]]) -> bytes:
+        # Each line is the same JSON /tenders/{id} renders
+        return b"".join(render_json(item) + b"\n" for item in items)
+
+    @staticmethod
+    def _encode_csv(items: List[Dict[str, Any]], header: bool = False) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(CSV_COLUMNS)
+        for row in items:
+            writer.writerow(["" if row[column] is None else row[column] for column in CSV_COLUMNS])
+        return buffer.getvalue().encode("utf-8")
+
+    async def stream(
+        self,
+        query: str,
+        status_codes: List[int],
+        export_format: ExportFormat,
+        compressor: Optional[StreamCompressor] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields the export body chunk by chunk (one chunk per Solr batch),
+        compressed with `compressor` (gzip file or negotiated Content-Encoding).
+        """
+        started = time.monotonic()
+        exported = 0
+        try:
+            if export_format == ExportFormat.csv:
+                # Sent up front, so an empty result set still gets its header
+                chunk = self._encode_csv([], header=True)
+                yield compressor.compress(chunk) if compressor else chunk
+            async for docs in self._iter_docs(query, status_codes):
+                items = [TenderTransformer.solr_doc_to_profile_item(doc, SearchProfile.full) for doc in docs]
+                if export_format == ExportFormat.csv:
+                    chunk = self._encode_csv(items)
+                else:
+                    chunk = self._encode_ndjson(items)
+                exported += len(items)
+                if compressor:
+                    # Flushed per batch so the client receives data as it is produced
+                    chunk = compressor.compress(chunk)
+                yield chunk
+            if compressor:
+                yield compressor.finish()
+        except Exception as e:
+            # Headers are already sent: the client sees a truncated body
+            logger.error(f"Search export aborted after {exported} tenders (query='{query}'): {e}")
+            raise
+        logger.info(
+            f"Search export of {exported} tenders finished in {time.monotonic() - started:.1f}s "
+            f"(query='{query}', format={export_format.value}, encoding={compressor.encoding if compressor else None})"
+        )
@@ -0,0 +1,106 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.domain.ports import SolrTenderRepositoryPort
+from app.domain.suggest_index import SUGGEST_FIELDS, SuggestIndex
+
+logger = logging.getLogger(__name__)
+
+
+class TenderSuggester:
+    """
+    Owns the in-process SuggestIndex behind /suggest.
+
+    `load` builds it from a cursorMark scan of the core; `refresh` applies the
+    documents an ingestion run wrote and rebuilds it, without touching Solr.
+    Builds run in the threadpool and swap in atomically, so queries keep being
+    answered from the previous index meanwhile.
+    """
+
+    FIELDS = ",".join(["id", *SUGGEST_FIELDS.values()])
+
+    def __init__(self, solr_repo: SolrTenderRepositoryPort, batch_size: int = 5000, **index_options: Any):
+        self.solr_repo = solr_repo
+        self.batch_size = batch_size
+        self.index_options = index_options
+        self.index = SuggestIndex(**index_options)
+        self.ready = False
+        self.loaded_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        self.last_build_ms: Optional[int] = None
+        self.last_error: Optional[str] = None
+        # Loads and refreshes never overlap
+        self._lock = asyncio.Lock()
+
+    def suggest(self, prefix: str, kinds: Optional[Iterable[str]] = None, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """Suggestions per kind: [{"text", "count"}] with `count` the tenders using the text."""
+        return {
+            kind: [{"text": text, "count": count} for text, count in pairs]
+            for kind, pairs in self.index.suggest(prefix, kinds, limit).items()
+        }
+
+    async def _scan(self, index: SuggestIndex) -> None:
+        if inspect.isasyncgenfunction(self.solr_repo.iter_fields):
+            batch = []
+            async for doc in self.solr_repo.iter_fields(self.FIELDS, batch_size=self.batch_size):
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    index.apply(batch)
+                    batch = []
+            index.apply(batch)
+        else:
+            await run_in_threadpool(lambda: index.apply(self.solr_repo.iter_fields(self.FIELDS, batch_size=self.batch_size)))
+
+    async def load(self) -> Dict[str, Any]:
+        """Rebuilds the index from scratch from a full scan of the core."""
+        async with self._lock:
+            started = time.perf_counter()
+            index = SuggestIndex(**self.index_options)
+            try:
+                await self._scan(index)
+                await run_in_threadpool(index.rebuild)
+            except Exception as e:
+                logger.error(f"Error loading suggest index from Solr: {e}")
+                self.last_error = str(e)
+                return {"status": "error", "error_detail": str(e)}
+            self.index = index
+            self.ready = True
+            self.loaded_at = time.time()
+            self.last_build_ms = int((time.perf_counter() - started) * 1000)
+            self.last_error = None
+            logger.info(f"Suggest index loaded in {self.last_build_ms} ms: {index.stats()}")
+            return {"status": "ok", "execution_time_ms": self.last_build_ms, **index.stats()}
+
+    async def refresh(self, docs: List[Dict[str, Any]]) -> int:
+        """
+        Applies documents (or atomic updates) written by an ingestion run and
+        rebuilds the index if any suggestion changed. Returns the tenders changed.
+        """
+        async with self._lock:
+            if not self.ready:
+                # The next load reads them from Solr
+                return 0
+            changed = self.index.apply(docs)
+            if changed:
+                started = time.perf_counter()
+                await run_in_threadpool(self.index.rebuild)
+                self.refreshed_at = time.time()
+                self.last_build_ms = int((time.perf_counter() - started) * 1000)
+                logger.info(f"Suggest index refreshed with {changed} changed tenders in {self.last_build_ms} ms")
+            return changed
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "loading": self._lock.locked(),
+            "loaded_at": self.loaded_at,
+            "refreshed_at": self.refreshed_at,
+            "last_build_ms": self.last_build_ms,
+            "last_error": self.last_error,
+            **self.index.stats(),
+        }
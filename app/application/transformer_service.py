@@ -1,9 +1,38 @@
-from typing import Any, Dict, Optional
-from app.domain.schemas import Licitacion, TenderSummaryDTO, TenderIndexDoc
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Union
+from app.application.fast_json import FlatModelEncoder
+from app.domain.schemas import Licitacion, SearchProfile, TenderCardDTO, TenderIndexDoc, TenderListDTO, TenderSummaryDTO
+
+ProfileDTO = Union[TenderListDTO, TenderCardDTO, TenderSummaryDTO]
 
 
 class TenderTransformer:
     """Transforms domain models into DTOs and Solr index documents."""
+
+    # Index fields that can also be read from the status listings
+    LISTING_FIELDS = ("title", "status_code", "closing_date")
+    FINGERPRINT_FIELDS = ("listing_fingerprint", "detail_fingerprint")
+    # Solr fields read by each search projection profile (exactly what its DTO needs)
+    PROFILE_FIELDS = {
+        SearchProfile.list: ("id", "title", "entity", "status_code", "closing_date", "type", "score"),
+        SearchProfile.card: (
+            "id", "title", "entity", "region", "comuna", "type", "status_code", "publish_date", "closing_date",
+            "currency", "amount", "complaints_level", "complaints_count", "products_count", "url", "score",
+        ),
+        SearchProfile.full: (
+            "id", "title", "description", "entity", "region", "comuna", "type", "status_code", "publish_date",
+            "closing_date", "currency", "amount", "complaints_level", "complaints_count", "products_count", "url",
+            "score",
+        ),
+    }
+    # DTO of each profile, also used to encode search items without building it
+    PROFILE_DTOS = {
+        SearchProfile.list: TenderListDTO,
+        SearchProfile.card: TenderCardDTO,
+        SearchProfile.full: TenderSummaryDTO,
+    }
+    PROFILE_ENCODERS = {profile: FlatModelEncoder(dto) for profile, dto in PROFILE_DTOS.items()}
     
     @staticmethod
     def _map_status(code: int) -> str:
@@ -131,6 +160,30 @@ class TenderTransformer:
             url=f"https://www.mercadopublico.cl/Procurement/Modules/RFB/DetailsAcquisition.aspx?idlicitacion={lic.codigo_externo}",
         )
 
+    # --- Fingerprints for change detection ---
+
+    @staticmethod
+    def _fingerprint(value: Any) -> str:
+        raw = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def listing_fingerprint(cls, fields: Dict[str, Any]) -> str:
+        """
+        Fingerprint of the listing-level fields (title, status_code, closing_date).
+        Values must already be normalized so listing and detail data hash alike.
+        """
+        return cls._fingerprint([fields.get(name) for name in cls.LISTING_FIELDS])
+
+    @classmethod
+    def detail_fingerprint(cls, payload: Dict[str, Any]) -> str:
+        """
+        Fingerprint of a full index payload without the listing-level and
+        fingerprint fields, so a listing-only change leaves it unchanged.
+        """
+        excluded = (*cls.LISTING_FIELDS, *cls.FINGERPRINT_FIELDS)
+        return cls._fingerprint({k: v for k, v in payload.items() if k not in excluded})
+
     # --- Helpers for Solr search results ---
 
     @staticmethod
@@ -159,15 +212,65 @@ class TenderTransformer:
         return value
 
     @classmethod
-    def solr_doc_to_summary_dto(cls, doc: Dict[str, Any]) -> TenderSummaryDTO:
+    def solr_facets_to_dto(cls, facets: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Adds the normalized status (`label`) to the status facet buckets."""
+        if "status" in facets:
+            facets["status"] = [
+                {"value": bucket["value"], "label": cls._map_status(int(bucket["value"])), "count": bucket["count"]}
+                for bucket in facets["status"]
+            ]
+        return facets
+
+    @classmethod
+    def profile_fl(cls, profile: SearchProfile) -> str:
+        """Solr `fl` parameter of a search projection profile."""
+        return ",".join(cls.PROFILE_FIELDS[profile])
+
+    @classmethod
+    def _profile_fields(cls, doc: Dict[str, Any], profile: SearchProfile) -> Dict[str, Any]:
+        if profile == SearchProfile.list:
+            return cls._list_fields(doc)
+        if profile == SearchProfile.card:
+            return cls._card_fields(doc)
+        return cls._summary_fields(doc)
+
+    @classmethod
+    def solr_doc_to_profile_dto(cls, doc: Dict[str, Any], profile: SearchProfile) -> ProfileDTO:
+        """Converts a raw Solr document into the DTO of a search projection profile."""
+        return cls.PROFILE_DTOS[profile](**cls._profile_fields(doc, profile))
+
+    @classmethod
+    def solr_doc_to_profile_item(cls, doc: Dict[str, Any], profile: SearchProfile) -> Dict[str, Any]:
         """
-        Converts a raw Solr document (dict) into a `TenderSummaryDTO`
-        ready for frontend consumption.
+        Converts a raw Solr document straight into the JSON-ready dict of its
+        profile DTO, identical to `jsonable_encoder(solr_doc_to_profile_dto(...))`
+        but without building and re-serializing the model.
         """
-        return TenderSummaryDTO(
+        return cls.PROFILE_ENCODERS[profile].encode(cls._profile_fields(doc, profile))
+
+    @classmethod
+    def _list_fields(cls, doc: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(
+            id=doc.get("id", ""),
+            title=cls._first_or_empty(doc.get("title")),
+            entity=cls._first_or_empty(doc.get("entity")),
+            status=cls._map_status(int(cls._first_number_or_default(doc.get("status_code"), 0))),
+            closingDate=cls._first_or_none(doc.get("closing_date")),
+            montoDisplay=cls._monto_display(None, cls._first_or_empty(doc.get("type"))),
+            score=doc.get("score", 0.0),
+        )
+
+    @classmethod
+    def solr_doc_to_list_dto(cls, doc: Dict[str, Any]) -> TenderListDTO:
+        """Converts a raw Solr document into a `TenderListDTO` (profile "list")."""
+        return TenderListDTO(**cls._list_fields(doc))
+
+    @classmethod
+    def _card_fields(cls, doc: Dict[str, Any]) -> Dict[str, Any]:
+        # Shared by the "card" and "full" profiles, which only differ in the description
+        return dict(
             id=doc.get("id", ""),
             title=cls._first_or_empty(doc.get("title")),
-            description=cls._first_or_empty(doc.get("description")),
             entity=cls._first_or_empty(doc.get("entity")),
             region=cls._first_or_empty(doc.get("region")),
             comuna=cls._first_or_empty(doc.get("comuna")),
@@ -187,3 +290,20 @@ class TenderTransformer:
             url=cls._first_or_empty(doc.get("url")),
             score=doc.get("score", 0.0),
         )
+
+    @classmethod
+    def _summary_fields(cls, doc: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(cls._card_fields(doc), description=cls._first_or_empty(doc.get("description")))
+
+    @classmethod
+    def solr_doc_to_card_dto(cls, doc: Dict[str, Any]) -> TenderCardDTO:
+        """Converts a raw Solr document into a `TenderCardDTO` (profile "card")."""
+        return TenderCardDTO(**cls._card_fields(doc))
+
+    @classmethod
+    def solr_doc_to_summary_dto(cls, doc: Dict[str, Any]) -> TenderSummaryDTO:
+        """
+        Converts a raw Solr document (dict) into a `TenderSummaryDTO`
+        ready for frontend consumption (profile "full").
+        """
+        return TenderSummaryDTO(**cls._summary_fields(doc))
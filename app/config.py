@@ -1,8 +1,11 @@
 import logging
 import os
+from typing import Literal, Optional
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
+from app.domain.schemas import CommitPolicy
+
 class Settings(BaseSettings):
     # Sin valores por defecto para forzar el uso del .env
     mp_ticket: str
@@ -13,6 +16,54 @@ class Settings(BaseSettings):
     solr_core: str
     solr_username: str
     solr_password: str
+    # Commit policy for ingestion writes: hard, soft, within, end
+    solr_commit_policy: CommitPolicy = CommitPolicy.hard
+    solr_commit_within_ms: int = 10000
+    # Repository implementation: pysolr in the threadpool (false) or native async over a pooled client (true)
+    solr_async_client: bool = False
+    solr_timeout_s: float = 10.0
+    solr_http_max_connections: int = 20
+    solr_http_max_keepalive: int = 10
+    # Real-time get (/get) lookups: ids per request and requests in flight
+    solr_rtg_chunk_size: int = 200
+    solr_rtg_concurrency: int = 4
+    # Full state snapshot for large diffs: loaded once the listed ids reach this
+    # fraction of the index size (0 disables); handler "cursor" or "export" (needs docValues)
+    solr_snapshot_ratio: float = 0.2
+    solr_snapshot_handler: Literal["cursor", "export"] = "cursor"
+
+    # In-process cache of /search responses, dropped whenever ingestion makes new data visible (0 entries disables)
+    search_cache_max_entries: int = 1000
+    search_cache_max_mb: int = 64
+    search_cache_ttl_s: float = 60.0
+    # In-process cache of /search/facets responses, same invalidation as the search cache (0 entries disables)
+    facet_cache_max_entries: int = 500
+    facet_cache_max_mb: int = 16
+    facet_cache_ttl_s: float = 300.0
+    # Deepest /search offset ((page - 1) * size) served with page numbers; deeper pages need the cursor.
+    # Opt-in (0 = no limit), since enabling it makes existing deep page links fail with 400
+    search_max_offset: int = 0
+    # Documents per Solr cursor request in /search/export
+    search_export_batch_size: int = 1000
+    # In-memory /suggest index over titles, entities and categories: loaded from Solr
+    # at startup and refreshed after every ingestion run
+    suggest_enabled: bool = True
+    suggest_batch_size: int = 5000
+    # Per-tender cache behind /tenders/{id} and /tenders/batch, invalidated per id by ingestion (0 entries disables)
+    tender_cache_max_entries: int = 5000
+    tender_cache_max_mb: int = 32
+    tender_cache_ttl_s: float = 300.0
+    # Response compression of /search, /search/facets, /tenders and /search/export (brotli needs the `brotli` package,
+    # gzip otherwise); compressed bodies are cached by digest (0 entries disables the cache)
+    http_compression_enabled: bool = True
+    http_compression_min_bytes: int = 1024
+    http_gzip_level: int = 6
+    http_brotli_quality: int = 4
+    http_compressed_cache_max_entries: int = 1000
+    http_compressed_cache_max_mb: int = 32
+    http_compressed_cache_ttl_s: float = 300.0
+    # Weak ETags (request + index generation) and 304 answers to If-None-Match on the same routes
+    http_etag_enabled: bool = True
     
     # Admin Security
     admin_token: str
@@ -26,6 +77,42 @@ class Settings(BaseSettings):
     # View file app/dependencies.py at step 152: 
     # return IngestionService(mp_client=real_client, solr_url=settings.solr_url)
     
+    # Ingestion tuning
+    ingest_fetch_concurrency: int = 8
+    ingest_pipeline_queue_size: int = 100
+    # Re-fetch details of tenders whose listing changed; re-index only if detail data moved
+    ingest_refetch_on_change: bool = False
+    # Local ingestion state store (SQLite file, ideally on a volume). Disabled when empty.
+    state_store_path: Optional[str] = None
+    # Daily run mode: one pass over all status lists instead of one run per status
+    daily_consolidated: bool = False
+    # Checkpoint journal directory; interrupted runs resume from it. Disabled when empty.
+    checkpoint_dir: Optional[str] = None
+    checkpoint_max_age_hours: float = 24.0
+
+    # Shared Mercado Público HTTP connection pool (HTTP/2 requires httpx[http2])
+    mp_http_timeout_s: float = 30.0
+    mp_http_max_connections: int = 20
+    mp_http_max_keepalive: int = 10
+    mp_http_keepalive_expiry_s: float = 30.0
+    mp_http2: bool = False
+
+    # On-disk cache of Mercado Público detail payloads. Disabled when empty.
+    mp_detail_cache_dir: Optional[str] = None
+    mp_detail_cache_max_mb: int = 512
+    # TTL by tender state: published, closed/suspended, final (awarded, deserted, revoked)
+    mp_detail_cache_ttl_open_s: int = 3600
+    mp_detail_cache_ttl_closed_s: int = 21600
+    mp_detail_cache_ttl_final_s: int = 604800
+
+    # Mercado Público adaptive rate limiting (token bucket + AIMD concurrency)
+    mp_rate_limit_enabled: bool = True
+    mp_rate_initial: float = 5.0
+    mp_rate_min: float = 0.5
+    mp_rate_max: float = 20.0
+    mp_concurrency_initial: int = 4
+    mp_concurrency_max: int = 16
+
     log_level: str = "INFO"
 
     model_config = {
@@ -7,24 +7,206 @@ from fastapi import Header, HTTPException, Depends
 from app.application.ingestion_service import IngestionService
 from app.application.active_ingestion_service import TenderIngestionService
 from app.application.daily_ingestion_runner import DailyIngestionRunner
+from app.application.response_encoding import ResponseEncoder
+from app.application.suggest_service import TenderSuggester
+from app.infrastructure.checkpoint.journal import CheckpointJournal
 from app.infrastructure.mercadopublico.client import MercadoPublicoClient
+from app.infrastructure.mercadopublico.detail_cache import DetailCache
+from app.infrastructure.http_pool import SharedHttpClient
+from app.infrastructure.mercadopublico.rate_limiter import AdaptiveRateLimiter
+from app.infrastructure.solr.async_repository import AsyncSolrTenderRepository
 from app.infrastructure.solr.repository import SolrTenderRepository
+from app.infrastructure.solr.result_cache import IndexGeneration, ResultCache
+from app.infrastructure.state.sqlite_store import SqliteTenderStateStore
 from app.config import settings
 
+@lru_cache()
+def get_mp_rate_limiter() -> Optional[AdaptiveRateLimiter]:
+    """
+    Singleton rate limiter shared by every MercadoPublicoClient instance,
+    so list calls, detail fetches and /test routes compete for the same budget.
+    """
+    if not settings.mp_rate_limit_enabled:
+        return None
+    return AdaptiveRateLimiter(
+        initial_rate=settings.mp_rate_initial,
+        min_rate=settings.mp_rate_min,
+        max_rate=settings.mp_rate_max,
+        initial_concurrency=settings.mp_concurrency_initial,
+        max_concurrency=settings.mp_concurrency_max,
+    )
+
+@lru_cache()
+def get_mp_detail_cache() -> Optional[DetailCache]:
+    """Singleton on-disk detail cache, or None when MP_DETAIL_CACHE_DIR is not set."""
+    if not settings.mp_detail_cache_dir:
+        return None
+    return DetailCache(
+        settings.mp_detail_cache_dir,
+        max_bytes=settings.mp_detail_cache_max_mb * 1024 * 1024,
+        ttl_open_s=settings.mp_detail_cache_ttl_open_s,
+        ttl_closed_s=settings.mp_detail_cache_ttl_closed_s,
+        ttl_final_s=settings.mp_detail_cache_ttl_final_s,
+    )
+
+@lru_cache()
+def get_mp_http_pool() -> SharedHttpClient:
+    """
+    Singleton pooled HTTP client shared by every MercadoPublicoClient.
+    Closed by the application lifespan.
+    """
+    return SharedHttpClient(
+        "Mercado Público",
+        timeout=settings.mp_http_timeout_s,
+        max_connections=settings.mp_http_max_connections,
+        max_keepalive_connections=settings.mp_http_max_keepalive,
+        keepalive_expiry=settings.mp_http_keepalive_expiry_s,
+        http2=settings.mp_http2,
+    )
+
 def get_mercado_publico_client():
     return MercadoPublicoClient(
         ticket=settings.mp_ticket,
-        base_url=settings.mp_base_url
+        base_url=settings.mp_base_url,
+        timeout=settings.mp_http_timeout_s,
+        rate_limiter=get_mp_rate_limiter(),
+        detail_cache=get_mp_detail_cache(),
+        http_client=get_mp_http_pool().client
+    )
+
+@lru_cache()
+def get_solr_http_pool() -> SharedHttpClient:
+    """Singleton pooled HTTP client used by the async Solr repository."""
+    return SharedHttpClient(
+        "Solr",
+        timeout=settings.solr_timeout_s,
+        max_connections=settings.solr_http_max_connections,
+        max_keepalive_connections=settings.solr_http_max_keepalive,
     )
 
+@lru_cache()
 def get_solr_repository():
+    """
+    Singleton Solr repository. SOLR_ASYNC_CLIENT selects the native async
+    implementation; otherwise pysolr calls run in the threadpool.
+    """
+    if settings.solr_async_client:
+        return AsyncSolrTenderRepository(
+            base_url=settings.solr_base_url,
+            core=settings.solr_core,
+            username=settings.solr_username,
+            password=settings.solr_password,
+            timeout=settings.solr_timeout_s,
+            commit_within_ms=settings.solr_commit_within_ms,
+            http_pool=get_solr_http_pool(),
+            rtg_chunk_size=settings.solr_rtg_chunk_size,
+            rtg_concurrency=settings.solr_rtg_concurrency,
+            snapshot_handler=settings.solr_snapshot_handler
+        )
     return SolrTenderRepository(
         base_url=settings.solr_base_url,
         core=settings.solr_core,
         username=settings.solr_username,
-        password=settings.solr_password
+        password=settings.solr_password,
+        timeout=settings.solr_timeout_s,
+        commit_within_ms=settings.solr_commit_within_ms,
+        rtg_chunk_size=settings.solr_rtg_chunk_size,
+        rtg_concurrency=settings.solr_rtg_concurrency,
+        snapshot_handler=settings.solr_snapshot_handler
+    )
+
+@lru_cache()
+def get_index_generation() -> IndexGeneration:
+    """Singleton index generation, bumped by ingestion and read by the result caches."""
+    return IndexGeneration()
+
+@lru_cache()
+def get_search_cache() -> Optional[ResultCache]:
+    """Singleton /search response cache, or None when SEARCH_CACHE_MAX_ENTRIES is 0."""
+    if settings.search_cache_max_entries <= 0:
+        return None
+    return ResultCache(
+        "Search",
+        get_index_generation(),
+        max_entries=settings.search_cache_max_entries,
+        max_bytes=settings.search_cache_max_mb * 1024 * 1024,
+        ttl_s=settings.search_cache_ttl_s,
+    )
+
+@lru_cache()
+def get_tender_cache() -> Optional[ResultCache]:
+    """
+    Singleton per-tender response cache behind GET /tenders/{id} and
+    POST /tenders/batch, or None when TENDER_CACHE_MAX_ENTRIES is 0.
+    Ingestion invalidates the ids it writes.
+    """
+    if settings.tender_cache_max_entries <= 0:
+        return None
+    return ResultCache(
+        "Tender",
+        max_entries=settings.tender_cache_max_entries,
+        max_bytes=settings.tender_cache_max_mb * 1024 * 1024,
+        ttl_s=settings.tender_cache_ttl_s,
+    )
+
+@lru_cache()
+def get_facet_cache() -> Optional[ResultCache]:
+    """Singleton /search/facets response cache, or None when FACET_CACHE_MAX_ENTRIES is 0."""
+    if settings.facet_cache_max_entries <= 0:
+        return None
+    return ResultCache(
+        "Facet",
+        get_index_generation(),
+        max_entries=settings.facet_cache_max_entries,
+        max_bytes=settings.facet_cache_max_mb * 1024 * 1024,
+        ttl_s=settings.facet_cache_ttl_s,
+    )
+
+@lru_cache()
+def get_response_encoder() -> ResponseEncoder:
+    """
+    Singleton compression / ETag handler of the read endpoints; ETags follow
+    the index generation bumped by ingestion.
+    """
+    compressed_cache = None
+    if settings.http_compression_enabled and settings.http_compressed_cache_max_entries > 0:
+        compressed_cache = ResultCache(
+            "Compressed response",
+            max_entries=settings.http_compressed_cache_max_entries,
+            max_bytes=settings.http_compressed_cache_max_mb * 1024 * 1024,
+            ttl_s=settings.http_compressed_cache_ttl_s,
+        )
+    return ResponseEncoder(
+        get_index_generation(),
+        compression=settings.http_compression_enabled,
+        min_bytes=settings.http_compression_min_bytes,
+        gzip_level=settings.http_gzip_level,
+        brotli_quality=settings.http_brotli_quality,
+        etags=settings.http_etag_enabled,
+        compressed_cache=compressed_cache,
     )
 
+@lru_cache()
+def get_suggester() -> Optional[TenderSuggester]:
+    """Singleton /suggest index owner, or None when SUGGEST_ENABLED is false."""
+    if not settings.suggest_enabled:
+        return None
+    return TenderSuggester(get_solr_repository(), batch_size=settings.suggest_batch_size)
+
+@lru_cache()
+def get_state_store() -> Optional[SqliteTenderStateStore]:
+    """Singleton local state store, or None when STATE_STORE_PATH is not set."""
+    if not settings.state_store_path:
+        return None
+    return SqliteTenderStateStore(settings.state_store_path)
+
+@lru_cache()
+def get_checkpoint_journal() -> Optional[CheckpointJournal]:
+    """Singleton checkpoint journal, or None when CHECKPOINT_DIR is not set."""
+    if not settings.checkpoint_dir:
+        return None
+    return CheckpointJournal(settings.checkpoint_dir, max_age_hours=settings.checkpoint_max_age_hours)
+
 def get_ingestion_service():
     # Usamos el cliente real para la ingesta
     real_client = get_mercado_publico_client()
@@ -38,7 +220,18 @@ def get_active_ingestion_service():
     solr_repo = get_solr_repository()
     return TenderIngestionService(
         mp_client=real_client,
-        solr_repo=solr_repo
+        solr_repo=solr_repo,
+        fetch_concurrency=settings.ingest_fetch_concurrency,
+        pipeline_queue_size=settings.ingest_pipeline_queue_size,
+        commit_policy=settings.solr_commit_policy,
+        state_store=get_state_store(),
+        refetch_on_change=settings.ingest_refetch_on_change,
+        journal=get_checkpoint_journal(),
+        snapshot_ratio=settings.solr_snapshot_ratio,
+        index_generation=get_index_generation(),
+        document_cache=get_tender_cache(),
+        suggester=get_suggester(),
+        commit_within_ms=settings.solr_commit_within_ms
     )
 
 @lru_cache()
@@ -54,7 +247,10 @@ def get_daily_ingestion_runner() -> DailyIngestionRunner:
     # The inner service is stateless so it's fine to recreate or modify get_active_ingestion_service to be cached too.
     # For now, let's just create a new service instance for the runner, but keep the runner singleton.
     service = get_active_ingestion_service()
-    return DailyIngestionRunner(ingestion_service=service)
+    return DailyIngestionRunner(
+        ingestion_service=service,
+        consolidated=settings.daily_consolidated
+    )
 
 async def require_admin_token(x_admin_token: Optional[str] = Header(None, alias="X-ADMIN-TOKEN")):
     if x_admin_token is None:
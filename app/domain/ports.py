@@ -1,6 +1,7 @@
-from typing import List, Protocol, Dict, Any
+from typing import List, Optional, Protocol, Dict, Any, Iterable, Iterator
 from datetime import date
-from app.domain.schemas import Licitacion, LicitacionItem
+from app.domain.schemas import CommitPolicy, Licitacion, LicitacionItem
+from app.domain.state_index import TenderStateIndex
 
 class MercadoPublicoClientPort(Protocol):
     async def get_daily_list(self, target_date: date) -> List[LicitacionItem]:
@@ -12,29 +13,123 @@ class MercadoPublicoClientPort(Protocol):
         ...
 
 class SolrTenderRepositoryPort(Protocol):
-    async def upsert_many(self, docs: List[dict]) -> None:
+    """
+    Implemented by SolrTenderRepository (blocking, pysolr) and AsyncSolrTenderRepository
+    (coroutines). Call its methods through application.repository_calls.call_repository.
+    """
+
+    async def upsert_many(self, docs: List[dict], commit_policy: CommitPolicy = CommitPolicy.hard) -> None:
         """Sube multiples documentos al indice Solr.
         
         Args:
             docs: Lista de diccionarios o modelos convertidos a dict (DTOs para Solr).
+            commit_policy: Como se hace visible el batch (hard, soft, within, end).
         """
         ...
 
     def fetch_min_fields_by_ids(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
         Fetches minimal fields (id, status_code, closing_date) for a list of IDs.
-        Uses POST to avoid URL length limits.
+        Accepts any number of IDs: implementations chunk them into real-time
+        get requests with bounded concurrency.
         """
         ...
 
-    def atomic_update_many(self, partials: List[Dict[str, Any]]) -> None:
+    def atomic_update_many(self, partials: List[Dict[str, Any]], commit_policy: CommitPolicy = CommitPolicy.hard) -> None:
         """
         Sends atomic updates to Solr.
         """
         ...
 
+    def iter_min_fields(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Streams minimal fields (id, status_code, closing_date) for the whole index.
+        """
+        ...
+
+    def iter_fields(self, fl: str, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the `fl` fields of every document in the index.
+        """
+        ...
+
+    def fetch_min_fields_snapshot(self, batch_size: int = 5000) -> TenderStateIndex:
+        """
+        Loads minimal fields for the whole index into a compact TenderStateIndex.
+        """
+        ...
+
+    def count(self) -> int:
+        """
+        Number of indexed documents.
+        """
+        ...
+
+    def commit(self, soft: bool = False) -> None:
+        """
+        Issues an explicit (hard or soft) commit.
+        """
+        ...
+
     def get_by_id(self, tender_id: str) -> Dict[str, Any] | None:
         """
         Fetches a single document by its id.
         """
         ...
+
+    def real_time_get(self, ids: List[str], fl: str | None = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetches many documents by id in one call (missing ids are absent from the map).
+        """
+        ...
+
+    def search(self, query: str, page: int = 1, size: int = 20, status_codes: List[int] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Paginated search filtered by status codes. Returns {query, status_codes, total, docs,
+        next_cursor_mark}; a `cursorMark` keyword switches to cursor paging (`page` is ignored).
+        """
+        ...
+
+    def facets(
+        self, query: str, status_codes: List[int] = None, fields: Optional[List[str]] = None, limit: int = 20, **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Facet counts for the documents a search matches. Returns {query, status_codes, total,
+        facets: {name: [{"value", "count"}, ...]}}.
+        """
+        ...
+
+class TenderStateStorePort(Protocol):
+    def count(self) -> int:
+        """Number of tenders tracked locally."""
+        ...
+
+    def is_complete(self) -> bool:
+        """
+        Whether the store holds every indexed tender (rebuilt by replace_all).
+        """
+        ...
+
+    def get_many(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the stored state (status_code, closing_date, content_hash, last_seen) by id.
+        """
+        ...
+
+    def upsert_many(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Transactionally records the state of tenders already written to Solr.
+        """
+        ...
+
+    def mark_seen(self, ids: List[str]) -> None:
+        """
+        Refreshes the last-seen time of the given tenders.
+        """
+        ...
+
+    def replace_all(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Rebuilds the whole store (e.g. from a Solr scan).
+        """
+        ...
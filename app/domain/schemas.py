@@ -16,6 +16,13 @@ class LicitacionEstado(str, Enum):
     suspendida = "suspendida"
     todos = "todos"
 
+class CommitPolicy(str, Enum):
+    """How Solr writes are made visible during an ingestion run."""
+    hard = "hard"      # hard commit on every batch (opens a new searcher each time)
+    soft = "soft"      # soft commit on every batch
+    within = "within"  # commitWithin, Solr commits on its own schedule
+    end = "end"        # no commit per batch, one hard commit at the end of the run
+
 class CodigoEstado(IntEnum):
     PUBLICADA = 5
     CERRADA = 6
@@ -24,6 +31,26 @@ class CodigoEstado(IntEnum):
     REVOCADA = 15
     SUSPENDIDA = 16
 
+class SearchProfile(str, Enum):
+    """Projection profile of /search results (Solr `fl` and DTO shape)."""
+    list = "list"  # TenderListDTO: result rows
+    card = "card"  # TenderCardDTO: everything but the description
+    full = "full"  # TenderSummaryDTO
+
+class FacetField(str, Enum):
+    """Facets served by /search/facets."""
+    region = "region"
+    entity = "entity"
+    type = "type"
+    category = "category"
+    status = "status"
+
+class SuggestKind(str, Enum):
+    """Suggestion sources of /suggest."""
+    title = "title"
+    entity = "entity"
+    category = "category"
+
 
 class Comprador(BaseModel):
     codigo_organismo: str = Field(alias="CodigoOrganismo")
@@ -128,6 +155,47 @@ class TenderSummaryDTO(BaseModel):
     model_config = {"populate_by_name": True}
 
 
+class TenderCardDTO(BaseModel):
+    """DTO del perfil "card": TenderSummaryDTO sin la descripción."""
+    id: str
+    title: str
+    entity: str
+    region: str
+    comuna: str
+    type: str
+    status: str
+    publish_date: datetime = Field(alias="publishDate")
+    closing_date: Optional[datetime] = Field(default=None, alias="closingDate")
+    currency: str = "CLP"
+    amount: float = 0.0
+    monto_display: Optional[str] = Field(default=None, alias="montoDisplay")
+    complaints_level: Optional[str] = Field(default=None, alias="complaintsLevel")
+    complaints_count: int = Field(default=0, alias="complaintsCount")
+    products_count: int = Field(default=0, alias="productsCount")
+    url: str
+    score: Optional[float] = 0.0
+
+    model_config = {"populate_by_name": True}
+
+
+class TenderListDTO(BaseModel):
+    """DTO del perfil "list": lo mínimo para una fila de resultados."""
+    id: str
+    title: str
+    entity: str
+    status: str
+    closing_date: Optional[datetime] = Field(default=None, alias="closingDate")
+    monto_display: Optional[str] = Field(default=None, alias="montoDisplay")
+    score: Optional[float] = 0.0
+
+    model_config = {"populate_by_name": True}
+
+
+class TenderBatchRequest(BaseModel):
+    """Body of POST /tenders/batch."""
+    ids: List[str] = Field(min_length=1, max_length=200)
+
+
 class TenderIndexDoc(BaseModel):
     """Modelo para indexar en Solr."""
     id: str
@@ -148,6 +216,9 @@ class TenderIndexDoc(BaseModel):
     products_count: int = 0
 
     url: str
+    # Change detection (see TenderTransformer.listing_fingerprint / detail_fingerprint)
+    listing_fingerprint: Optional[str] = None
+    detail_fingerprint: Optional[str] = None
 
 
 
@@ -0,0 +1,293 @@
+import operator
+import sys
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import compress, filterfalse, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Column sentinels for "no value"
+_NO_STATUS = -(2 ** 31)
+_NO_DATE = -(2 ** 63)
+# Listing/detail fingerprints are SHA-1 hex digests, stored as 20 raw bytes
+_FP_SIZE = 20
+_NO_FP = bytes(_FP_SIZE)
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_FIELDS = ("status_code", "closing_date", "listing_fingerprint", "detail_fingerprint")
+
+
+def _first(value: Any) -> Any:
+    # Solr may return single-valued fields as lists
+    if type(value) is list:
+        return value[0] if value else None
+    return value
+
+
+@lru_cache(maxsize=65536)
+def _encode_date_str(value: str) -> Optional[int]:
+    # Closing dates repeat a lot (same day and hour), so parsing is cached
+    if len(value) != 20 or value[19] != "Z" or value[10] != "T" or value[4] != "-" or value[7] != "-":
+        return None
+    try:
+        return (datetime.fromisoformat(value[:19]) - _EPOCH) // _SECOND
+    except ValueError:
+        return None
+
+
+def _encode_date(value: Any) -> Optional[int]:
+    """Epoch seconds of a canonical 'YYYY-MM-DDTHH:MM:SSZ' string, None otherwise."""
+    return _encode_date_str(value) if type(value) is str else None
+
+
+def _decode_date(seconds: int) -> str:
+    return f"{(_EPOCH + timedelta(seconds=seconds)).isoformat()}Z"
+
+
+def _encode_fingerprint(value: Any) -> Optional[bytes]:
+    if type(value) is not str or len(value) != 2 * _FP_SIZE:
+        return None
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        return None
+
+
+class TenderStateIndex(Mapping):
+    """
+    Compact id -> listing state map (status_code, closing_date, fingerprints).
+
+    Rows live in parallel arrays: int status codes, epoch-second closing dates
+    and 20-byte SHA-1 fingerprints, with interned ids mapping to row numbers.
+    A few dozen bytes per tender instead of a dict of Python objects, which
+    matters when the whole core is held in memory for a diff. Listing
+    fingerprints, which every diff compares, are a list of 20-byte `bytes`
+    (no unpacking per diff); detail fingerprints are packed in a bytearray.
+
+    Reads return a freshly built dict with the same keys as a Solr min-fields
+    document. Titles (a parallel list) are only kept with `keep_titles`
+    (listings, whose titles feed the atomic updates) or for rows without a
+    listing fingerprint, where they are still needed for the diff. Values that
+    do not fit a column (e.g. a non-canonical date) are kept as-is on the side.
+
+    `diff` and the set operations compare two indexes column-wise, with
+    C-level passes over the id and fingerprint columns: rows are never
+    unpacked into dicts.
+    """
+
+    def __init__(self, keep_titles: bool = False):
+        self.keep_titles = keep_titles
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._status = array("i")
+        self._closing = array("q")
+        self._listing_fp: List[Optional[bytes]] = []
+        self._detail_fp = bytearray()
+        self._titles: List[Optional[str]] = []
+        # Rows whose listing fingerprint is unknown (None in `_listing_fp`)
+        self._unknown_listing = 0
+        # (row, field) -> raw value for values that do not fit their column
+        self._extra: Dict[Tuple[int, str], Any] = {}
+
+    @classmethod
+    def from_docs(cls, docs: Iterable[Dict[str, Any]], keep_titles: bool = False) -> "TenderStateIndex":
+        """
+        Builds an index from Solr min-fields documents. Like in those documents,
+        a missing field means "no value".
+        """
+        index = cls(keep_titles=keep_titles)
+        for doc in docs:
+            index.add_doc(doc)
+        return index
+
+    def add_doc(self, doc: Dict[str, Any]) -> None:
+        """Adds (or replaces) a Solr min-fields document. Documents without id are ignored."""
+        get = doc.get
+        doc_id = _first(get("id"))
+        if not doc_id:
+            return
+        self.add(
+            doc_id,
+            _first(get("status_code")),
+            _first(get("closing_date")),
+            _first(get("listing_fingerprint") or get("content_hash")),
+            _first(get("detail_fingerprint")),
+            _first(get("title")),
+        )
+
+    def add(
+        self,
+        doc_id: str,
+        status_code: Any = None,
+        closing_date: Any = None,
+        listing_fingerprint: Any = None,
+        detail_fingerprint: Any = None,
+        title: Any = None,
+    ) -> None:
+        """Adds a row, or replaces the row of an id already present."""
+        existing = self._rows.get(doc_id)
+        row = len(self._ids) if existing is None else existing
+        if existing is not None and self._extra:
+            for field in _FIELDS:
+                self._extra.pop((row, field), None)
+
+        if type(status_code) is int and _NO_STATUS < status_code < 2 ** 31:
+            status = status_code
+        else:
+            status = _NO_STATUS
+            if status_code is not None:
+                self._extra[(row, "status_code")] = status_code
+
+        seconds = _encode_date(closing_date)
+        if seconds is None:
+            seconds = _NO_DATE
+            if closing_date is not None:
+                self._extra[(row, "closing_date")] = closing_date
+
+        listing = _encode_fingerprint(listing_fingerprint)
+        if listing is None and listing_fingerprint is not None:
+            self._extra[(row, "listing_fingerprint")] = listing_fingerprint
+        detail = self._encode_fingerprint(row, "detail_fingerprint", detail_fingerprint)
+        # Without a fingerprint to short-circuit the diff the title is still compared
+        if not self.keep_titles and listing_fingerprint:
+            title = None
+
+        if existing is None:
+            doc_id = sys.intern(doc_id)
+            self._rows[doc_id] = row
+            self._ids.append(doc_id)
+            self._status.append(status)
+            self._closing.append(seconds)
+            self._listing_fp.append(listing)
+            self._unknown_listing += listing is None
+            self._detail_fp += detail
+            self._titles.append(title)
+        else:
+            offset = row * _FP_SIZE
+            self._status[row] = status
+            self._closing[row] = seconds
+            self._unknown_listing += (listing is None) - (self._listing_fp[row] is None)
+            self._listing_fp[row] = listing
+            self._detail_fp[offset:offset + _FP_SIZE] = detail
+            self._titles[row] = title
+
+    def _encode_fingerprint(self, row: int, field: str, value: Any) -> bytes:
+        raw = _encode_fingerprint(value)
+        if raw is None:
+            if value is not None:
+                self._extra[(row, field)] = value
+            return _NO_FP
+        return raw
+
+    def _detail_fingerprint(self, row: int) -> Optional[str]:
+        offset = row * _FP_SIZE
+        raw = self._detail_fp[offset:offset + _FP_SIZE]
+        if raw == _NO_FP:
+            return self._extra.get((row, "detail_fingerprint"))
+        return raw.hex()
+
+    def _listing_fingerprint(self, row: int) -> Optional[str]:
+        raw = self._listing_fp[row]
+        if raw is None:
+            return self._extra.get((row, "listing_fingerprint"))
+        return raw.hex()
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, doc_id: str) -> Dict[str, Any]:
+        row = self._rows[doc_id]
+        status = self._status[row]
+        closing = self._closing[row]
+        doc = {
+            "id": self._ids[row],
+            "status_code": self._extra.get((row, "status_code")) if status == _NO_STATUS else status,
+            "closing_date": self._extra.get((row, "closing_date")) if closing == _NO_DATE else _decode_date(closing),
+            "listing_fingerprint": self._listing_fingerprint(row),
+            "detail_fingerprint": self._detail_fingerprint(row),
+        }
+        if self.keep_titles or not doc["listing_fingerprint"]:
+            doc["title"] = self._titles[row]
+        return doc
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __setitem__(self, doc_id: str, fields: Dict[str, Any]) -> None:
+        self.add_doc({**fields, "id": doc_id})
+
+    def status_code(self, doc_id: str) -> Any:
+        """Status code of a row without building its dict."""
+        row = self._rows[doc_id]
+        status = self._status[row]
+        return self._extra.get((row, "status_code")) if status == _NO_STATUS else status
+
+    def subset(self, ids: Iterable[str]) -> "TenderStateIndex":
+        """New index with the rows of `ids` that are present (rows are copied column by column)."""
+        index = TenderStateIndex(keep_titles=self.keep_titles)
+        for doc_id in ids:
+            row = self._rows.get(doc_id)
+            if row is None or doc_id in index._rows:
+                continue
+            new_row = len(index._ids)
+            index._rows[doc_id] = new_row
+            index._ids.append(self._ids[row])
+            index._status.append(self._status[row])
+            index._closing.append(self._closing[row])
+            offset = row * _FP_SIZE
+            index._listing_fp.append(self._listing_fp[row])
+            index._unknown_listing += self._listing_fp[row] is None
+            index._detail_fp += self._detail_fp[offset:offset + _FP_SIZE]
+            index._titles.append(self._titles[row])
+            if self._extra:
+                for field in _FIELDS:
+                    if (row, field) in self._extra:
+                        index._extra[(new_row, field)] = self._extra[(row, field)]
+        return index
+
+    # --- Diff against the current (indexed) state ---
+
+    def diff(self, current: "TenderStateIndex") -> Tuple[List[str], List[str], List[str]]:
+        """
+        Compares this index (e.g. a listing) with `current` (the indexed state).
+
+        Returns:
+            (new, changed, unchanged) ids, in row order. Unchanged ids have both
+            listing fingerprints known and equal; changed ids are the other
+            shared ids (fingerprint differs or cannot be compared).
+        """
+        positions = list(map(current._rows.get, self._ids))
+        present = list(map(operator.is_not, positions, repeat(None)))
+        new = list(compress(self._ids, map(operator.not_, present)))
+        shared = list(compress(self._ids, present))
+        if not shared:
+            return new, [], []
+
+        mine = list(compress(self._listing_fp, present))
+        same = list(map(operator.eq, mine, map(current._listing_fp.__getitem__, compress(positions, present))))
+        if self._unknown_listing:
+            # Two unknown fingerprints are not a match
+            same = list(map(operator.and_, same, map(operator.is_not, mine, repeat(None))))
+        return new, list(compress(shared, map(operator.not_, same))), list(compress(shared, same))
+
+    def new_ids(self, current: "TenderStateIndex") -> List[str]:
+        """Ids in this index that `current` does not have, in row order."""
+        return list(filterfalse(current._rows.__contains__, self._ids))
+
+    def missing_ids(self, current: "TenderStateIndex") -> List[str]:
+        """Ids in `current` that this index does not have, in `current` row order."""
+        return current.new_ids(self)
+
+    def changed_ids(self, current: "TenderStateIndex") -> List[str]:
+        """Shared ids whose listing fingerprint differs (or cannot be compared)."""
+        return self.diff(current)[1]
+
+    def unchanged_ids(self, current: "TenderStateIndex") -> List[str]:
+        """Shared ids whose listing fingerprints are both known and equal."""
+        return self.diff(current)[2]
@@ -0,0 +1,275 @@
+import heapq
+import re
+import unicodedata
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Suggestion sources: Solr field of each kind
+SUGGEST_FIELDS = {"title": "title", "entity": "entity", "category": "category"}
+
+# Spanish stop words (as dropped by the text_es analyzer): no suggestion starts at them
+_STOP_WORDS = frozenset(
+    "a al con de del el en la las lo los o para por que se sin su sus u un una y".split()
+)
+# Separates entries in the corpus; sorts before every folded character
+_SEP = "\x00"
+_NON_WORD = re.compile(r"[\W_]+")
+# Combining diacritical marks left by NFKD (accents, tilde, diaeresis...), deleted by translate()
+_COMBINING_MARKS = dict.fromkeys(range(0x300, 0x370))
+
+
+def fold_text(text: str) -> str:
+    """
+    Case- and accent-folded form used for matching (like the lowercase and
+    ASCII folding of text_es): "Adquisición, ÑUÑOA" -> "adquisicion nunoa".
+    Anything that is not a letter or digit separates words.
+    """
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    if not folded.isascii():
+        folded = folded.translate(_COMBINING_MARKS)
+    return _NON_WORD.sub(" ", folded).strip()
+
+
+def _first(value: Any) -> Any:
+    # Solr may return single-valued fields as lists
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+class PrefixIndex:
+    """
+    Immutable prefix index over the texts of one suggestion kind.
+
+    All folded texts are concatenated into a single string; every word start
+    (skipping stop words) is a key, kept as an int offset into it and sorted by
+    the text that follows, so a prefix query is two binary searches over an
+    array. Prefixes matching more than `max_scan` keys get their best entries
+    precomputed at build time, which keeps every answer well under a
+    millisecond without holding one string per key.
+    """
+
+    def __init__(
+        self,
+        counts: Dict[str, int],
+        top_k: int = 20,
+        max_scan: int = 512,
+        max_key_len: int = 32,
+        max_words: int = 12,
+    ):
+        self.top_k = top_k
+        self.max_scan = max_scan
+        self.max_key_len = max_key_len
+        # Entries ordered by rank: more tenders first, then shorter, then alphabetical
+        self._texts: List[str] = sorted(counts, key=lambda text: (-counts[text], len(text), text))
+        self._counts = array("i", (counts[text] for text in self._texts))
+
+        parts = []
+        offsets = array("i")
+        entries = array("i")
+        position = 0
+        for entry, text in enumerate(self._texts):
+            folded = fold_text(text)
+            if not folded:
+                continue
+            word_start = 0
+            for number, word in enumerate(folded.split(" ")):
+                if number >= max_words:
+                    break
+                if word not in _STOP_WORDS or number == 0:
+                    offsets.append(position + word_start)
+                    entries.append(entry)
+                word_start += len(word) + 1
+            parts.append(folded)
+            position += len(folded) + 1
+        self._corpus = _SEP.join(parts) + _SEP
+
+        corpus, key_len = self._corpus, max_key_len
+        order = sorted(range(len(offsets)), key=lambda i: corpus[offsets[i]:offsets[i] + key_len])
+        self._offsets = array("i", (offsets[i] for i in order))
+        self._entries = array("i", (entries[i] for i in order))
+        del offsets, entries, order
+
+        # prefix -> best entries, for prefixes too common to scan per query
+        self._tops: Dict[str, Tuple[int, ...]] = {}
+        self._precompute_tops()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @property
+    def key_count(self) -> int:
+        return len(self._offsets)
+
+    def _bisect(self, prefix: str, lo: int, hi: int, upper: bool) -> int:
+        # First key whose leading len(prefix) chars are >= prefix (> prefix with `upper`)
+        corpus, offsets, size = self._corpus, self._offsets, len(prefix)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            head = corpus[offsets[mid]:offsets[mid] + size]
+            if head < prefix or (upper and head == prefix):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _range(self, prefix: str, lo: int = 0, hi: Optional[int] = None) -> Tuple[int, int]:
+        hi = len(self._offsets) if hi is None else hi
+        start = self._bisect(prefix, lo, hi, upper=False)
+        return start, self._bisect(prefix, start, hi, upper=True)
+
+    def _best(self, start: int, end: int, limit: int, prefix: Optional[str] = None) -> List[int]:
+        entries = self._entries
+        if prefix is None:
+            candidates = set(entries[start:end])
+        else:
+            # Prefix longer than the sorted key: check the full text of each candidate
+            corpus, offsets, size = self._corpus, self._offsets, len(prefix)
+            candidates = {
+                entries[i] for i in range(start, end) if corpus[offsets[i]:offsets[i] + size] == prefix
+            }
+        # Entry numbers are ranks, so the best entries are the smallest ones
+        return heapq.nsmallest(limit, candidates)
+
+    def _precompute_tops(self) -> None:
+        runs = [(0, len(self._offsets))]
+        length = 0
+        while runs and length < self.max_key_len:
+            length += 1
+            heavy = []
+            for lo, hi in runs:
+                i = lo
+                while i < hi:
+                    offset = self._offsets[i]
+                    prefix = self._corpus[offset:offset + length]
+                    if len(prefix) < length or _SEP in prefix:
+                        # Key shorter than `length`: it only belongs to shorter prefixes
+                        i += 1
+                        continue
+                    _, end = self._range(prefix, i, hi)
+                    if end - i > self.max_scan:
+                        if prefix[-1] != " ":
+                            # Folded queries never end in a space
+                            self._tops[prefix] = tuple(self._best(i, end, self.top_k))
+                        heavy.append((i, end))
+                    i = end
+            runs = heavy
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Best (text, count) pairs whose folded form has a word starting with `prefix`."""
+        query = fold_text(prefix)
+        if not query or limit <= 0:
+            return []
+        key = query[:self.max_key_len]
+        if limit <= self.top_k and key == query and query in self._tops:
+            best = self._tops[query][:limit]
+        else:
+            start, end = self._range(key)
+            # Only reached past the precomputed depth: rank the first `max_scan` keys
+            end = min(end, start + self.max_scan) if end - start > self.max_scan and key != query else end
+            best = self._best(start, end, limit, query if key != query else None)
+        return [(self._texts[entry], self._counts[entry]) for entry in best]
+
+
+class SuggestIndex:
+    """
+    Autocomplete over tender titles, entity names and categories.
+
+    Keeps, per tender, the texts it contributes and, per kind, how many tenders
+    share each text; `apply` updates both from indexed documents (or atomic
+    updates) and `rebuild` swaps in fresh PrefixIndex objects built from them,
+    so refreshes after an ingestion run never rescan the core.
+    """
+
+    def __init__(self, **index_options: Any):
+        self.index_options = index_options
+        # tender id -> (title, entity, category)
+        self._tenders: Dict[str, Tuple[Optional[str], ...]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {kind: {} for kind in SUGGEST_FIELDS}
+        self._interned: Dict[str, str] = {}
+        self._indexes: Dict[str, PrefixIndex] = {}
+        self.pending_changes = 0
+
+    def _intern(self, value: Any) -> Optional[str]:
+        value = _first(value)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        value = " ".join(value.split())
+        return self._interned.setdefault(value, value)
+
+    def _count(self, kind: str, text: Optional[str], delta: int) -> None:
+        if text is None:
+            return
+        counts = self._counts[kind]
+        count = counts.get(text, 0) + delta
+        if count > 0:
+            counts[text] = count
+        else:
+            counts.pop(text, None)
+
+    def apply(self, docs: Iterable[Dict[str, Any]]) -> int:
+        """
+        Records indexed documents: full documents, or atomic updates
+        ({"id": ..., "title": {"set": ...}}) of which only `set` values count.
+        Changes are visible after the next `rebuild`. Returns the tenders changed.
+        """
+        changed = 0
+        kinds = list(SUGGEST_FIELDS)
+        for doc in docs:
+            doc_id = _first(doc.get("id"))
+            if not doc_id:
+                continue
+            previous = self._tenders.get(doc_id, (None,) * len(kinds))
+            current = list(previous)
+            for position, kind in enumerate(kinds):
+                field = SUGGEST_FIELDS[kind]
+                if field not in doc:
+                    continue
+                value = doc[field]
+                if isinstance(value, dict):
+                    if "set" not in value:
+                        continue
+                    value = value["set"]
+                current[position] = self._intern(value)
+            current = tuple(current)
+            if current == previous and doc_id in self._tenders:
+                continue
+            for position, kind in enumerate(kinds):
+                if current[position] != previous[position]:
+                    self._count(kind, previous[position], -1)
+                    self._count(kind, current[position], 1)
+            self._tenders[doc_id] = current
+            changed += 1
+        self.pending_changes += changed
+        return changed
+
+    def rebuild(self) -> None:
+        """Builds the prefix indexes from the current counts (CPU bound, call it off the event loop)."""
+        self.pending_changes = 0
+        indexes = {kind: PrefixIndex(dict(counts), **self.index_options) for kind, counts in self._counts.items()}
+        # Texts no tender uses anymore are forgotten
+        used = {text for counts in self._counts.values() for text in counts}
+        self._interned = {text: text for text in used}
+        self._indexes = indexes
+
+    def suggest(self, prefix: str, kinds: Optional[Iterable[str]] = None, limit: int = 10) -> Dict[str, List[Tuple[str, int]]]:
+        """Best (text, tenders) pairs per kind for a prefix."""
+        indexes = self._indexes
+        return {
+            kind: indexes[kind].suggest(prefix, limit) if kind in indexes else []
+            for kind in (kinds or SUGGEST_FIELDS)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        indexes = self._indexes
+        return {
+            "tenders": len(self._tenders),
+            "pending_changes": self.pending_changes,
+            "kinds": {
+                kind: {
+                    "texts": len(indexes[kind]) if kind in indexes else 0,
+                    "keys": indexes[kind].key_count if kind in indexes else 0,
+                }
+                for kind in SUGGEST_FIELDS
+            },
+        }
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointJournal:
+    """
+    Append-only checkpoint journal for ingestion runs (one JSONL file per run).
+
+    Records:
+        {"type": "plan", "run_id", "scope", "created_at", "new_ids", "updates"}
+        {"type": "batch", "kind": "new" | "update", "ids", "at"}
+        {"type": "finish", "status", "at"}
+
+    A run without a `finish` record is resumable: its remaining work is the
+    planned set minus the IDs of every batch already written to Solr.
+    All methods are synchronous; call them through run_in_threadpool.
+    """
+
+    def __init__(self, directory: str, max_age_hours: float = 24.0):
+        self.directory = directory
+        self.max_age_s = max_age_hours * 3600
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, run_id: str) -> str:
+        return os.path.join(self.directory, f"{run_id}.jsonl")
+
+    def _append(self, run_id: str, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with open(self._path(run_id), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def start(self, scope: str, new_ids: List[str], updates: List[Dict[str, Any]]) -> str:
+        """Records the planned work of a new run and returns its run id."""
+        self.prune()
+        run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._append(run_id, {
+            "type": "plan",
+            "run_id": run_id,
+            "scope": scope,
+            "created_at": time.time(),
+            "new_ids": new_ids,
+            "updates": updates,
+        })
+        logger.info(f"Checkpoint journal started run {run_id} ({scope}): {len(new_ids)} new, {len(updates)} updates")
+        return run_id
+
+    def record_batch(self, run_id: str, kind: str, ids: List[str]) -> None:
+        """Records a batch already accepted by Solr."""
+        self._append(run_id, {"type": "batch", "kind": kind, "ids": ids, "at": time.time()})
+
+    def finish(self, run_id: str, status: str) -> None:
+        self._append(run_id, {"type": "finish", "status": status, "at": time.time()})
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Replays a journal file. Returns the plan, the committed IDs per kind
+        and whether the run finished. A torn last line (crash mid-write) is ignored.
+        """
+        path = self._path(run_id)
+        if not os.path.exists(path):
+            return None
+
+        state: Optional[Dict[str, Any]] = None
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring corrupt line in checkpoint journal {run_id}")
+                    continue
+
+                if record["type"] == "plan":
+                    state = {**record, "committed": {"new": set(), "update": set()}, "finished": None}
+                elif state is None:
+                    continue
+                elif record["type"] == "batch":
+                    state["committed"][record["kind"]].update(record["ids"])
+                elif record["type"] == "finish":
+                    state["finished"] = record["status"]
+        return state
+
+    def _run_ids(self) -> List[str]:
+        return sorted(
+            (name[:-len(".jsonl")] for name in os.listdir(self.directory) if name.endswith(".jsonl")),
+            reverse=True,
+        )
+
+    def _is_expired(self, state: Dict[str, Any]) -> bool:
+        return time.time() - state.get("created_at", 0) > self.max_age_s
+
+    def find_resumable(self, scope: str) -> Optional[Dict[str, Any]]:
+        """Most recent unfinished, non-expired run for `scope`."""
+        for run_id in self._run_ids():
+            state = self.load(run_id)
+            if state and state["scope"] == scope and state["finished"] is None and not self._is_expired(state):
+                return state
+        return None
+
+    @staticmethod
+    def remaining(state: Dict[str, Any]) -> Dict[str, Any]:
+        """Planned work not yet written to Solr."""
+        committed = state["committed"]
+        return {
+            "new_ids": [i for i in state["new_ids"] if i not in committed["new"]],
+            "updates": [u for u in state["updates"] if u["id"] not in committed["update"]],
+        }
+
+    def list_resumable(self) -> List[Dict[str, Any]]:
+        """Summary of every unfinished, non-expired run."""
+        runs = []
+        for run_id in self._run_ids():
+            state = self.load(run_id)
+            if not state or state["finished"] is not None or self._is_expired(state):
+                continue
+            remaining = self.remaining(state)
+            runs.append({
+                "run_id": run_id,
+                "scope": state["scope"],
+                "created_at": state["created_at"],
+                "planned_new": len(state["new_ids"]),
+                "planned_updates": len(state["updates"]),
+                "remaining_new": len(remaining["new_ids"]),
+                "remaining_updates": len(remaining["updates"]),
+            })
+        return runs
+
+    def prune(self) -> None:
+        """Deletes journals not written to within the max age (no longer resumable)."""
+        now = time.time()
+        for run_id in self._run_ids():
+            path = self._path(run_id)
+            try:
+                if now - os.path.getmtime(path) > self.max_age_s:
+                    os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not prune checkpoint journal {run_id}: {e}")
@@ -0,0 +1,131 @@
+import importlib.util
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps the pool transport to count requests, responses and transport
+    errors. A request is in flight until its response headers arrive or it
+    fails; event hooks cannot track that, since no hook runs on errors.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: Dict[str, Any]):
+        self.transport = transport
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats["requests"] += 1
+        self._stats["in_flight"] += 1
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        finally:
+            self._stats["in_flight"] -= 1
+        self._stats["responses"] += 1
+        versions = self._stats["http_versions"]
+        versions[response.http_version] = versions.get(response.http_version, 0) + 1
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class SharedHttpClient:
+    """
+    Application-lifetime pooled `httpx.AsyncClient` for one upstream service
+    (Mercado Público, Solr).
+
+    One client (and one connection pool) is shared by every caller of that
+    service, so keep-alive connections and TLS sessions are reused across
+    requests. The client is created on first use and closed by the FastAPI
+    lifespan (or explicitly by standalone scripts).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        # HTTP/2 needs the optional `h2` package (httpx[http2])
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.warning(f"HTTP/2 requested for {name} but the 'h2' package is not installed, using HTTP/1.1")
+
+        # Replaces the pooled transport (e.g. a mock transport in checks)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._stats: Dict[str, Any] = {
+            "clients_created": 0,
+            "requests": 0,
+            "responses": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "http_versions": {},
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            transport = self._transport or httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=_CountingTransport(transport, self._stats),
+            )
+            self._stats["clients_created"] += 1
+            logger.info(
+                f"{self.name} HTTP pool created (max_connections={self.limits.max_connections}, "
+                f"keepalive={self.limits.max_keepalive_connections}, http2={self.http2})"
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info(f"{self.name} HTTP pool closed")
+        self._client = None
+
+    def _connections(self) -> Dict[str, int]:
+        # httpcore exposes the pool's connections; the `_pool` attribute is internal to httpx
+        transport = getattr(getattr(self._client, "_transport", None), "transport", None)
+        pool = getattr(transport, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return {}
+        return {
+            "open": len(connections),
+            "idle": sum(1 for c in connections if c.is_idle()),
+            "available": sum(1 for c in connections if c.is_available()),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Pool limits, request counters and current connections."""
+        active = self._client is not None and not self._client.is_closed
+        return {
+            "name": self.name,
+            "active": active,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry_s": self.limits.keepalive_expiry,
+            **self._stats,
+            "connections": self._connections() if active else {},
+        }
@@ -1,25 +1,61 @@
+import asyncio
+import json
 import logging
+from contextlib import aclosing, nullcontext
 from datetime import date
-from typing import Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional, Set
 
 import httpx
-from pydantic import ValidationError
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from app.domain.schemas import LicitacionListResponse, LicitacionDetailResponse
+from app.domain.schemas import LicitacionListResponse, LicitacionDetailResponse, LicitacionItem
+from app.infrastructure.mercadopublico.detail_cache import DetailCache
+from app.infrastructure.mercadopublico.list_stream import ListadoStreamParser, TruncatedListError
+from app.infrastructure.mercadopublico.rate_limiter import AdaptiveRateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Built once and reused: validate_json parses and validates raw bytes in a single pass
+_LIST_ADAPTER = TypeAdapter(LicitacionListResponse)
+_DETAIL_ADAPTER = TypeAdapter(LicitacionDetailResponse)
+_ITEM_ADAPTER = TypeAdapter(LicitacionItem)
+
+# Failures of a streamed listing worth another attempt: network/HTTP errors,
+# including ones raised mid-body, and bodies cut before the list was closed
+_STREAM_RETRY_ERRORS = (httpx.RequestError, httpx.HTTPStatusError, TruncatedListError)
+
 
 class MercadoPublicoClient:
-    def __init__(self, ticket: str, base_url: str, timeout: float = 30.0):
+    # Same policy as `_get_bytes`: 5 attempts, exponential wait clamped to [4, 10] s
+    STREAM_ATTEMPTS = 5
+    STREAM_WAIT_MIN_S = 4.0
+    STREAM_WAIT_MAX_S = 10.0
+
+    def __init__(
+        self,
+        ticket: str,
+        base_url: str,
+        timeout: float = 30.0,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        detail_cache: Optional[DetailCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         self.ticket = ticket
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        # A shared (pooled) client is owned by the application and never closed here
+        self._owns_client = http_client is None
+        self.client = http_client if http_client is not None else httpx.AsyncClient(timeout=timeout)
+        # Shared limiter across client instances; None disables client-side throttling
+        self.rate_limiter = rate_limiter
+        # Shared on-disk cache of detail payloads; None disables caching
+        self.detail_cache = detail_cache
 
     async def close(self):
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
 
     @retry(
         stop=stop_after_attempt(5),
@@ -27,15 +63,20 @@ class MercadoPublicoClient:
         retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
         reraise=True
     )
-    async def _get(self, endpoint: str, params: dict) -> dict:
+    async def _get_bytes(self, endpoint: str, params: dict) -> bytes:
+        """Returns the raw response body, so callers can validate it in a single pass."""
         params["ticket"] = self.ticket
         url = f"{self.base_url}/{endpoint}"
         
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data
+            if self.rate_limiter is not None:
+                async with self.rate_limiter.slot():
+                    response = await self.client.get(url, params=params)
+                    response.raise_for_status()
+            else:
+                response = await self.client.get(url, params=params)
+                response.raise_for_status()
+            return response.content
         except httpx.HTTPStatusError as e:
             error_data = None
             try:
@@ -52,40 +93,104 @@ class MercadoPublicoClient:
             logger.error(f"An unexpected error occurred: {e}")
             raise
 
+    async def _get(self, endpoint: str, params: dict) -> dict:
+        return json.loads(await self._get_bytes(endpoint, params))
+
+    async def _cached_detail(self, code: str, refresh: bool) -> Optional[bytes]:
+        if self.detail_cache is None or refresh:
+            return None
+        return await run_in_threadpool(self.detail_cache.get_bytes, code)
+
+    async def _cache_detail(self, code: str, raw: bytes, status_code: Optional[int]) -> None:
+        if self.detail_cache is None:
+            return
+        try:
+            await run_in_threadpool(self.detail_cache.put_bytes, code, raw, status_code)
+        except Exception as e:
+            logger.warning(f"Could not cache detail for {code}: {e}")
+
+    async def _send_stream(self, url: str, params: dict) -> httpx.Response:
+        response = await self.client.send(self.client.build_request("GET", url, params=params), stream=True)
+        if response.is_error:
+            # Read the (small) error body so it can be logged, then release the connection
+            await response.aread()
+            await response.aclose()
+        response.raise_for_status()
+        return response
+
+    async def _stream_listing(self, endpoint: str, params: dict) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        One attempt at a streamed list response: yields the raw `Listado` items
+        as they are read. Opening the response and reading the whole body share
+        one rate limiter slot, so mid-body failures are reported to it as well.
+        """
+        params["ticket"] = self.ticket
+        url = f"{self.base_url}/{endpoint}"
+
+        async with self.rate_limiter.slot() if self.rate_limiter is not None else nullcontext():
+            try:
+                response = await self._send_stream(url, params)
+            except httpx.HTTPStatusError as e:
+                logger.error(f"HTTP error occurred: {e.response.status_code} - {e.response.text}")
+                raise
+            try:
+                parser = ListadoStreamParser()
+                async for text in response.aiter_text():
+                    for raw_item in parser.feed(text):
+                        yield raw_item
+                parser.close()
+            finally:
+                await response.aclose()
+
     async def get_by_date(self, date_str: str) -> LicitacionListResponse:
         """
         Get licitaciones by date.
         Date format: ddmmaaaa (e.g., 02022026)
         """
         params = {"fecha": date_str}
-        data = await self._get("licitaciones.json", params)
+        data = await self._get_bytes("licitaciones.json", params)
         
         try:
-            return LicitacionListResponse(**data)
+            return _LIST_ADAPTER.validate_json(data)
         except ValidationError as e:
             logger.error(f"Validation error for date {date_str}: {e}")
             raise
 
-    async def get_by_code(self, code: str) -> LicitacionDetailResponse:
+    async def get_by_code(self, code: str, refresh: bool = False) -> LicitacionDetailResponse:
         """
         Get licitacion details by code.
+        Served from the detail cache when enabled, unless `refresh` is set.
         """
-        params = {"codigo": code}
-        data = await self._get("licitaciones.json", params)
+        cached = await self._cached_detail(code, refresh)
+        data = cached if cached is not None else await self._get_bytes("licitaciones.json", {"codigo": code})
         
         try:
-            return LicitacionDetailResponse(**data)
+            response = _DETAIL_ADAPTER.validate_json(data)
         except ValidationError as e:
             logger.error(f"Validation error for code {code}: {e}")
             raise
 
-    async def get_raw_by_code(self, code: str) -> dict:
+        if cached is None and response.listado:
+            await self._cache_detail(code, data, response.listado[0].codigo_estado)
+        return response
+
+    async def get_raw_by_code(self, code: str, refresh: bool = False) -> dict:
         """
         Get raw json licitacion details by code (no Pydantic validation).
         Useful for debugging full API response structure.
+
+        Args:
+            code: Tender code (CodigoExterno).
+            refresh: Skip the detail cache lookup and fetch from the API;
+                the fresh payload still replaces the cached one.
         """
-        params = {"codigo": code}
-        return await self._get("licitaciones.json", params)
+        cached = await self._cached_detail(code, refresh)
+        raw = cached if cached is not None else await self._get_bytes("licitaciones.json", {"codigo": code})
+        data = json.loads(raw)
+
+        if cached is None and data.get("Listado"):
+            await self._cache_detail(code, raw, DetailCache.payload_status_code(data))
+        return data
 
     async def get_by_status(self, status: str) -> LicitacionListResponse:
         """
@@ -93,10 +198,46 @@ class MercadoPublicoClient:
         Possible statuses: activas, publicada, cerrada, desierta, adjudicada, revocada, suspendida, todos.
         """
         params = {"estado": status}
-        data = await self._get("licitaciones.json", params)
+        data = await self._get_bytes("licitaciones.json", params)
         
         try:
-            return LicitacionListResponse(**data)
+            return _LIST_ADAPTER.validate_json(data)
         except ValidationError as e:
             logger.error(f"Validation error for status {status}: {e}")
             raise
+
+    async def iter_by_status(self, status: str) -> AsyncIterator[LicitacionItem]:
+        """
+        Streams licitaciones by status, yielding each validated item as soon as
+        it has been read from the response body. Memory stays flat regardless
+        of the size of the list (e.g. activas/todos).
+
+        A failure while opening or reading the body (including a truncated
+        body) retries the whole request; a retry skips the codes already
+        yielded by earlier attempts.
+        """
+        yielded: Set[str] = set()
+        for attempt in range(1, self.STREAM_ATTEMPTS + 1):
+            try:
+                async with aclosing(self._stream_listing("licitaciones.json", {"estado": status})) as raw_items:
+                    async for raw_item in raw_items:
+                        try:
+                            item = _ITEM_ADAPTER.validate_python(raw_item)
+                        except ValidationError as e:
+                            logger.error(f"Validation error for status {status}: {e}")
+                            raise
+                        if attempt > 1 and item.codigo_externo in yielded:
+                            continue
+                        yielded.add(item.codigo_externo)
+                        yield item
+                return
+            except _STREAM_RETRY_ERRORS as e:
+                if attempt == self.STREAM_ATTEMPTS:
+                    logger.error(f"Listing for status {status} failed after {attempt} attempts: {e}")
+                    raise
+                wait_s = min(self.STREAM_WAIT_MAX_S, max(self.STREAM_WAIT_MIN_S, 2.0 ** (attempt - 1)))
+                logger.warning(
+                    f"Listing for status {status} failed after {len(yielded)} items "
+                    f"(attempt {attempt}/{self.STREAM_ATTEMPTS}): {e!r}; retrying in {wait_s:.0f}s"
+                )
+                await asyncio.sleep(wait_s)
@@ -0,0 +1,274 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app.domain.schemas import CodigoEstado
+
+logger = logging.getLogger(__name__)
+
+# Tenders in these states are not expected to change anymore
+FINAL_STATES = {CodigoEstado.DESIERTA, CodigoEstado.ADJUDICADA, CodigoEstado.REVOCADA}
+# Closed/suspended tenders change rarely (award, reopening)
+SLOW_STATES = {CodigoEstado.CERRADA, CodigoEstado.SUSPENDIDA}
+
+
+class DetailCache:
+    """
+    On-disk cache of raw Mercado Público detail payloads (`licitaciones.json?codigo=`).
+
+    Payloads are stored gzip-compressed and content-addressed
+    (`blobs/<sha256>.json.gz`), so identical payloads share one file. A SQLite
+    index maps each code to its blob, the tender state and access times.
+
+    Entries expire after a TTL that depends on the tender state, and the least
+    recently used entries are evicted once the blobs exceed `max_bytes`.
+    All methods are synchronous; call them through run_in_threadpool.
+
+    Writes hold the SQLite write lock (BEGIN IMMEDIATE) from the blob write
+    to the commit of its index row, so another thread or process never drops
+    a blob that is about to be referenced. Blobs left without a row (e.g. by
+    a crash before the commit) are swept at startup and on eviction.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_open_s: float = 3600,
+        ttl_closed_s: float = 6 * 3600,
+        ttl_final_s: float = 7 * 24 * 3600,
+    ):
+        self.directory = directory
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.index_path = os.path.join(directory, "index.db")
+        self.max_bytes = max_bytes
+        self.ttl_open_s = ttl_open_s
+        self.ttl_closed_s = ttl_closed_s
+        self.ttl_final_s = ttl_final_s
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS detail_cache (
+                    code TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    status_code INTEGER,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_detail_cache_access ON detail_cache (last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_detail_cache_hash ON detail_cache (content_hash)")
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._sweep_orphan_blobs(conn)
+        logger.info(f"Detail cache initialized at {self.directory}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.index_path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.blob_dir, f"{content_hash}.json.gz")
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    @staticmethod
+    def payload_status_code(payload: Dict[str, Any]) -> Optional[int]:
+        try:
+            return int(payload["Listado"][0]["CodigoEstado"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+
+    def ttl_for(self, status_code: Optional[int]) -> float:
+        """TTL in seconds for a tender in the given state."""
+        if status_code in FINAL_STATES:
+            return self.ttl_final_s
+        if status_code in SLOW_STATES:
+            return self.ttl_closed_s
+        return self.ttl_open_s
+
+    def get(self, code: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached payload for `code` as a dict, or None on miss/expiry."""
+        raw = self.get_bytes(code)
+        return json.loads(raw) if raw is not None else None
+
+    def put(self, code: str, payload: Dict[str, Any]) -> None:
+        """Stores a decoded payload for `code`. Empty responses are not cached."""
+        if not payload.get("Listado"):
+            return
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.put_bytes(code, raw, self.payload_status_code(payload))
+
+    def get_bytes(self, code: str) -> Optional[bytes]:
+        """Returns the cached response body for `code`, or None on miss/expiry."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT content_hash, expires_at FROM detail_cache WHERE code = ?", (code,)
+                ).fetchone()
+                if row is None:
+                    self._count("misses")
+                    return None
+
+                content_hash, expires_at = row
+                if expires_at <= now:
+                    self._count("expired")
+                    self._count("misses")
+                    return None
+
+                with gzip.open(self._blob_path(content_hash), "rb") as f:
+                    payload = f.read()
+                conn.execute("UPDATE detail_cache SET last_access = ? WHERE code = ?", (now, code))
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.warning(f"Detail cache read failed for {code}: {e}")
+            self._count("errors")
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return payload
+
+    def put_bytes(self, code: str, raw: bytes, status_code: Optional[int]) -> None:
+        """
+        Stores a raw response body for `code`. The caller decides whether the
+        response is worth caching (empty responses should not be).
+        """
+        content_hash = hashlib.sha256(raw).hexdigest()
+        with self._connect() as conn:
+            # Blob and index row in one critical section, committed together
+            conn.execute("BEGIN IMMEDIATE")
+            size = self._write_blob(content_hash, raw)
+            now = time.time()
+            previous = conn.execute("SELECT content_hash FROM detail_cache WHERE code = ?", (code,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO detail_cache "
+                "(code, content_hash, status_code, size, fetched_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (code, content_hash, status_code, size, now, now + self.ttl_for(status_code), now),
+            )
+            if previous and previous[0] != content_hash:
+                self._drop_orphan_blob(conn, previous[0])
+            self._evict(conn)
+        self._count("writes")
+
+    def _write_blob(self, content_hash: str, raw: bytes) -> int:
+        """Writes the blob unless present and returns its size on disk."""
+        path = self._blob_path(content_hash)
+        if not os.path.exists(path):
+            # Write-then-rename so readers never see a partial blob
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(raw, compresslevel=6))
+            os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def invalidate(self, code: str) -> None:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT content_hash FROM detail_cache WHERE code = ?", (code,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM detail_cache WHERE code = ?", (code,))
+                self._drop_orphan_blob(conn, row[0])
+
+    def _drop_orphan_blob(self, conn: sqlite3.Connection, content_hash: str) -> bool:
+        """Removes a blob no entry references anymore. Returns True if it was dropped."""
+        still_used = conn.execute(
+            "SELECT 1 FROM detail_cache WHERE content_hash = ? LIMIT 1", (content_hash,)
+        ).fetchone()
+        if still_used:
+            return False
+        try:
+            os.remove(self._blob_path(content_hash))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _sweep_orphan_blobs(self, conn: sqlite3.Connection) -> int:
+        """
+        Removes blob files no entry references, and temporary files of
+        interrupted writes. Must run under the write lock. Returns the bytes freed.
+        """
+        referenced = {row[0] for row in conn.execute("SELECT DISTINCT content_hash FROM detail_cache")}
+        freed = 0
+        for entry in os.scandir(self.blob_dir):
+            if entry.name.endswith(".json.gz") and entry.name[: -len(".json.gz")] in referenced:
+                continue
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            freed += size
+        if freed:
+            logger.info(f"Detail cache removed {freed} bytes of unreferenced blobs")
+        return freed
+
+    def _total_bytes(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT content_hash, size FROM detail_cache)"
+        ).fetchone()
+        return row[0]
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Drops least recently used entries until the blobs fit in 90% of
+        `max_bytes`, after removing blobs no entry references.
+        """
+        total = self._total_bytes(conn)
+        if total <= self.max_bytes:
+            return
+
+        self._sweep_orphan_blobs(conn)
+
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        rows = conn.execute(
+            "SELECT code, content_hash, size FROM detail_cache ORDER BY last_access"
+        ).fetchall()
+        for code, content_hash, size in rows:
+            if total <= target:
+                break
+            conn.execute("DELETE FROM detail_cache WHERE code = ?", (code,))
+            if self._drop_orphan_blob(conn, content_hash):
+                total -= size
+            evicted += 1
+        self._count("evictions", evicted)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns hit/miss counters plus the current entry count and size."""
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM detail_cache").fetchone()[0]
+            total = self._total_bytes(conn)
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "hit_ratio": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,73 @@
+import json
+import re
+from typing import Any, Dict, List
+
+# Start of the items array in a list response ({"Cantidad": ..., "Listado": [...]})
+_LISTADO_RE = re.compile(r'"Listado"\s*:\s*\[')
+# Separators allowed between array items
+_SEPARATORS = " \t\r\n,"
+
+
+class TruncatedListError(ValueError):
+    """The body ended before the `Listado` array was closed (or never opened it)."""
+
+
+class ListadoStreamParser:
+    """
+    Incremental parser for the `Listado` array of a Mercado Público list response.
+
+    Text is fed as it arrives from the network and complete items are returned
+    as soon as their closing brace is seen, so only the current partial item is
+    buffered instead of the whole body.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_list = False
+        self.done = False
+        self.items_parsed = 0
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Consumes a chunk of the body and returns the items completed by it."""
+        if self.done:
+            return []
+        self._buffer += text
+
+        if not self._in_list:
+            match = _LISTADO_RE.search(self._buffer)
+            if match is None:
+                return []
+            self._buffer = self._buffer[match.end():]
+            self._in_list = True
+
+        items: List[Dict[str, Any]] = []
+        buf = self._buffer
+        pos, size = 0, len(buf)
+        while True:
+            while pos < size and buf[pos] in _SEPARATORS:
+                pos += 1
+            if pos >= size:
+                break
+            if buf[pos] == "]":
+                self.done = True
+                pos += 1
+                break
+            try:
+                item, pos_end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Item not complete yet: wait for the next chunk
+                break
+            items.append(item)
+            pos = pos_end
+
+        self._buffer = "" if self.done else buf[pos:]
+        self.items_parsed += len(items)
+        return items
+
+    def close(self) -> None:
+        """Validates that the whole array was read."""
+        if not self._in_list:
+            raise TruncatedListError("List response has no 'Listado' array")
+        if not self.done:
+            raise TruncatedListError("Truncated or malformed list response: 'Listado' array not closed")
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Status codes Mercado Público uses to signal overload / throttling
+OVERLOAD_STATUS_CODES = {429, 503}
+
+
+class AdaptiveRateLimiter:
+    """
+    Client-side token bucket combined with an AIMD concurrency limit.
+
+    Every request to Mercado Público goes through `slot()`. While responses
+    are healthy the request rate and the concurrency limit grow additively;
+    on 503/429 or timeouts both are cut multiplicatively (at most once per
+    cooldown window, so a burst of in-flight failures counts as one signal).
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 5.0,
+        min_rate: float = 0.5,
+        max_rate: float = 20.0,
+        rate_step: float = 0.5,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        backoff_factor: float = 0.5,
+        cooldown_s: float = 5.0,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate_step = rate_step
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff_factor = backoff_factor
+        self.cooldown_s = cooldown_s
+
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        # Fractional limit so additive increase can grow by 1/limit per success
+        self._concurrency_limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._last_backoff = 0.0
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+        self._stats = {
+            "requests": 0,
+            "successes": 0,
+            "overloads": 0,
+            "errors": 0,
+            "backoffs": 0,
+            "wait_time_ms": 0,
+        }
+
+    @property
+    def concurrency_limit(self) -> int:
+        return max(self.min_concurrency, int(self._concurrency_limit))
+
+    def _refill(self, now: float) -> None:
+        # Burst capacity is one second worth of tokens
+        capacity = max(1.0, self.rate)
+        self._tokens = min(capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def _acquire(self) -> None:
+        wait_start = time.monotonic()
+        async with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._in_flight < self.concurrency_limit and now >= self._paused_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self._in_flight += 1
+                    break
+
+                if self._in_flight >= self.concurrency_limit:
+                    # Woken up by _release()
+                    await self._cond.wait()
+                else:
+                    delay = max(self._paused_until - now, (1.0 - self._tokens) / self.rate)
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+
+        self._stats["requests"] += 1
+        self._stats["wait_time_ms"] += int((time.monotonic() - wait_start) * 1000)
+
+    async def _release(self) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _on_success(self) -> None:
+        self._stats["successes"] += 1
+        self.rate = min(self.max_rate, self.rate + self.rate_step / max(self.rate, 1.0))
+        self._concurrency_limit = min(
+            float(self.max_concurrency), self._concurrency_limit + 1.0 / self._concurrency_limit
+        )
+
+    def _on_overload(self, retry_after: Optional[float] = None) -> None:
+        self._stats["overloads"] += 1
+        now = time.monotonic()
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+        if now - self._last_backoff < self.cooldown_s:
+            return
+        self._last_backoff = now
+        self._stats["backoffs"] += 1
+        self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+        self._concurrency_limit = max(float(self.min_concurrency), self._concurrency_limit * self.backoff_factor)
+        # Drop accumulated burst so the new rate applies immediately
+        self._tokens = min(self._tokens, 1.0)
+        logger.warning(
+            f"Mercado Público overload detected, backing off to rate={self.rate:.2f}/s "
+            f"concurrency={self.concurrency_limit}"
+        )
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Waits for a token and a concurrency slot, then classifies the outcome
+        of the wrapped request to adapt the rate.
+        """
+        await self._acquire()
+        try:
+            yield
+        except httpx.TimeoutException:
+            self._on_overload()
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in OVERLOAD_STATUS_CODES:
+                self._on_overload(self._retry_after(e.response))
+            else:
+                self._stats["errors"] += 1
+            raise
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        else:
+            self._on_success()
+        finally:
+            await self._release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the current limiter state and counters."""
+        return {
+            "rate_per_s": round(self.rate, 3),
+            "concurrency_limit": self.concurrency_limit,
+            "in_flight": self._in_flight,
+            "paused_for_s": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            **self._stats,
+        }
@@ -0,0 +1,336 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.domain.schemas import CommitPolicy
+from app.domain.state_index import TenderStateIndex
+from app.infrastructure.http_pool import SharedHttpClient
+from app.infrastructure.solr.repository import (
+    FACET_FIELDS,
+    STATUS_FILTER_TAG,
+    SolrTenderRepository,
+    build_facet_params,
+    build_search_params,
+    parse_facets,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSolrTenderRepository:
+    """
+    Native async Solr repository over a shared pooled `httpx.AsyncClient`.
+
+    Same methods and semantics as SolrTenderRepository (pysolr), but every call
+    is a coroutine talking to the Solr JSON API directly, so callers await it
+    instead of going through the threadpool.
+    """
+
+    MIN_FIELDS = SolrTenderRepository.MIN_FIELDS
+
+    def __init__(
+        self,
+        base_url: str,
+        core: str,
+        username: str = None,
+        password: str = None,
+        timeout: float = 10,
+        commit_within_ms: int = 10000,
+        http_client: Optional[httpx.AsyncClient] = None,
+        http_pool: Optional[SharedHttpClient] = None,
+        rtg_chunk_size: int = 200,
+        rtg_concurrency: int = 4,
+        snapshot_handler: str = "cursor",
+    ):
+        self.solr_url = f"{base_url.rstrip('/')}/{core}"
+        self.timeout = timeout
+        self.commit_within_ms = commit_within_ms
+        # Real-time get fan-out: ids per /get request and requests in flight
+        self.rtg_chunk_size = rtg_chunk_size
+        self.rtg_concurrency = max(1, rtg_concurrency)
+        # Full-core snapshots: "cursor" (cursorMark paging) or "export" (/export, needs docValues)
+        self.snapshot_handler = snapshot_handler
+        self.auth = (username, password) if username and password else None
+        # A given client or shared pool is owned by the application and never closed here
+        self.http_pool = http_pool
+        self._owns_client = http_client is None and http_pool is None
+        self._client = httpx.AsyncClient(timeout=timeout) if self._owns_client else http_client
+        logger.info(f"Async Solr Repository initialized at {self.solr_url} (Auth: {'Yes' if self.auth else 'No'})")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Resolved per call: the cached repository outlives clients closed by the lifespan (the pool recreates them)
+        return self.http_pool.client if self.http_pool is not None else self._client
+
+    async def close(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    def _commit_params(self, commit_policy: CommitPolicy) -> Dict[str, str]:
+        """Maps a commit policy to /update request parameters."""
+        if commit_policy == CommitPolicy.hard:
+            return {"commit": "true"}
+        if commit_policy == CommitPolicy.soft:
+            return {"commit": "false", "softCommit": "true"}
+        if commit_policy == CommitPolicy.within:
+            return {"commit": "false", "commitWithin": str(self.commit_within_ms)}
+        # CommitPolicy.end: the caller commits once when the run finishes
+        return {"commit": "false"}
+
+    async def _select(self, q: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        # POST form data: no URL length limit for long id lists
+        data = {"q": q, "wt": "json", **params}
+        response = await self.client.post(
+            f"{self.solr_url}/select", data=data, auth=self.auth, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _update(self, payload: List[Dict[str, Any]], params: Dict[str, str]) -> Dict[str, Any]:
+        response = await self.client.post(
+            f"{self.solr_url}/update",
+            params={"wt": "json", **params},
+            content=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            auth=self.auth,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def upsert_many(self, docs: List[Dict[str, Any]], commit_policy: CommitPolicy = CommitPolicy.hard) -> None:
+        """Upserts multiple documents into Solr."""
+        if not docs:
+            return
+
+        try:
+            logger.info(f"Indexing {len(docs)} documents to Solr (commit_policy={commit_policy.value})...")
+            result = await self._update(docs, self._commit_params(commit_policy))
+            logger.info(f"Solr response: {result.get('responseHeader')}")
+        except Exception as e:
+            logger.error(f"Error indexing documents to Solr: {e}")
+            raise
+
+    async def atomic_update_many(
+        self, partials: List[Dict[str, Any]], commit_policy: CommitPolicy = CommitPolicy.hard
+    ) -> None:
+        """
+        Sends atomic updates to Solr. Each dict in `partials` looks like
+        {"id": "123", "field_name": {"set": value}} (native JSON atomic update syntax).
+        """
+        if not partials:
+            return
+
+        try:
+            logger.info(f"Sending atomic updates for {len(partials)} documents (commit_policy={commit_policy.value})...")
+            await self._update(partials, self._commit_params(commit_policy))
+            logger.info(f"Atomic updates successful ({len(partials)} docs).")
+        except Exception as e:
+            logger.error(f"Error sending atomic updates: {e}")
+            raise
+
+    async def commit(self, soft: bool = False) -> None:
+        """Issues an explicit commit. Used by the `end` commit policy once a run finishes."""
+        try:
+            logger.info(f"Committing Solr core at {self.solr_url} (soft={soft})...")
+            await self._update([], {"softCommit": "true"} if soft else {"commit": "true"})
+        except Exception as e:
+            logger.error(f"Error committing to Solr: {e}")
+            raise
+
+    async def search(
+        self, query: str, page: int = 1, size: int = 20, status_codes: List[int] = None, **kwargs
+    ) -> Dict[str, Any]:
+        """Executes a search in Solr with mandatory status_code filtering via fq."""
+        try:
+            query_str = (query or "").strip()
+            search_q, params = build_search_params(query_str, page, size, status_codes, kwargs)
+
+            logger.info(f"Searching Solr at {self.solr_url} with query='{search_q}', params={params}")
+            result = await self._select(search_q, params)
+
+            return {
+                "query": query_str,  # Return original query term for response
+                "status_codes": status_codes,
+                "total": result["response"]["numFound"],
+                "docs": result["response"]["docs"],
+                # Only set for cursorMark requests
+                "next_cursor_mark": result.get("nextCursorMark"),
+            }
+        except Exception as e:
+            logger.error(f"Error searching documents in Solr (query='{query}'): {e}")
+            raise
+
+    async def facets(
+        self, query: str, status_codes: List[int] = None, fields: Optional[List[str]] = None, limit: int = 20, **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Counts per facet (region, entity, type, category, status) over the
+        documents a search matches, with the same query and filters as `search`.
+        """
+        try:
+            query_str = (query or "").strip()
+            fields = list(fields or FACET_FIELDS)
+            search_q, params = build_search_params(
+                query_str, 1, 1, status_codes, {**build_facet_params(fields, limit), **kwargs}, status_tag=STATUS_FILTER_TAG
+            )
+
+            logger.info(f"Faceting Solr at {self.solr_url} with query='{search_q}', params={params}")
+            result = await self._select(search_q, params)
+
+            return {
+                "query": query_str,
+                "status_codes": status_codes,
+                "total": result["response"]["numFound"],
+                "facets": parse_facets(result.get("facets", {}), fields),
+            }
+        except Exception as e:
+            logger.error(f"Error faceting documents in Solr (query='{query}'): {e}")
+            raise
+
+    async def _real_time_get_chunk(
+        self, ids: List[str], fl: Optional[str], semaphore: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
+        # POST form data: no URL length limit for long id lists. One `id` field per id,
+        # since the comma-separated `ids` parameter would split ids that contain commas
+        data: Dict[str, Any] = {"id": ids, "wt": "json"}
+        if fl:
+            data["fl"] = fl
+        async with semaphore:
+            response = await self.client.post(
+                f"{self.solr_url}/get", data=data, auth=self.auth, timeout=self.timeout
+            )
+        response.raise_for_status()
+        return response.json()["response"]["docs"]
+
+    async def real_time_get(self, ids: List[str], fl: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Looks documents up through Solr's real-time get handler (/get),
+        in chunks of `rtg_chunk_size` with at most `rtg_concurrency` requests
+        in flight. Uncommitted updates are visible.
+
+        Returns:
+            Map of id -> document (missing ids are absent)
+        """
+        if not ids:
+            return {}
+
+        semaphore = asyncio.Semaphore(self.rtg_concurrency)
+        results = await asyncio.gather(*(
+            self._real_time_get_chunk(ids[i:i + self.rtg_chunk_size], fl, semaphore)
+            for i in range(0, len(ids), self.rtg_chunk_size)
+        ))
+
+        docs_map = {}
+        for docs in results:
+            for doc in docs:
+                if doc.get("id"):
+                    docs_map[doc["id"]] = doc
+        return docs_map
+
+    async def fetch_min_fields_by_ids(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetches minimal fields (id, status_code, closing_date, title and fingerprints)
+        for a list of IDs through real-time get.
+        """
+        if not ids:
+            return {}
+
+        try:
+            logger.info(f"Fetching minimal fields for {len(ids)} IDs...")
+            return await self.real_time_get(ids, fl=self.MIN_FIELDS)
+        except Exception as e:
+            logger.error(f"Error fetching min fields for IDs: {e}")
+            raise
+
+    async def count(self) -> int:
+        """Number of documents in the core."""
+        try:
+            result = await self._select("*:*", {"rows": 0})
+            return result["response"]["numFound"]
+        except Exception as e:
+            logger.error(f"Error counting documents in Solr: {e}")
+            raise
+
+    async def _export_min_fields(self) -> List[Dict[str, Any]]:
+        # Whole sorted result set in one response, read from docValues
+        response = await self.client.post(
+            f"{self.solr_url}/export",
+            data={"q": "*:*", "fl": self.MIN_FIELDS, "sort": "id asc", "wt": "json"},
+            auth=self.auth,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()["response"]["docs"]
+
+    async def fetch_min_fields_snapshot(self, batch_size: int = 5000) -> TenderStateIndex:
+        """
+        Loads minimal fields for the whole core into a compact TenderStateIndex.
+        Uses cursorMark paging, or a single /export request when `snapshot_handler`
+        is "export" (every MIN_FIELDS field must have docValues).
+        """
+        try:
+            if self.snapshot_handler == "export":
+                snapshot = TenderStateIndex.from_docs(await self._export_min_fields())
+            else:
+                # Rows are packed as they stream in; the documents themselves are not kept
+                snapshot = TenderStateIndex()
+                async for doc in self.iter_min_fields(batch_size=batch_size):
+                    snapshot.add_doc(doc)
+        except Exception as e:
+            logger.error(f"Error loading min fields snapshot ({self.snapshot_handler}): {e}")
+            raise
+        logger.info(f"Loaded min fields snapshot of {len(snapshot)} documents ({self.snapshot_handler})")
+        return snapshot
+
+    async def iter_min_fields(self, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams minimal fields for the whole core using cursorMark deep paging.
+        """
+        async for doc in self.iter_fields(self.MIN_FIELDS, batch_size=batch_size):
+            yield doc
+
+    async def iter_fields(self, fl: str, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams the `fl` fields of every document in the core using cursorMark deep paging.
+        """
+        cursor_mark = "*"
+        total = 0
+        while True:
+            try:
+                result = await self._select(
+                    "*:*",
+                    {"fl": fl, "sort": "id asc", "rows": batch_size, "cursorMark": cursor_mark},
+                )
+            except Exception as e:
+                logger.error(f"Error streaming fields ({fl}) with cursor {cursor_mark}: {e}")
+                raise
+
+            docs = result["response"]["docs"]
+            for doc in docs:
+                yield doc
+            total += len(docs)
+
+            next_cursor_mark = result.get("nextCursorMark")
+            if not docs or next_cursor_mark == cursor_mark:
+                break
+            cursor_mark = next_cursor_mark
+        logger.info(f"Streamed {fl} for {total} documents")
+
+    async def get_by_id(self, tender_id: str) -> Dict[str, Any] | None:
+        """Fetches a single document from Solr by its UniqueKey (id) via real-time get."""
+        try:
+            logger.info(f"Fetching document from Solr with id='{tender_id}'")
+            doc = (await self.real_time_get([tender_id])).get(tender_id)
+            if doc is not None:
+                logger.info(f"Document found for id='{tender_id}'")
+                return doc
+
+            logger.warning(f"No document found for id='{tender_id}'")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching document by id='{tender_id}': {e}")
+            raise
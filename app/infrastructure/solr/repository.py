@@ -1,16 +1,139 @@
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
 import pysolr
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from app.config import settings
+from app.domain.schemas import CommitPolicy
+from app.domain.state_index import TenderStateIndex
+from app.infrastructure.solr.search_cursor import CURSOR_SORT
 
 logger = logging.getLogger(__name__)
 
+# Facet name exposed by the API -> Solr field
+FACET_FIELDS = {
+    "region": "region",
+    "entity": "entity",
+    "type": "type",
+    "category": "category",
+    "status": "status_code",
+}
+# Local-params tag of the status filter, excluded by the status facet
+STATUS_FILTER_TAG = "status"
+
+
+def build_search_params(
+    query_str: str,
+    page: int,
+    size: int,
+    status_codes: Optional[List[int]],
+    extra: Dict[str, Any],
+    status_tag: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Builds the Solr query and parameters for a tender search.
+    Shared by the pysolr and the async repositories.
+
+    Returns:
+        (q, params)
+    """
+    # User requirement: q = _text_:("<search_term>")
+    # We wrap the term in quotes and specify the field.
+    # If query is empty, we fallback to *:* but requirements say search_term mandatory.
+
+    if not query_str:
+        # Fallback to match almost everything if empty, but route validation should prevent this if mandatory.
+        search_q = "*:*"
+        def_type = "lucene"
+    else:
+        # IMPORTANT: with edismax, q should be the raw user text.
+        search_q = query_str
+        def_type = "edismax"
+
+    # Compute Solr pagination
+    page = max(page, 1)
+    size = max(min(size, 100), 1)
+    start = (page - 1) * size
+
+    # Default search parameters
+    params = {
+        "start": start,
+        "rows": size,
+        "fl": "*,score",
+        "defType": def_type,
+        # Include _text_ too, since your schema copyFields go there
+        "qf": "title^2.0 description^1.0 _text_^1.0",
+        "pf": "title^5.0",
+    }
+
+    extra = dict(extra)
+    # Handle status_codes filtering (fq)
+    if status_codes:
+        # fq = status_code:(5 6 8)
+        codes_str = " ".join(str(c) for c in status_codes)
+        fq_status = f"status_code:({codes_str})"
+        if status_tag:
+            fq_status = f"{{!tag={status_tag}}}{fq_status}"
+
+        existing_fq = extra.pop("fq", None)
+        if existing_fq is None:
+            params["fq"] = fq_status
+        elif isinstance(existing_fq, list):
+            params["fq"] = existing_fq + [fq_status]
+        else:
+            params["fq"] = [existing_fq, fq_status]
+
+    if "cursorMark" in extra:
+        # Cursor paging: Solr requires start=0 and a sort that ends on the uniqueKey
+        params["start"] = 0
+        params["sort"] = CURSOR_SORT
+
+    params.update(extra)
+    return search_q, params
+
+
+def build_facet_params(fields: List[str], limit: int) -> Dict[str, Any]:
+    """
+    JSON Facet API request (no documents) with one terms facet per name in
+    `fields`. The status facet ignores the status filter (see STATUS_FILTER_TAG),
+    so a multi-select sidebar still gets counts for the other statuses.
+    """
+    facets = {}
+    for name in fields:
+        facet = {"type": "terms", "field": FACET_FIELDS[name], "limit": limit, "mincount": 1}
+        if name == "status":
+            facet["domain"] = {"excludeTags": STATUS_FILTER_TAG}
+        facets[name] = facet
+    return {"rows": 0, "json.facet": json.dumps(facets)}
+
+
+def parse_facets(raw_facets: Dict[str, Any], fields: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Maps a JSON Facet API response to {name: [{"value", "count"}, ...]}."""
+    return {
+        name: [{"value": bucket["val"], "count": bucket["count"]} for bucket in raw_facets.get(name, {}).get("buckets", [])]
+        for name in fields
+    }
+
+
 class SolrTenderRepository:
-    def __init__(self, base_url: str, core: str, username: str = None, password: str = None, timeout: int = 10):
+    # Fields needed by the ingestion delta diff
+    MIN_FIELDS = "id,status_code,closing_date,title,listing_fingerprint,detail_fingerprint"
+
+    def __init__(self, base_url: str, core: str, username: str = None, password: str = None, timeout: int = 10,
+                 commit_within_ms: int = 10000, rtg_chunk_size: int = 200, rtg_concurrency: int = 4,
+                 snapshot_handler: str = "cursor"):
         self.solr_url = f"{base_url.rstrip('/')}/{core}"
         self.username = username
         self.password = password
         self.timeout = timeout
+        self.commit_within_ms = commit_within_ms
+        # Real-time get fan-out: ids per /get request and requests in flight
+        self.rtg_chunk_size = rtg_chunk_size
+        self.rtg_concurrency = max(1, rtg_concurrency)
+        self._rtg_executor = ThreadPoolExecutor(max_workers=self.rtg_concurrency, thread_name_prefix="solr-rtg")
+        # Full-core snapshots: "cursor" (cursorMark paging) or "export" (/export, needs docValues)
+        self.snapshot_handler = snapshot_handler
         
         # Configure auth
         auth = None
@@ -25,7 +148,18 @@ class SolrTenderRepository:
         )
         logger.info(f"Solr Repository initialized at {self.solr_url} (Auth: {'Yes' if auth else 'No'})")
 
-    def upsert_many(self, docs: List[Dict[str, Any]]) -> None:
+    def _commit_params(self, commit_policy: CommitPolicy) -> Dict[str, Any]:
+        """Maps a commit policy to the pysolr `add` keyword arguments."""
+        if commit_policy == CommitPolicy.hard:
+            return {"commit": True}
+        if commit_policy == CommitPolicy.soft:
+            return {"commit": False, "softCommit": True}
+        if commit_policy == CommitPolicy.within:
+            return {"commit": False, "commitWithin": self.commit_within_ms}
+        # CommitPolicy.end: the caller commits once when the run finishes
+        return {"commit": False}
+
+    def upsert_many(self, docs: List[Dict[str, Any]], commit_policy: CommitPolicy = CommitPolicy.hard) -> None:
         """
         Upserts multiple documents into Solr using pysolr (synchronous call).
         Intended to be executed in a thread pool from async code.
@@ -34,8 +168,8 @@ class SolrTenderRepository:
             return
 
         try:
-            logger.info(f"Indexing {len(docs)} documents to Solr...")
-            result = self.solr.add(docs, commit=True)
+            logger.info(f"Indexing {len(docs)} documents to Solr (commit_policy={commit_policy.value})...")
+            result = self.solr.add(docs, **self._commit_params(commit_policy))
             logger.info(f"Solr response: {result}")
         except Exception as e:
             logger.error(f"Error indexing documents to Solr: {e}")
@@ -48,50 +182,7 @@ class SolrTenderRepository:
         """
         try:
             query_str = (query or "").strip()
-            # User requirement: q = _text_:("<search_term>")
-            # We wrap the term in quotes and specify the field.
-            # If query is empty, we fallback to *:* but requirements say search_term mandatory.
-            
-            if not query_str:
-                # Fallback to match almost everything if empty, but route validation should prevent this if mandatory.
-                search_q = "*:*"
-                def_type = "lucene"
-            else:
-                # IMPORTANT: with edismax, q should be the raw user text.
-                search_q = query_str
-                def_type = "edismax"
-
-            # Compute Solr pagination
-            page = max(page, 1)
-            size = max(min(size, 100), 1)
-            start = (page - 1) * size
-
-            # Default search parameters
-            params = {
-                "start": start,
-                "rows": size,
-                "fl": "*,score",
-                "defType": def_type,
-                # Include _text_ too, since your schema copyFields go there
-                "qf": "title^2.0 description^1.0 _text_^1.0",
-                "pf": "title^5.0",
-            }
-            
-            # Handle status_codes filtering (fq)
-            if status_codes:
-                # fq = status_code:(5 6 8)
-                codes_str = " ".join(str(c) for c in status_codes)
-                fq_status = f"status_code:({codes_str})"
-                
-                existing_fq = kwargs.pop("fq", None)
-                if existing_fq is None:
-                    params["fq"] = fq_status
-                elif isinstance(existing_fq, list):
-                    params["fq"] = existing_fq + [fq_status]
-                else:
-                    params["fq"] = [existing_fq, fq_status]
-
-            params.update(kwargs)
+            search_q, params = build_search_params(query_str, page, size, status_codes, kwargs)
 
             logger.info(f"Searching Solr at {self.solr_url} with query='{search_q}', params={params}")
             results = self.solr.search(search_q, **params)
@@ -104,15 +195,82 @@ class SolrTenderRepository:
                 "status_codes": status_codes,
                 "total": results.hits,
                 "docs": docs,
+                # Only set for cursorMark requests
+                "next_cursor_mark": results.nextCursorMark,
             }
         except Exception as e:
             logger.error(f"Error searching documents in Solr (query='{query}'): {e}")
             raise
 
+    def facets(
+        self, query: str, status_codes: List[int] = None, fields: Optional[List[str]] = None, limit: int = 20, **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Counts per facet (region, entity, type, category, status) over the
+        documents a search matches, with the same query and filters as `search`.
+        """
+        try:
+            query_str = (query or "").strip()
+            fields = list(fields or FACET_FIELDS)
+            search_q, params = build_search_params(
+                query_str, 1, 1, status_codes, {**build_facet_params(fields, limit), **kwargs}, status_tag=STATUS_FILTER_TAG
+            )
+
+            logger.info(f"Faceting Solr at {self.solr_url} with query='{search_q}', params={params}")
+            results = self.solr.search(search_q, **params)
+
+            return {
+                "query": query_str,
+                "status_codes": status_codes,
+                "total": results.hits,
+                "facets": parse_facets(results.raw_response.get("facets", {}), fields),
+            }
+        except Exception as e:
+            logger.error(f"Error faceting documents in Solr (query='{query}'): {e}")
+            raise
+
+    def _real_time_get_chunk(self, ids: List[str], fl: Optional[str]) -> List[Dict[str, Any]]:
+        # POST form data: no URL length limit for long id lists. One `id` field per id,
+        # since the comma-separated `ids` parameter would split ids that contain commas
+        params: Dict[str, Any] = {"id": ids, "wt": "json"}
+        if fl:
+            params["fl"] = fl
+        response = self.solr.get_session().post(
+            f"{self.solr_url}/get", data=params, auth=self.solr.auth, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()["response"]["docs"]
+
+    def real_time_get(self, ids: List[str], fl: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Looks documents up through Solr's real-time get handler (/get).
+        No query parsing or scoring, and uncommitted updates are visible.
+        IDs are sent in chunks of `rtg_chunk_size`, at most `rtg_concurrency`
+        chunks in flight, and the results are merged.
+
+        Returns:
+            Map of id -> document (missing ids are absent)
+        """
+        if not ids:
+            return {}
+
+        chunks = [ids[i:i + self.rtg_chunk_size] for i in range(0, len(ids), self.rtg_chunk_size)]
+        if len(chunks) == 1:
+            results = [self._real_time_get_chunk(chunks[0], fl)]
+        else:
+            results = self._rtg_executor.map(lambda chunk: self._real_time_get_chunk(chunk, fl), chunks)
+
+        docs_map = {}
+        for docs in results:
+            for doc in docs:
+                if doc.get("id"):
+                    docs_map[doc["id"]] = doc
+        return docs_map
+
     def fetch_min_fields_by_ids(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        Fetches minimal fields (id, status_code, closing_date) for a list of IDs.
-        Uses POST to avoid URL length limits.
+        Fetches minimal fields (id, status_code, closing_date, title and fingerprints)
+        for a list of IDs through real-time get.
         
         Returns:
             Dict[str, Dict[str, Any]]: Map of id -> document fields
@@ -121,46 +279,87 @@ class SolrTenderRepository:
             return {}
 
         try:
-            # Construct the query: id:(id1 OR id2 OR ...)
-            # Escape IDs just in case, though usually they are safe
-            safe_ids = [f'"{i}"' for i in ids]
-            query_str = f"id:({' '.join(safe_ids)})"
-            
-            # Using standard Lucene parser for ID lookup
-            params = {
-                "fl": "id,status_code,closing_date",
-                "rows": len(ids),
-                "wt": "json"
-            }
-            
-            # Use search method. pysolr.search uses GET by default but we can try to force POST 
-            # if we use the underlying session or rely on pysolr's behavior. 
-            # However, pysolr's search() mostly does GET. 
-            # To be safe against URL limits with standard pysolr, we can use delete/add logic, 
-            # but for querying we might need to rely on chunks if POST isn't easy.
-            # BUT, pysolr >= 3.8 supports `search(..., **{'method': 'POST'})` if the server supports it (it usually does).
-            
             logger.info(f"Fetching minimal fields for {len(ids)} IDs...")
-            results = self.solr.search(query_str, **params) # pysolr defaults to POST for large queries automatically often, but let's be implicit if needed.
-            # Actually pysolr by default sends GET. We can pass method='POST' in kwargs.
-            # Let's try passing it to be safe.
-            
-            # Re-doing the call with method='POST' to ensure safety
-            results = self.solr.search(query_str, method='POST', **params)
-            
-            docs_map = {}
-            for doc in results:
-                doc_id = doc.get("id")
-                if doc_id:
-                    docs_map[doc_id] = doc
-                    
-            return docs_map
-            
+            return self.real_time_get(ids, fl=self.MIN_FIELDS)
         except Exception as e:
             logger.error(f"Error fetching min fields for IDs: {e}")
             raise
 
-    def atomic_update_many(self, partials: List[Dict[str, Any]]) -> None:
+    def count(self) -> int:
+        """Number of documents in the core."""
+        try:
+            return self.solr.search("*:*", rows=0).hits
+        except Exception as e:
+            logger.error(f"Error counting documents in Solr: {e}")
+            raise
+
+    def _export_min_fields(self) -> List[Dict[str, Any]]:
+        # Whole sorted result set in one response, read from docValues
+        response = self.solr.get_session().get(
+            f"{self.solr_url}/export",
+            params={"q": "*:*", "fl": self.MIN_FIELDS, "sort": "id asc", "wt": "json"},
+            auth=self.solr.auth,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()["response"]["docs"]
+
+    def fetch_min_fields_snapshot(self, batch_size: int = 5000) -> TenderStateIndex:
+        """
+        Loads minimal fields for the whole core into a compact TenderStateIndex.
+        Uses cursorMark paging, or a single /export request when `snapshot_handler`
+        is "export" (every MIN_FIELDS field must have docValues).
+        """
+        try:
+            if self.snapshot_handler == "export":
+                docs = self._export_min_fields()
+            else:
+                docs = self.iter_min_fields(batch_size=batch_size)
+            # Rows are packed as they stream in; the documents themselves are not kept
+            snapshot = TenderStateIndex.from_docs(docs)
+        except Exception as e:
+            logger.error(f"Error loading min fields snapshot ({self.snapshot_handler}): {e}")
+            raise
+        logger.info(f"Loaded min fields snapshot of {len(snapshot)} documents ({self.snapshot_handler})")
+        return snapshot
+
+    def iter_min_fields(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Streams minimal fields (id, status_code, closing_date, fingerprints) for the whole core
+        using cursorMark deep paging (same loop as reindex_in_place.py).
+        """
+        yield from self.iter_fields(self.MIN_FIELDS, batch_size=batch_size)
+
+    def iter_fields(self, fl: str, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the `fl` fields of every document in the core using cursorMark deep paging.
+        """
+        cursor_mark = "*"
+        total = 0
+        while True:
+            try:
+                results = self.solr.search(
+                    "*:*",
+                    fl=fl,
+                    sort="id asc",
+                    rows=batch_size,
+                    cursorMark=cursor_mark,
+                )
+            except Exception as e:
+                logger.error(f"Error streaming fields ({fl}) with cursor {cursor_mark}: {e}")
+                raise
+
+            for doc in results:
+                yield doc
+            total += len(results.docs)
+
+            next_cursor_mark = results.nextCursorMark
+            if not results.docs or next_cursor_mark == cursor_mark:
+                break
+            cursor_mark = next_cursor_mark
+        logger.info(f"Streamed {fl} for {total} documents")
+
+    def atomic_update_many(self, partials: List[Dict[str, Any]], commit_policy: CommitPolicy = CommitPolicy.hard) -> None:
         """
         Sends atomic updates to Solr.
         Each dict in `partials` should look like:
@@ -173,11 +372,9 @@ class SolrTenderRepository:
             return
             
         try:
-            logger.info(f"Sending atomic updates for {len(partials)} documents...")
-            # commit=True to ensure consistency, or False for performance (controlled by caller or auto-commit)
-            # here we use commit=True as requested in previous similar context, or strict safety.
-            # For bulk, maybe commit=True at the end is better, but this method implies a batch.
-            self.solr.add(partials, commit=True) # Removed fieldUpdates=True which caused TypeError
+            logger.info(f"Sending atomic updates for {len(partials)} documents (commit_policy={commit_policy.value})...")
+            # Visibility is controlled by the caller's commit policy (see _commit_params)
+            self.solr.add(partials, **self._commit_params(commit_policy)) # Removed fieldUpdates=True which caused TypeError
             # actually pysolr.add just sends the json. If the json has {"set": ...} Solr understands it.
             # But we must ensure pysolr doesn't flatten it weirdly. Pysolr handles dicts fine.
             logger.info(f"Atomic updates successful ({len(partials)} docs).")
@@ -185,25 +382,28 @@ class SolrTenderRepository:
             logger.error(f"Error sending atomic updates: {e}")
             raise
 
+    def commit(self, soft: bool = False) -> None:
+        """
+        Issues an explicit commit. Used by the `end` commit policy once a run finishes.
+        """
+        try:
+            logger.info(f"Committing Solr core at {self.solr_url} (soft={soft})...")
+            self.solr.commit(softCommit=soft)
+        except Exception as e:
+            logger.error(f"Error committing to Solr: {e}")
+            raise
+
     def get_by_id(self, tender_id: str) -> Dict[str, Any] | None:
         """
-        Fetches a single document from Solr by its UniqueKey (id).
+        Fetches a single document from Solr by its UniqueKey (id) via real-time get.
         """
         try:
-            # Direct query by id
-            query_str = f'id:"{tender_id}"'
-            
-            params = {
-                "rows": 1,
-                "wt": "json"
-            }
-            
             logger.info(f"Fetching document from Solr with id='{tender_id}'")
-            results = self.solr.search(query_str, **params)
+            doc = self.real_time_get([tender_id]).get(tender_id)
             
-            if len(results) > 0:
+            if doc is not None:
                 logger.info(f"Document found for id='{tender_id}'")
-                return results.docs[0]
+                return doc
             
             logger.warning(f"No document found for id='{tender_id}'")
             return None
@@ -0,0 +1,158 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IndexGeneration:
+    """
+    Counter of the Solr index contents as seen by this process.
+
+    Ingestion bumps it every time it makes new data visible (per-batch
+    hard/soft writes, `within` writes once commitWithin elapsed, and the final
+    commit), so anything cached under an older generation is known to be stale.
+    """
+
+    def __init__(self):
+        self.value = 0
+        self.bumped_at: Optional[float] = None
+
+    def bump(self) -> int:
+        self.value += 1
+        self.bumped_at = time.time()
+        return self.value
+
+
+def search_cache_key(search_term: str, status_codes: Iterable[int], *variant: Hashable) -> Tuple:
+    """
+    Canonical key of a search request: whitespace-collapsed term and sorted,
+    de-duplicated status codes, so equivalent requests share one entry.
+    `variant` holds everything else that changes the response (page, size, profile...).
+    """
+    return (" ".join(search_term.split()), tuple(sorted(set(status_codes))), *variant)
+
+
+class ResultCache:
+    """
+    In-process LRU + TTL cache of finished (serialized) Solr-backed responses.
+
+    Entries are evicted least recently used first once `max_entries` or
+    `max_bytes` is exceeded and expire after `ttl_s`. With a `generation`, all
+    of them are dropped as soon as it moves; without one, callers invalidate
+    individual keys. Each worker process has its own cache, and only sees the
+    ingestion runs it executes itself; the TTL bounds staleness for the others.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        generation: Optional[IndexGeneration] = None,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_s: float = 60.0,
+    ):
+        self.name = name
+        self.generation = generation
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        # key -> (expires_at, body)
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._generation = generation.value if generation is not None else None
+        # Bumped by every invalidate() call, see token()
+        self._invalidation_seq = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0, "invalidations": 0, "stale_writes": 0}
+
+    def _sync_generation(self) -> None:
+        # Called with the lock held
+        if self.generation is not None and self.generation.value != self._generation:
+            if self._entries:
+                self._stats["invalidations"] += 1
+                logger.info(f"{self.name} cache invalidated ({len(self._entries)} entries, generation {self.generation.value})")
+            self._entries.clear()
+            self._bytes = 0
+            self._generation = self.generation.value
+
+    def _drop(self, key: Hashable) -> None:
+        _, body = self._entries.pop(key)
+        self._bytes -= len(body)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            self._sync_generation()
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def token(self) -> Tuple[Optional[int], int]:
+        """
+        Taken before reading from Solr and handed to `put`: a result read while
+        an invalidation happened is not stored, since it may predate the write.
+        """
+        return (self.generation.value if self.generation is not None else None, self._invalidation_seq)
+
+    def put(self, key: Hashable, body: bytes, token: Optional[Tuple[Optional[int], int]] = None) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if token is not None and token != self.token():
+                self._stats["stale_writes"] += 1
+                return
+            self._sync_generation()
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_s, body)
+            self._bytes += len(body)
+            self._stats["writes"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, keys: Iterable[Hashable]) -> int:
+        """Drops the given keys; returns how many were cached."""
+        dropped = 0
+        with self._lock:
+            self._invalidation_seq += 1
+            for key in keys:
+                if key in self._entries:
+                    self._drop(key)
+                    dropped += 1
+            self._stats["invalidations"] += dropped
+        return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns hit/miss counters plus the current entry count, size and generation."""
+        with self._lock:
+            self._sync_generation()
+            stats = dict(self._stats)
+            entries, total = len(self._entries), self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "hit_ratio": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "ttl_s": self.ttl_s,
+            "generation": self.generation.value if self.generation is not None else None,
+        }
@@ -0,0 +1,45 @@
+import base64
+import hashlib
+import json
+from typing import Iterable
+
+# Stable order for cursorMark paging: relevance, then the uniqueKey as tie-break
+CURSOR_SORT = "score desc,id asc"
+# Cursor of the first page, as in Solr
+CURSOR_START = "*"
+
+
+class InvalidSearchCursor(ValueError):
+    """The cursor is malformed or belongs to a different search."""
+
+
+def _search_fingerprint(search_term: str, status_codes: Iterable[int]) -> str:
+    # Same normalization as search_cache_key: equivalent searches accept each other's cursors
+    canonical = [" ".join(search_term.split()), sorted(set(status_codes)), CURSOR_SORT]
+    return hashlib.sha1(json.dumps(canonical).encode("utf-8")).hexdigest()[:12]
+
+
+def encode_search_cursor(cursor_mark: str, search_term: str, status_codes: Iterable[int]) -> str:
+    """Opaque `nextCursor` token: the Solr cursorMark bound to the search it came from."""
+    raw = json.dumps({"s": _search_fingerprint(search_term, status_codes), "m": cursor_mark}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_search_cursor(token: str, search_term: str, status_codes: Iterable[int]) -> str:
+    """
+    Solr cursorMark of a token (CURSOR_START for "*").
+
+    Raises:
+        InvalidSearchCursor: if the token cannot be decoded or was issued for another search
+    """
+    if token == CURSOR_START:
+        return CURSOR_START
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        fingerprint, cursor_mark = data["s"], data["m"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidSearchCursor("Malformed cursor") from e
+    if fingerprint != _search_fingerprint(search_term, status_codes) or not isinstance(cursor_mark, str):
+        raise InvalidSearchCursor("Cursor does not belong to this search")
+    return cursor_mark
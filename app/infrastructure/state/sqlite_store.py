@@ -0,0 +1,156 @@
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_MAX_PARAMS = 900
+
+
+class SqliteTenderStateStore:
+    """
+    Local persistent copy of the per-tender ingestion state
+    (id -> status_code, closing_date, content_hash, last_seen).
+
+    Used by the delta diff instead of querying Solr for every run. Writes are
+    transactional and happen only after Solr accepted the corresponding batch.
+    All methods are synchronous; call them through run_in_threadpool.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tender_state (
+                    id TEXT PRIMARY KEY,
+                    status_code INTEGER,
+                    closing_date TEXT,
+                    content_hash TEXT,
+                    last_seen REAL
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)")
+        logger.info(f"Tender state store initialized at {self.path}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation keeps the store thread-safe
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row(record: Dict[str, Any], now: float) -> tuple:
+        # content_hash is the listing fingerprint computed by the ingestion service
+        return (
+            record["id"],
+            record.get("status_code"),
+            record.get("closing_date"),
+            record.get("content_hash"),
+            record.get("last_seen") or now,
+        )
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tender_state").fetchone()[0]
+
+    def is_complete(self) -> bool:
+        """
+        Whether the store was rebuilt from a full Solr scan (replace_all).
+        Before that it only holds the tenders ingested or looked up so far.
+        """
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM store_meta WHERE key = 'reconciled_at'").fetchone() is not None
+
+    def get_many(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the stored state for the given IDs.
+        Same shape as SolrTenderRepository.fetch_min_fields_by_ids plus content_hash and last_seen.
+        """
+        docs_map: Dict[str, Dict[str, Any]] = {}
+        if not ids:
+            return docs_map
+
+        with self._connect() as conn:
+            for i in range(0, len(ids), _MAX_PARAMS):
+                chunk = ids[i:i + _MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT id, status_code, closing_date, content_hash, last_seen "
+                    f"FROM tender_state WHERE id IN ({placeholders})",
+                    chunk,
+                )
+                for doc_id, status_code, closing_date, content_hash, last_seen in rows:
+                    docs_map[doc_id] = {
+                        "id": doc_id,
+                        "status_code": status_code,
+                        "closing_date": closing_date,
+                        "content_hash": content_hash,
+                        "last_seen": last_seen,
+                    }
+        return docs_map
+
+    def upsert_many(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Inserts or replaces state records in a single transaction.
+        Each record needs `id`; `status_code`/`closing_date` are optional.
+        """
+        if not records:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO tender_state (id, status_code, closing_date, content_hash, last_seen) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [self._row(record, now) for record in records],
+            )
+
+    def mark_seen(self, ids: List[str]) -> None:
+        """Refreshes last_seen for tenders present in the latest listing."""
+        if not ids:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE tender_state SET last_seen = ? WHERE id = ?",
+                [(now, doc_id) for doc_id in ids],
+            )
+
+    def replace_all(self, records: Iterable[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """
+        Rebuilds the store from scratch in a single transaction and marks it
+        complete (see is_complete). Readers keep seeing the previous content until the rebuild commits.
+
+        Returns:
+            Number of records written.
+        """
+        now = time.time()
+        total = 0
+        with self._connect() as conn:
+            conn.execute("DELETE FROM tender_state")
+            batch: List[tuple] = []
+            for record in records:
+                batch.append(self._row(record, now))
+                if len(batch) >= batch_size:
+                    conn.executemany("INSERT OR REPLACE INTO tender_state VALUES (?, ?, ?, ?, ?)", batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                conn.executemany("INSERT OR REPLACE INTO tender_state VALUES (?, ?, ?, ?, ?)", batch)
+                total += len(batch)
+            conn.execute("INSERT OR REPLACE INTO store_meta VALUES ('reconciled_at', ?)", (str(now),))
+        logger.info(f"Tender state store rebuilt with {total} records")
+        return total
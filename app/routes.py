@@ -1,14 +1,31 @@
+import json
 from datetime import date
 from math import ceil
-from typing import Any, Dict, List
-
-from fastapi import APIRouter, Depends, Query, HTTPException
-from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Optional
 
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.application.fast_json import render_json
+from app.application.repository_calls import call_repository
+from app.application.response_encoding import ResponseEncoder, StreamCompressor
+from app.application.search_export import ExportFormat, SearchExporter
+from app.application.suggest_service import TenderSuggester
 from app.application.transformer_service import TenderTransformer
-from app.infrastructure.solr.repository import SolrTenderRepository
-from app.dependencies import get_solr_repository, require_admin_token
-from app.domain.schemas import TenderSummaryDTO
+from app.config import settings
+from app.dependencies import (
+    get_facet_cache,
+    get_response_encoder,
+    get_search_cache,
+    get_solr_repository,
+    get_suggester,
+    get_tender_cache,
+    require_admin_token,
+)
+from app.domain.ports import SolrTenderRepositoryPort
+from app.domain.schemas import FacetField, SearchProfile, SuggestKind, TenderBatchRequest, TenderSummaryDTO
+from app.infrastructure.solr.result_cache import ResultCache, search_cache_key
+from app.infrastructure.solr.search_cursor import InvalidSearchCursor, decode_search_cursor, encode_search_cursor
 
 router = APIRouter(dependencies=[Depends(require_admin_token)])
 
@@ -16,57 +33,308 @@ router = APIRouter(dependencies=[Depends(require_admin_token)])
 async def root():
     return {"message": "Mercado Público Search Ingestor Active"}
 
+def _render(content: Any) -> bytes:
+    """JSON body exactly as FastAPI would render `content`."""
+    return JSONResponse(content=jsonable_encoder(content)).body
+
 @router.get("/tenders/{tender_id}", response_model=TenderSummaryDTO)
 async def get_tender_by_id(
+    request: Request,
     tender_id: str,
-    solr_repo: SolrTenderRepository = Depends(get_solr_repository),
+    solr_repo: SolrTenderRepositoryPort = Depends(get_solr_repository),
+    tender_cache: Optional[ResultCache] = Depends(get_tender_cache),
+    encoder: ResponseEncoder = Depends(get_response_encoder),
 ):
     """
     Get a single tender by its ID from Solr.
+    Served from the per-tender cache when possible (X-Cache: HIT/MISS).
+    Compressed as Accept-Encoding allows; If-None-Match with the current ETag
+    gets a 304 without querying Solr.
     """
-    doc = await run_in_threadpool(solr_repo.get_by_id, tender_id)
+    etag = encoder.etag("tender", tender_id)
+    not_modified = encoder.not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    if tender_cache is not None:
+        cache_token = tender_cache.token()
+        body = tender_cache.get(tender_id)
+        if body is not None:
+            return encoder.respond(request, body, etag, headers={"X-Cache": "HIT"})
+
+    doc = await call_repository(solr_repo.get_by_id, tender_id)
     
     if not doc:
         raise HTTPException(status_code=404, detail=f"Tender with id {tender_id} not found")
         
-    return TenderTransformer.solr_doc_to_summary_dto(doc)
+    body = render_json(TenderTransformer.solr_doc_to_profile_item(doc, SearchProfile.full))
+    if tender_cache is None:
+        return encoder.respond(request, body, etag)
+    tender_cache.put(tender_id, body, cache_token)
+    return encoder.respond(request, body, etag, headers={"X-Cache": "MISS"})
+
+@router.post("/tenders/batch")
+async def get_tenders_batch(
+    http_request: Request,
+    request: TenderBatchRequest,
+    solr_repo: SolrTenderRepositoryPort = Depends(get_solr_repository),
+    tender_cache: Optional[ResultCache] = Depends(get_tender_cache),
+    encoder: ResponseEncoder = Depends(get_response_encoder),
+):
+    """
+    Get many tenders (TenderSummaryDTO) in one round trip.
+    Cached tenders are served from the per-tender cache and the rest are looked
+    up with a single real-time get. Items keep the request order (duplicates
+    once); ids that are not indexed are listed in `missing`.
+    """
+    ids = list(dict.fromkeys(request.ids))
+    bodies: Dict[str, bytes] = {}
+    if tender_cache is not None:
+        cache_token = tender_cache.token()
+        for tender_id in ids:
+            body = tender_cache.get(tender_id)
+            if body is not None:
+                bodies[tender_id] = body
+
+    to_fetch = [tender_id for tender_id in ids if tender_id not in bodies]
+    if to_fetch:
+        docs = await call_repository(solr_repo.real_time_get, to_fetch)
+        for tender_id in to_fetch:
+            doc = docs.get(tender_id)
+            if doc is None:
+                continue
+            bodies[tender_id] = render_json(TenderTransformer.solr_doc_to_profile_item(doc, SearchProfile.full))
+            if tender_cache is not None:
+                tender_cache.put(tender_id, bodies[tender_id], cache_token)
+
+    # Items are already serialized: join them instead of decoding and re-encoding
+    items = b",".join(bodies[tender_id] for tender_id in ids if tender_id in bodies)
+    missing = [tender_id for tender_id in ids if tender_id not in bodies]
+    content = b'{"items":[' + items + b'],"missing":' + _render(missing) + b"}"
+    return encoder.respond(http_request, content)
 
 @router.get("/search")
 async def search(
+    request: Request,
     search_term: str = Query(..., min_length=1, description="Term to search in title/description"),
     status_codes: List[int] = Query(..., min_length=1, description="List of status codes to filter by"),
     page: int = Query(1, ge=1, description="Page number (starting from 1)"),
     size: int = Query(20, ge=1, le=100, description="Page size (number of items per page)"),
-    solr_repo: SolrTenderRepository = Depends(get_solr_repository),
+    profile: SearchProfile = Query(SearchProfile.full, description="Projection profile: list, card or full"),
+    cursor: Optional[str] = Query(None, min_length=1, description="Cursor paging: '*' for the first page, then the previous nextCursor"),
+    solr_repo: SolrTenderRepositoryPort = Depends(get_solr_repository),
+    search_cache: Optional[ResultCache] = Depends(get_search_cache),
+    encoder: ResponseEncoder = Depends(get_response_encoder),
 ):
     """
-    Search endpoint backed by Solr that returns a paginated list of TenderSummaryDTO.
-    Requires search_term and status_codes.
+    Search endpoint backed by Solr that returns a paginated list of tenders.
+    Requires search_term and status_codes. `profile` selects the item shape
+    (TenderListDTO, TenderCardDTO or TenderSummaryDTO) and Solr only returns
+    the fields it needs. Responses are cached until the TTL
+    expires or ingestion makes new data visible (X-Cache: HIT/MISS).
+
+    Page numbers go down to `search_max_offset` results when it is set (a
+    deeper page gets a 400 that points to the cursor). With `cursor`, pages
+    are read with a Solr cursorMark instead (constant cost at any depth,
+    `page` is ignored) and the response carries the `nextCursor` token, null
+    once the results are exhausted.
+
+    Responses are compressed as Accept-Encoding allows and carry an ETag
+    (query + index generation): If-None-Match with it gets a 304 without
+    querying Solr.
     """
-    # Run the blocking Solr call in a thread pool so the event loop is not blocked
+    extra: Dict[str, Any] = {"fl": TenderTransformer.profile_fl(profile)}
+    if cursor is not None:
+        try:
+            extra["cursorMark"] = decode_search_cursor(cursor, search_term, status_codes)
+        except InvalidSearchCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        cache_key = search_cache_key(search_term, status_codes, 1, size, profile.value, extra["cursorMark"])
+    else:
+        offset = (page - 1) * size
+        if settings.search_max_offset and offset > settings.search_max_offset:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": (
+                        f"Offset {offset} exceeds the page-number limit of {settings.search_max_offset}; "
+                        "page with the cursor instead (cursor=*, then nextCursor)"
+                    ),
+                    "offset": offset,
+                    "max_offset": settings.search_max_offset,
+                    "cursor": "*",
+                },
+            )
+        cache_key = search_cache_key(search_term, status_codes, page, size, profile.value)
+
+    etag = encoder.etag("search", cache_key)
+    not_modified = encoder.not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    if search_cache is not None:
+        cache_token = search_cache.token()
+        body = search_cache.get(cache_key)
+        if body is not None:
+            return encoder.respond(request, body, etag, headers={"X-Cache": "HIT"})
+
+    # pysolr calls run in the threadpool so the event loop is not blocked; the async repo is awaited
     # search_term maps to query argument in repo
-    raw_result: Dict[str, Any] = await run_in_threadpool(
+    raw_result: Dict[str, Any] = await call_repository(
         solr_repo.search, 
         query=search_term, 
-        page=page, 
+        page=page,
         size=size,
-        status_codes=status_codes
+        status_codes=status_codes,
+        **extra,
     )
 
-    dtos: List[TenderSummaryDTO] = [
-        TenderTransformer.solr_doc_to_summary_dto(doc)
+    # Docs go straight to JSON-ready dicts (no DTO instances) and the body is rendered once below
+    items: List[Dict[str, Any]] = [
+        TenderTransformer.solr_doc_to_profile_item(doc, profile)
         for doc in raw_result.get("docs", [])
     ]
 
-    total: int = raw_result.get("total", len(dtos))
+    total: int = raw_result.get("total", len(items))
     total_pages = ceil(total / size) if total > 0 else 1
 
-    return {
+    if cursor is not None:
+        # A short page is the last one; Solr also returns the same mark once nothing is left
+        next_mark = raw_result.get("next_cursor_mark")
+        payload = {
+            "query": raw_result.get("query", search_term),
+            "status_codes": raw_result.get("status_codes", status_codes),
+            "size": size,
+            "total": total,
+            "totalPages": total_pages,
+            "cursor": cursor,
+            "nextCursor": (
+                encode_search_cursor(next_mark, search_term, status_codes)
+                if next_mark and next_mark != extra["cursorMark"] and len(items) == size
+                else None
+            ),
+            "items": items,
+        }
+    else:
+        payload = {
+            "query": raw_result.get("query", search_term),
+            "status_codes": raw_result.get("status_codes", status_codes),
+            "page": page,
+            "size": size,
+            "total": total,
+            "totalPages": total_pages,
+            "items": items,
+        }
+    # Same body FastAPI would render from the DTOs, kept serialized so cache hits skip mapping and encoding
+    body = render_json(payload)
+    if search_cache is None:
+        return encoder.respond(request, body, etag)
+    search_cache.put(cache_key, body, cache_token)
+    return encoder.respond(request, body, etag, headers={"X-Cache": "MISS"})
+
+@router.get("/search/export")
+async def export_search(
+    request: Request,
+    search_term: str = Query(..., min_length=1, description="Term to search in title/description"),
+    status_codes: List[int] = Query(..., min_length=1, description="List of status codes to filter by"),
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format", description="ndjson or csv"),
+    gzip: bool = Query(False, description="Gzip-compress the file"),
+    solr_repo: SolrTenderRepositoryPort = Depends(get_solr_repository),
+    encoder: ResponseEncoder = Depends(get_response_encoder),
+):
+    """
+    Streams every tender (TenderSummaryDTO) matching a /search as an NDJSON or
+    CSV file, reading Solr with cursorMark so memory and per-request Solr cost
+    stay constant at any result size.
+
+    With `gzip` the file itself is gzipped (application/gzip); otherwise the
+    stream is compressed as Accept-Encoding allows. Like /search, it carries
+    an ETag and answers If-None-Match with a 304 without querying Solr.
+    """
+    etag = encoder.etag("export", search_cache_key(search_term, status_codes, export_format.value, gzip))
+    not_modified = encoder.not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    exporter = SearchExporter(solr_repo, batch_size=settings.search_export_batch_size)
+    filename = f"tenders.{export_format.value}{'.gz' if gzip else ''}"
+    # An already gzipped file is never compressed again as a Content-Encoding
+    encoding = None if gzip else encoder.negotiate(request)
+    compressor = StreamCompressor("gzip", gzip_level=encoder.gzip_level) if gzip else encoder.stream_compressor(encoding)
+    return StreamingResponse(
+        exporter.stream(search_term, status_codes, export_format, compressor=compressor),
+        media_type=exporter.media_type(export_format, gzip=gzip),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **encoder.stream_headers(etag, encoding)},
+    )
+
+@router.get("/search/facets")
+async def search_facets(
+    request: Request,
+    search_term: str = Query(..., min_length=1, description="Term to search in title/description"),
+    status_codes: List[int] = Query(..., min_length=1, description="List of status codes to filter by"),
+    fields: List[FacetField] = Query(list(FacetField), description="Facets to count (default: all)"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum buckets per facet"),
+    solr_repo: SolrTenderRepositoryPort = Depends(get_solr_repository),
+    facet_cache: Optional[ResultCache] = Depends(get_facet_cache),
+    encoder: ResponseEncoder = Depends(get_response_encoder),
+):
+    """
+    Counts by region, entity, type, category and status for the tenders a
+    /search with the same search_term and status_codes matches (Solr JSON
+    facets), e.g. to build filter sidebars without paging through results.
+    The status facet ignores the status_codes filter, so every status keeps its
+    count. Cached, compressed and tagged like /search (X-Cache: HIT/MISS,
+    If-None-Match answered with a 304 without querying Solr).
+    """
+    # Canonical facet order, duplicates dropped
+    names = [field.value for field in FacetField if field in fields]
+    cache_key = search_cache_key(search_term, status_codes, limit, *names)
+    etag = encoder.etag("facets", cache_key)
+    not_modified = encoder.not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    if facet_cache is not None:
+        cache_token = facet_cache.token()
+        body = facet_cache.get(cache_key)
+        if body is not None:
+            return encoder.respond(request, body, etag, headers={"X-Cache": "HIT"})
+
+    raw_result: Dict[str, Any] = await call_repository(
+        solr_repo.facets,
+        query=search_term,
+        status_codes=status_codes,
+        fields=names,
+        limit=limit,
+    )
+
+    payload = {
         "query": raw_result.get("query", search_term),
         "status_codes": raw_result.get("status_codes", status_codes),
-        "page": page,
-        "size": size,
-        "total": total,
-        "totalPages": total_pages,
-        "items": dtos,
+        "total": raw_result.get("total", 0),
+        "facets": TenderTransformer.solr_facets_to_dto(raw_result.get("facets", {})),
     }
+    body = _render(payload)
+    if facet_cache is None:
+        return encoder.respond(request, body, etag)
+    facet_cache.put(cache_key, body, cache_token)
+    return encoder.respond(request, body, etag, headers={"X-Cache": "MISS"})
+
+@router.get("/suggest")
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix typed so far"),
+    kinds: List[SuggestKind] = Query(list(SuggestKind), description="Suggestion sources (default: all)"),
+    limit: int = Query(10, ge=1, le=20, description="Maximum suggestions per kind"),
+    suggester: Optional[TenderSuggester] = Depends(get_suggester),
+):
+    """
+    Type-ahead suggestions (titles, entities, categories) whose words start
+    with `q`, ignoring case and accents. Served from an in-process prefix index,
+    without querying Solr.
+    """
+    if suggester is None:
+        raise HTTPException(status_code=404, detail="Suggestions are disabled (SUGGEST_ENABLED=false)")
+    if not suggester.ready:
+        raise HTTPException(status_code=503, detail="Suggest index is loading")
+    names = [kind.value for kind in SuggestKind if kind in kinds]
+    return {"query": q, "suggestions": suggester.suggest(q, names, limit)}
@@ -0,0 +1,75 @@
+"""
+Benchmark: GET /search/facets latency, cold vs. warm.
+
+Calls the API in-process (ASGI transport, no network) against the Solr core
+configured in .env. "cold" clears the facet cache before every request, so
+each one goes to Solr (JSON facets) and is serialized; "warm" repeats the same
+requests and is served from the cache. Reports latency percentiles of both.
+Needs a reachable Solr core with indexed tenders.
+
+Usage:
+    python benchmarks/bench_facets.py [--requests 200] [--queries agua,servicio,construccion]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.dependencies import get_facet_cache  # noqa: E402
+
+STATUS_CODES = [5, 6, 7, 8]
+
+
+async def run(client: httpx.AsyncClient, queries, total: int, cold: bool):
+    cache = get_facet_cache()
+    latencies = []
+    for i in range(total):
+        if cold and cache is not None:
+            cache.clear()
+        started = time.perf_counter()
+        response = await client.get(
+            "/search/facets", params={"search_term": queries[i % len(queries)], "status_codes": STATUS_CODES}
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "x_cache": response.headers.get("X-Cache"),
+    }
+
+
+async def main_async():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--queries", default="agua,servicio,construccion")
+    args = parser.parse_args()
+    queries = args.queries.split(",")
+
+    if get_facet_cache() is None:
+        print("FACET_CACHE_MAX_ENTRIES is 0: warm requests will not be cached")
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"X-ADMIN-TOKEN": settings.admin_token}
+    ) as client:
+        # Warm-up so connection setup is not part of the measurement
+        await run(client, queries, len(queries), cold=True)
+        for name, cold in (("cold", True), ("warm", False)):
+            print(f"{name:<6} {await run(client, queries, args.requests, cold)}")
+    if get_facet_cache() is not None:
+        print(f"facet cache: {get_facet_cache().snapshot()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
@@ -0,0 +1,113 @@
+"""
+Benchmark: /search response compression and conditional GET.
+
+On a /search body of `--size` full items (documents shaped from the checked-in
+fixtures, see bench_search_profiles.py), reports the compressed size and the
+compression time of gzip and brotli at several levels (brotli only when the
+`brotli` package is installed).
+
+Then calls /search in-process (ASGI transport, stub repository, search cache
+disabled) and reports the mean latency of a full 200 response per content
+coding and of a revalidation answered with 304 from its ETag.
+
+Usage:
+    python benchmarks/bench_response_encoding.py [--size 100] [--requests 300]
+"""
+import argparse
+import asyncio
+import importlib.util
+import logging
+import sys
+import time
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "benchmarks"))
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from app.application.fast_json import render_json  # noqa: E402
+from app.application.transformer_service import TenderTransformer  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.dependencies import get_response_encoder, get_search_cache, get_solr_repository  # noqa: E402
+from app.domain.schemas import SearchProfile  # noqa: E402
+from bench_search_profiles import solr_docs  # noqa: E402
+from bench_search_serialization import StubRepository  # noqa: E402
+
+STATUS_CODES = [5, 6, 7, 8]
+
+
+def best_ms(fn, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def mean_ms(client: httpx.AsyncClient, params, headers, total: int) -> float:
+    started = time.perf_counter()
+    for _ in range(total):
+        response = await client.get("/search", params=params, headers=headers)
+        assert response.status_code in (200, 304), response.status_code
+    return (time.perf_counter() - started) * 1000 / total
+
+
+async def main_async() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    docs = solr_docs(args.size)
+    body = render_json({
+        "query": "servicio", "status_codes": STATUS_CODES, "page": 1, "size": args.size, "total": 12345, "totalPages": 124,
+        "items": [TenderTransformer.solr_doc_to_profile_item(doc, SearchProfile.full) for doc in docs],
+    })
+
+    codings = [(f"gzip -{level}", lambda level=level: zlib.compress(body, level, wbits=31)) for level in (1, 6, 9)]
+    if importlib.util.find_spec("brotli") is not None:
+        import brotli
+
+        codings += [(f"br q{quality}", lambda quality=quality: brotli.compress(body, quality=quality)) for quality in (1, 4, 6, 11)]
+    print(f"/search body with {len(docs)} full items: {len(body) / 1024:.1f} KB")
+    header = f"{'coding':<10}{'KB':>8}{'ratio':>8}{'ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, compress in codings:
+        size = len(compress())
+        print(f"{name:<10}{size / 1024:>8.1f}{size / len(body):>8.3f}{best_ms(compress):>8.2f}")
+
+    stub = StubRepository(docs)
+    main.app.dependency_overrides[get_solr_repository] = lambda: stub
+    main.app.dependency_overrides[get_search_cache] = lambda: None
+    encoder = get_response_encoder()
+    params = {"search_term": "servicio", "status_codes": STATUS_CODES, "size": args.size}
+
+    print()
+    header = f"{'request':<22}{'KB sent':>9}{'mean ms':>9}"
+    print(header)
+    print("-" * len(header))
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"X-ADMIN-TOKEN": settings.admin_token}
+    ) as client:
+        for coding in ("identity", *(encoding for encoding in encoder.encodings if encoder.compression)):
+            headers = {"Accept-Encoding": coding}
+            async with client.stream("GET", "/search", params=params, headers=headers) as response:
+                sent = len(b"".join([chunk async for chunk in response.aiter_raw()]))
+                etag = response.headers.get("etag")
+            print(f"{'200 ' + coding:<22}{sent / 1024:>9.1f}{await mean_ms(client, params, headers, args.requests):>9.2f}")
+            if etag:
+                revalidate = {**headers, "If-None-Match": etag}
+                print(f"{'304 ' + coding:<22}{0:>9.1f}{await mean_ms(client, params, revalidate, args.requests):>9.2f}")
+    print(f"\nencoder: {encoder.snapshot()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
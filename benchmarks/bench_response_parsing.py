@@ -0,0 +1,90 @@
+"""
+Benchmark: parsing Mercado Público list responses.
+
+Compares the previous path (json.loads + Model(**data)) with the bytes fast
+path used by MercadoPublicoClient (TypeAdapter.validate_json) on the
+checked-in `licitaciones_list *.json` fixtures. Reports the best-of-N parse
+time and the peak allocation (tracemalloc) of each path.
+
+Usage:
+    python benchmarks/bench_response_parsing.py [--repeat 20]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.domain.schemas import LicitacionListResponse  # noqa: E402
+
+LIST_ADAPTER = TypeAdapter(LicitacionListResponse)
+
+
+def two_pass(raw: bytes) -> LicitacionListResponse:
+    return LicitacionListResponse(**json.loads(raw))
+
+
+def fast_path(raw: bytes) -> LicitacionListResponse:
+    return LIST_ADAPTER.validate_json(raw)
+
+
+def best_time_ms(fn, raw: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(raw)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def peak_alloc_kb(fn, raw: bytes) -> float:
+    tracemalloc.start()
+    result = fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    fixtures = sorted(ROOT.glob("licitaciones_list *.json"))
+    header = f"{'fixture':<36}{'KB':>8}{'items':>7}{'2-pass ms':>11}{'fast ms':>9}{'speedup':>9}{'2-pass KB':>11}{'fast KB':>9}"
+    print(header)
+    print("-" * len(header))
+
+    totals = {"two_pass": 0.0, "fast": 0.0}
+    for path in fixtures:
+        raw = path.read_bytes()
+        # Both paths must produce the same models
+        expected = two_pass(raw)
+        assert fast_path(raw) == expected, f"fast path differs on {path.name}"
+
+        slow_ms = best_time_ms(two_pass, raw, args.repeat)
+        fast_ms = best_time_ms(fast_path, raw, args.repeat)
+        totals["two_pass"] += slow_ms
+        totals["fast"] += fast_ms
+        print(
+            f"{path.name:<36}{len(raw) / 1024:>8.0f}{len(expected.listado):>7}"
+            f"{slow_ms:>11.2f}{fast_ms:>9.2f}{slow_ms / fast_ms:>8.2f}x"
+            f"{peak_alloc_kb(two_pass, raw):>11.0f}{peak_alloc_kb(fast_path, raw):>9.0f}"
+        )
+
+    print("-" * len(header))
+    print(
+        f"{'total':<51}{totals['two_pass']:>11.2f}{totals['fast']:>9.2f}"
+        f"{totals['two_pass'] / totals['fast']:>8.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: /search projection profiles.
+
+For each profile ("list", "card", "full") and for the previous `fl=*,score`
+request, measures on one page of results:
+
+- Solr bytes: the page's documents restricted to the requested `fl`, as JSON
+  (what Solr sends back for them);
+- API bytes: the /search items as FastAPI renders them;
+- map ms / render ms: best-of-N time to build the DTOs and to serialize them.
+
+Documents are built from the checked-in fixtures: ids, titles, status codes and
+closing dates from the `licitaciones_list *.json` listings, the remaining
+stored fields from the `licitacion 2732-49-LE25.json` detail.
+
+Usage:
+    python benchmarks/bench_search_profiles.py [--size 100] [--repeat 50]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.application.transformer_service import TenderTransformer  # noqa: E402
+from app.domain.schemas import LicitacionDetailResponse, SearchProfile  # noqa: E402
+
+
+def solr_docs(size: int) -> List[Dict[str, Any]]:
+    """Stored Solr documents (as `fl=*` returns them) shaped from the fixtures."""
+    detail = LicitacionDetailResponse(**json.loads((ROOT / "licitacion 2732-49-LE25.json").read_bytes()))
+    template = TenderTransformer.to_index_doc(detail.listado[0]).model_dump(mode="json")
+    template["publish_date"] = f"{template['publish_date'][:19]}Z"
+    template["_version_"] = 1820000000000000000
+
+    docs = []
+    for path in sorted(ROOT.glob("licitaciones_list *.json")):
+        for item in json.loads(path.read_bytes())["Listado"]:
+            closing = item.get("FechaCierre")
+            docs.append({
+                **template,
+                "id": item["CodigoExterno"],
+                "title": item["Nombre"],
+                "status_code": item["CodigoEstado"],
+                "closing_date": f"{closing[:19]}Z" if closing else None,
+                "url": template["url"].replace("2732-49-LE25", item["CodigoExterno"]),
+                "listing_fingerprint": "0" * 40,
+                "detail_fingerprint": "f" * 40,
+                "score": 3.21,
+            })
+            if len(docs) == size:
+                return docs
+    return docs
+
+
+def project(doc: Dict[str, Any], fl: str) -> Dict[str, Any]:
+    if fl == "*,score":
+        return doc
+    return {name: doc[name] for name in fl.split(",") if doc.get(name) is not None}
+
+
+def render(items) -> bytes:
+    return JSONResponse(content=jsonable_encoder(items)).body
+
+
+def best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100, help="results per page")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    docs = solr_docs(args.size)
+    # The old request fetched every stored field and mapped them to TenderSummaryDTO
+    cases = [("*,score", "*,score", SearchProfile.full)] + [
+        (profile.value, TenderTransformer.profile_fl(profile), profile) for profile in SearchProfile
+    ]
+
+    header = f"{'fl / profile':<14}{'solr KB':>9}{'api KB':>9}{'B/item':>8}{'map ms':>9}{'render ms':>11}"
+    print(f"{len(docs)} results per page, best of {args.repeat}")
+    print(header)
+    print("-" * len(header))
+    for name, fl, profile in cases:
+        page = [project(doc, fl) for doc in docs]
+        solr_bytes = len(json.dumps({"response": {"docs": page}}, ensure_ascii=False).encode("utf-8"))
+
+        def map_page(page=page, profile=profile):
+            return [TenderTransformer.solr_doc_to_profile_dto(doc, profile) for doc in page]
+
+        items = map_page()
+        body = render(items)
+        map_ms = best_ms(map_page, args.repeat)
+        render_ms = best_ms(lambda: render(items), args.repeat)
+        print(
+            f"{name:<14}{solr_bytes / 1024:>9.1f}{len(body) / 1024:>9.1f}{len(body) / len(docs):>8.0f}"
+            f"{map_ms:>9.2f}{render_ms:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark: /search serialization, DTO path vs. fast path, in requests per core.
+
+- "dto": the previous path. One Pydantic DTO per hit, then FastAPI's
+  jsonable_encoder + JSONResponse over the whole payload;
+- "fast": TenderTransformer.solr_doc_to_profile_item + render_json, the
+  pre-rendered body /search returns now.
+
+Two measurements per profile, on pages of `--size` documents shaped from the
+checked-in fixtures (see bench_search_profiles.py):
+
+- serialize: CPU time to map and render one page, as requests/s per core;
+- end-to-end: sequential in-process requests (ASGI transport, auth and CORS
+  middleware included) to /search and to an equivalent route that returns the
+  DTO payload, with a stub repository (no Solr) and the search cache disabled,
+  as requests/s per core (process CPU time).
+
+Usage:
+    python benchmarks/bench_search_serialization.py [--size 100] [--requests 500]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from math import ceil
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "benchmarks"))
+
+import httpx  # noqa: E402
+from fastapi import Depends, Query  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+import main  # noqa: E402
+from app.application.fast_json import render_json  # noqa: E402
+from app.application.transformer_service import TenderTransformer  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.dependencies import get_search_cache, get_solr_repository, require_admin_token  # noqa: E402
+from app.domain.schemas import SearchProfile  # noqa: E402
+from bench_search_profiles import project, solr_docs  # noqa: E402
+
+STATUS_CODES = [5, 6, 7, 8]
+
+
+class StubRepository:
+    """Answers every search with the same page of documents, projected to the requested fl."""
+
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.pages = {
+            TenderTransformer.profile_fl(profile): [project(doc, TenderTransformer.profile_fl(profile)) for doc in docs]
+            for profile in SearchProfile
+        }
+
+    async def search(self, query: str, page: int = 1, size: int = 20, status_codes=None, **kwargs) -> Dict[str, Any]:
+        return {"docs": self.pages[kwargs["fl"]], "total": 12345, "query": query, "status_codes": status_codes}
+
+
+def add_dto_route(stub: StubRepository) -> None:
+    """The previous /search (search cache disabled): the DTO payload, serialized by FastAPI."""
+
+    async def search_dto(
+        search_term: str = Query(...),
+        status_codes: List[int] = Query(...),
+        page: int = 1,
+        size: int = 20,
+        profile: SearchProfile = SearchProfile.full,
+    ):
+        raw_result = await stub.search(search_term, page, size, status_codes, fl=TenderTransformer.profile_fl(profile))
+        dtos = [TenderTransformer.solr_doc_to_profile_dto(doc, profile) for doc in raw_result["docs"]]
+        total = raw_result["total"]
+        return {
+            "query": raw_result["query"],
+            "status_codes": raw_result["status_codes"],
+            "page": page,
+            "size": size,
+            "total": total,
+            "totalPages": ceil(total / size),
+            "items": dtos,
+        }
+
+    main.app.add_api_route("/bench/search-dto", search_dto, methods=["GET"], dependencies=[Depends(require_admin_token)])
+
+
+def per_core(fn, repeat: int) -> float:
+    """Calls per second of CPU time."""
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return repeat / (time.process_time() - started)
+
+
+async def requests_per_core(client: httpx.AsyncClient, path: str, params: Dict[str, Any], total: int) -> float:
+    for _ in range(20):
+        (await client.get(path, params=params)).raise_for_status()
+    started = time.process_time()
+    for _ in range(total):
+        (await client.get(path, params=params)).raise_for_status()
+    return total / (time.process_time() - started)
+
+
+async def main_async() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    # Per-request log lines would dominate the measurement
+    logging.disable(logging.INFO)
+
+    docs = solr_docs(args.size)
+    stub = StubRepository(docs)
+    main.app.dependency_overrides[get_solr_repository] = lambda: stub
+    main.app.dependency_overrides[get_search_cache] = lambda: None
+    add_dto_route(stub)
+
+    envelope = {"query": "servicio", "status_codes": STATUS_CODES, "page": 1, "size": args.size, "total": 12345, "totalPages": 124}
+    header = f"{'profile':<8}{'path':<6}{'serialize req/s':>17}{'end-to-end req/s':>18}"
+    print(f"{len(docs)} docs per page, requests/s per core")
+    print(header)
+    print("-" * len(header))
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"X-ADMIN-TOKEN": settings.admin_token}
+    ) as client:
+        for profile in SearchProfile:
+            page = stub.pages[TenderTransformer.profile_fl(profile)]
+            params = {"search_term": "servicio", "status_codes": STATUS_CODES, "size": args.size, "profile": profile.value}
+
+            dto_body = JSONResponse(content=jsonable_encoder(
+                {**envelope, "items": [TenderTransformer.solr_doc_to_profile_dto(doc, profile) for doc in page]}
+            )).body
+            fast_body = render_json(
+                {**envelope, "items": [TenderTransformer.solr_doc_to_profile_item(doc, profile) for doc in page]}
+            )
+            assert dto_body == fast_body, f"{profile.value}: bodies differ"
+            dto_response = await client.get("/bench/search-dto", params=params)
+            fast_response = await client.get("/search", params=params)
+            assert dto_response.content == fast_response.content, f"{profile.value}: responses differ"
+
+            rows = (
+                ("dto", "/bench/search-dto", lambda: JSONResponse(content=jsonable_encoder(
+                    {**envelope, "items": [TenderTransformer.solr_doc_to_profile_dto(doc, profile) for doc in page]}
+                )).body),
+                ("fast", "/search", lambda: render_json(
+                    {**envelope, "items": [TenderTransformer.solr_doc_to_profile_item(doc, profile) for doc in page]}
+                )),
+            )
+            for name, path, serialize in rows:
+                serialize_rate = per_core(serialize, max(20, args.requests // 5))
+                end_to_end_rate = await requests_per_core(client, path, params, args.requests)
+                print(f"{profile.value:<8}{name:<6}{serialize_rate:>17.0f}{end_to_end_rate:>18.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
@@ -0,0 +1,101 @@
+"""
+Load comparison: pysolr repository (threadpool) vs AsyncSolrTenderRepository.
+
+Fires the same search / get_by_id mix at the Solr core configured in .env with
+a given number of concurrent callers, through `call_repository` exactly like
+the API routes do, and reports throughput and latency percentiles.
+Needs a reachable Solr core with indexed tenders.
+
+Usage:
+    python benchmarks/bench_solr_repository.py [--concurrency 50] [--requests 1000] [--query agua]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.application.repository_calls import call_repository  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.infrastructure.http_pool import SharedHttpClient  # noqa: E402
+from app.infrastructure.solr.async_repository import AsyncSolrTenderRepository  # noqa: E402
+from app.infrastructure.solr.repository import SolrTenderRepository  # noqa: E402
+
+STATUS_CODES = [5, 6, 7, 8]
+
+
+def _repo_kwargs():
+    return {
+        "base_url": settings.solr_base_url,
+        "core": settings.solr_core,
+        "username": settings.solr_username,
+        "password": settings.solr_password,
+        "timeout": settings.solr_timeout_s,
+    }
+
+
+async def run_load(repo, query: str, ids, concurrency: int, total: int):
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                if ids and i % 4 == 3:
+                    await call_repository(repo.get_by_id, ids[i % len(ids)])
+                else:
+                    await call_repository(repo.search, query=query, page=1 + i % 5, size=20, status_codes=STATUS_CODES)
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "req_per_s": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--query", default="agua")
+    args = parser.parse_args()
+
+    sync_repo = SolrTenderRepository(**_repo_kwargs())
+    pool = SharedHttpClient(
+        "Solr",
+        timeout=settings.solr_timeout_s,
+        max_connections=settings.solr_http_max_connections,
+        max_keepalive_connections=settings.solr_http_max_keepalive,
+    )
+    async_repo = AsyncSolrTenderRepository(**_repo_kwargs(), http_pool=pool)
+
+    sample = await call_repository(async_repo.search, query=args.query, size=20, status_codes=STATUS_CODES)
+    ids = [doc["id"] for doc in sample["docs"]]
+
+    try:
+        for name, repo in (("pysolr+threadpool", sync_repo), ("async", async_repo)):
+            # Warm-up so connection setup is not part of the measurement
+            await run_load(repo, args.query, ids, args.concurrency, args.concurrency)
+            result = await run_load(repo, args.query, ids, args.concurrency, args.requests)
+            print(f"{name:<20} {result}")
+        print(f"async pool: {pool.snapshot()}")
+    finally:
+        await pool.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark: in-memory tender state for full-core diffs.
+
+Compares the dict-of-dicts map (id -> Solr min-fields document) with the
+compact TenderStateIndex used for Solr snapshots. For each size it builds both
+structures from the same synthetic documents and reports:
+
+- the memory they retain (tracemalloc, measured in a separate pass);
+- the build time from the document stream, parsing included, as snapshot
+  pages arrive (without tracemalloc, which slows allocation-heavy code);
+- the time of the full diff (new / changed / missing ids) against a listing
+  that adds, changes and drops 5% of the tenders.
+
+The "no fp" rows hold documents indexed before fingerprints existed (right
+after deploying them): titles are then kept for the diff.
+
+Usage:
+    python benchmarks/bench_state_index.py [--sizes 100000,1000000]
+"""
+import argparse
+import gc
+import hashlib
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.domain.state_index import TenderStateIndex  # noqa: E402
+
+STATUS_CODES = (5, 6, 7, 8, 18, 19)
+
+
+def _fingerprint(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+
+def synthetic_docs(count: int, offset: int = 0, changed_every: int = 0, fingerprints: bool = True) -> Iterator[Dict[str, Any]]:
+    """Solr min-fields documents shaped like the ones the snapshot reads."""
+    for i in range(offset, offset + count):
+        version = "v2" if changed_every and i % changed_every == 0 else "v1"
+        doc = {
+            "id": f"{1000000 + i}-{i % 97}-LE25",
+            "status_code": STATUS_CODES[i % len(STATUS_CODES)],
+            "closing_date": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T15:00:00Z",
+            "title": f"Adquisición de insumos y servicios para la unidad {i}",
+        }
+        if fingerprints:
+            doc["listing_fingerprint"] = _fingerprint(f"{i}-{version}")
+            doc["detail_fingerprint"] = _fingerprint(f"detail-{i}")
+        yield doc
+
+
+def build_dict(docs) -> Dict[str, Dict[str, Any]]:
+    return {doc["id"]: doc for doc in docs}
+
+
+def build_index(docs) -> TenderStateIndex:
+    return TenderStateIndex.from_docs(docs)
+
+
+def measure_memory(builder, docs_factory) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = builder(docs_factory())
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained
+
+
+def measure_build(builder, docs_factory):
+    gc.collect()
+    started = time.perf_counter()
+    result = builder(docs_factory())
+    return result, time.perf_counter() - started
+
+
+def dict_diff(incoming: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]):
+    new, changed = [], []
+    for doc_id, doc in incoming.items():
+        stored = current.get(doc_id)
+        if stored is None:
+            new.append(doc_id)
+        elif doc["listing_fingerprint"] != stored["listing_fingerprint"]:
+            changed.append(doc_id)
+    missing = [doc_id for doc_id in current if doc_id not in incoming]
+    return new, changed, missing
+
+
+def index_diff(incoming: TenderStateIndex, current: TenderStateIndex):
+    new, changed, _ = incoming.diff(current)
+    return new, changed, incoming.missing_ids(current)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100000,1000000")
+    args = parser.parse_args()
+
+    header = f"{'tenders':>9}  {'structure':<14}{'MB':>9}{'B/tender':>10}{'build s':>9}{'diff s':>8}"
+    print(header)
+    print("-" * len(header))
+    for size in (int(s) for s in args.sizes.split(",")):
+        churn = max(1, size // 20)
+
+        def current_docs(n=size):
+            return synthetic_docs(n)
+
+        def legacy_docs(n=size):
+            return synthetic_docs(n, fingerprints=False)
+
+        def incoming_docs(n=size, c=churn):
+            # Drops the first `c` tenders, adds `c` new ones and changes every 20th
+            return synthetic_docs(n, offset=c, changed_every=20)
+
+        results = {}
+        for name, builder, diff in (("dict", build_dict, dict_diff), ("index", build_index, index_diff)):
+            retained = measure_memory(builder, current_docs)
+            current, build_s = measure_build(builder, current_docs)
+            incoming = builder(incoming_docs())
+            started = time.perf_counter()
+            new, changed, missing = diff(incoming, current)
+            diff_s = time.perf_counter() - started
+            results[name] = (len(new), len(changed), len(missing))
+            print(
+                f"{size:>9}  {name:<14}{retained / 2 ** 20:>9.1f}{retained / size:>10.0f}"
+                f"{build_s:>9.2f}{diff_s:>8.3f}"
+            )
+            del current, incoming
+
+        for name, builder in (("dict (no fp)", build_dict), ("index (no fp)", build_index)):
+            retained = measure_memory(builder, legacy_docs)
+            current, build_s = measure_build(builder, legacy_docs)
+            del current
+            print(f"{size:>9}  {name:<14}{retained / 2 ** 20:>9.1f}{retained / size:>10.0f}{build_s:>9.2f}{'-':>8}")
+
+        # Both structures must find the same changes
+        assert results["dict"] == results["index"], results
+        print(f"{'':>9}  new/changed/missing: {results['index']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: in-process /suggest index.
+
+Builds the SuggestIndex for synthetic cores of the given sizes (titles mixed
+from the words of the `licitaciones_list *.json` fixtures, a few thousand
+entities and categories) and reports the memory it retains (tracemalloc),
+the full build time, the time of an incremental refresh after a run that
+changes 1% of the tenders, and query latency percentiles over type-ahead
+prefixes of 1 to 12 characters.
+
+Usage:
+    python benchmarks/bench_suggest.py [--sizes 10000,100000] [--queries 2000]
+"""
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from app.domain.suggest_index import SuggestIndex  # noqa: E402
+
+
+def fixture_titles() -> List[str]:
+    titles = []
+    for path in sorted(ROOT.glob("licitaciones_list *.json")):
+        titles.extend(item["Nombre"] for item in json.loads(path.read_bytes())["Listado"])
+    return titles
+
+
+def synthetic_docs(count: int, titles: List[str], rng: random.Random) -> List[Dict[str, Any]]:
+    words = " ".join(titles).split()
+    return [
+        {
+            "id": f"{1000000 + i}-{i % 97}-LE25",
+            # Real leading words plus a random tail, so most titles are distinct
+            "title": " ".join(rng.choice(titles).split()[:4] + rng.sample(words, 4)),
+            "entity": f"MUNICIPALIDAD DE {rng.choice(words).upper()} {i % 2000}",
+            "category": f"Servicios / {rng.choice(words)} / {i % 500}",
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    titles = fixture_titles()
+    header = (
+        f"{'tenders':>8}{'MB':>8}{'build s':>9}{'refresh s':>11}"
+        f"{'p50 us':>9}{'p99 us':>9}{'max us':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for size in (int(s) for s in args.sizes.split(",")):
+        docs = synthetic_docs(size, titles, rng)
+
+        started = time.perf_counter()
+        index = SuggestIndex()
+        index.apply(docs)
+        index.rebuild()
+        build_s = time.perf_counter() - started
+
+        # Built again under tracemalloc, which slows it down, for the retained memory
+        del index
+        gc.collect()
+        tracemalloc.start()
+        index = SuggestIndex()
+        index.apply(docs)
+        index.rebuild()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # An ingestion run renaming 1% of the tenders
+        changes = [{"id": doc["id"], "title": {"set": f"{doc['title']} (rectificada)"}} for doc in rng.sample(docs, max(1, size // 100))]
+        started = time.perf_counter()
+        index.apply(changes)
+        index.rebuild()
+        refresh_s = time.perf_counter() - started
+
+        prefixes = []
+        for _ in range(args.queries):
+            source = rng.choice(docs)[rng.choice(("title", "title", "entity", "category"))]
+            words = source.split()
+            start = " ".join(words[rng.randrange(len(words)):])
+            prefixes.append(start[:rng.randint(1, 12)])
+        latencies = []
+        for prefix in prefixes:
+            started = time.perf_counter()
+            index.suggest(prefix, limit=10)
+            latencies.append((time.perf_counter() - started) * 1e6)
+        latencies.sort()
+        print(
+            f"{size:>8}{retained / 2 ** 20:>8.1f}{build_s:>9.2f}{refresh_s:>11.2f}"
+            f"{statistics.median(latencies):>9.0f}{latencies[int(len(latencies) * 0.99) - 1]:>9.0f}{latencies[-1]:>9.0f}"
+        )
+        del index, docs
+
+
+if __name__ == "__main__":
+    main()
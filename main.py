@@ -1,11 +1,29 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import router as api_router
 from app.api.mercadopublico import router as mp_real_router
 from app.api.admin import router as admin_router
 from app.config import logger
+from app.dependencies import get_mp_http_pool, get_solr_http_pool, get_suggester
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled HTTP clients (Mercado Público, async Solr) live for the whole application lifetime
+    # The /suggest index loads in the background; /suggest answers 503 until it is ready
+    suggester = get_suggester()
+    suggest_load = asyncio.create_task(suggester.load()) if suggester is not None else None
+    yield
+    if suggest_load is not None:
+        suggest_load.cancel()
+    await get_mp_http_pool().aclose()
+    await get_solr_http_pool().aclose()
+
 
-app = FastAPI(title="Mercado Público Search API")
+app = FastAPI(title="Mercado Público Search API", lifespan=lifespan)
 
 # 1. Define los orígenes permitidos
 origins = [
@@ -0,0 +1,21 @@
+import asyncio
+
+from app.dependencies import get_active_ingestion_service, get_mp_http_pool, get_solr_http_pool
+
+
+async def main():
+    """
+    Rebuilds the local ingestion state store (STATE_STORE_PATH) from Solr.
+    Same operation as POST /admin/state/reconcile.
+    """
+    service = get_active_ingestion_service()
+    try:
+        result = await service.reconcile_state_store()
+        print(f"Reconcile finished: {result}")
+    finally:
+        await get_mp_http_pool().aclose()
+        await get_solr_http_pool().aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Check of the delta sync change detection with detail re-fetch.
+
+Indexes tenders from the checked-in listing and detail fixtures against an
+in-memory Solr stand-in, then changes listing fields (title, status, closing
+date) of some tenders and of the detail the API returns for them, plus the
+description of another one, and re-runs the sync with `refetch_on_change`:
+
+- listing-only changes must go through `atomic_update_many`;
+- a changed description must be fully re-indexed through `upsert_many`.
+
+Usage:
+    python verify_change_detection.py
+"""
+import asyncio
+import copy
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.application.active_ingestion_service import TenderIngestionService
+from app.domain.schemas import LicitacionDetailResponse, LicitacionListResponse
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).parent
+
+
+class FixtureClient:
+    """Mercado Público stand-in: a fixture listing, details consistent with it."""
+
+    def __init__(self, size: int = 20):
+        self.listing = json.loads((ROOT / "licitaciones_list publicada.json").read_bytes())
+        self.listing["Listado"] = self.listing["Listado"][:size]
+        self.detail = json.loads((ROOT / "licitacion 2732-49-LE25.json").read_bytes())
+        self.descriptions: Dict[str, str] = {}
+
+    async def iter_by_status(self, status: str):
+        for item in LicitacionListResponse(**self.listing).listado:
+            yield item
+
+    async def get_by_code(self, code: str, refresh: bool = False) -> LicitacionDetailResponse:
+        item = next(item for item in self.listing["Listado"] if item["CodigoExterno"] == code)
+        detail = copy.deepcopy(self.detail)
+        tender = detail["Listado"][0]
+        tender.update(CodigoExterno=code, Nombre=item["Nombre"], CodigoEstado=item["CodigoEstado"])
+        tender["Fechas"]["FechaCierre"] = item["FechaCierre"]
+        if code in self.descriptions:
+            tender["Descripcion"] = self.descriptions[code]
+        return LicitacionDetailResponse(**detail)
+
+
+class MemoryRepository:
+    """Solr stand-in that records which write path every id went through."""
+
+    MIN_FIELDS = ("id", "status_code", "closing_date", "title", "listing_fingerprint", "detail_fingerprint")
+
+    def __init__(self):
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.upserted: List[str] = []
+        self.updated: List[str] = []
+
+    def upsert_many(self, docs: List[Dict[str, Any]], commit_policy=None) -> None:
+        for doc in docs:
+            self.docs[doc["id"]] = dict(doc)
+            self.upserted.append(doc["id"])
+
+    def atomic_update_many(self, partials: List[Dict[str, Any]], commit_policy=None) -> None:
+        for partial in partials:
+            for field, value in partial.items():
+                if field != "id":
+                    self.docs[partial["id"]][field] = value["set"]
+            self.updated.append(partial["id"])
+
+    def fetch_min_fields_by_ids(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {
+            doc_id: {field: self.docs[doc_id][field] for field in self.MIN_FIELDS if field in self.docs[doc_id]}
+            for doc_id in ids if doc_id in self.docs
+        }
+
+
+async def verify_change_detection() -> bool:
+    client, repo = FixtureClient(), MemoryRepository()
+    service = TenderIngestionService(client, repo, fetch_concurrency=4, refetch_on_change=True)
+    await service.ingest_by_status_delta("publicada")
+
+    items = client.listing["Listado"]
+    listing_only = [item["CodigoExterno"] for item in items[:3]]
+    items[0]["Nombre"] = f"{items[0]['Nombre']} (rectificada)"
+    items[1]["CodigoEstado"] = 6
+    items[2]["FechaCierre"] = "2030-01-01T10:00:00"
+    detail_changed = items[3]["CodigoExterno"]
+    items[3]["Nombre"] = f"{items[3]['Nombre']} (rectificada)"
+    client.descriptions[detail_changed] = "Nueva descripción"
+
+    repo.upserted, repo.updated = [], []
+    stats = await service.ingest_by_status_delta("publicada")
+
+    ok = True
+    if sorted(repo.updated) != sorted(listing_only):
+        ok = False
+        logger.error(f"❌ Atomic updates {repo.updated}, expected {listing_only}")
+    if repo.upserted != [detail_changed]:
+        ok = False
+        logger.error(f"❌ Full re-indexes {repo.upserted}, expected {[detail_changed]}")
+    if stats.get("reindexed_changed") != 1 or stats["updated_count"] != 4:
+        ok = False
+        logger.error(f"❌ Unexpected run stats: {stats}")
+    if repo.docs[listing_only[1]]["status_code"] != 6 or repo.docs[detail_changed]["description"] != "Nueva descripción":
+        ok = False
+        logger.error("❌ Indexed documents do not reflect the changes")
+    if ok:
+        logger.info(
+            f"✅ {len(listing_only)} listing-only changes went through atomic updates, "
+            f"1 detail change was fully re-indexed"
+        )
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(verify_change_detection()) else 1)
@@ -0,0 +1,77 @@
+"""
+Check of the shared HTTP pool counters when requests fail.
+
+Sends requests through a SharedHttpClient whose transport answers some of
+them, fails others with a connection error and keeps one pending until it
+is cancelled:
+
+- pending requests must show up as in flight;
+- once every request is answered, failed or cancelled, nothing is left in
+  flight and the transport errors are counted.
+
+Usage:
+    python verify_http_pool.py
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+import httpx
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.infrastructure.http_pool import SharedHttpClient
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FlakyTransport(httpx.AsyncBaseTransport):
+    """Answers /ok, fails /fail with a connection error and blocks on /hang."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/fail":
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path == "/hang":
+            await asyncio.Event().wait()
+        return httpx.Response(200, content=b"ok")
+
+
+async def verify_http_pool() -> bool:
+    pool = SharedHttpClient("Test", transport=FlakyTransport())
+    client = pool.client
+
+    hanging = asyncio.create_task(client.get("http://upstream.test/hang"))
+    await asyncio.sleep(0)
+    pending = pool.snapshot()["in_flight"]
+
+    results = await asyncio.gather(
+        *(client.get(f"http://upstream.test/{path}") for path in ("ok", "fail", "ok", "fail", "fail")),
+        return_exceptions=True,
+    )
+    hanging.cancel()
+    await asyncio.gather(hanging, return_exceptions=True)
+    stats = pool.snapshot()
+    await pool.aclose()
+
+    ok = True
+    if pending != 1:
+        ok = False
+        logger.error(f"❌ {pending} requests in flight while one was pending, expected 1")
+    failures = sum(isinstance(result, httpx.ConnectError) for result in results)
+    if stats["in_flight"] != 0:
+        ok = False
+        logger.error(f"❌ {stats['in_flight']} requests still in flight after {failures} transport errors")
+    if (stats["requests"], stats["responses"], stats["errors"]) != (6, 2, 3):
+        ok = False
+        logger.error(f"❌ Unexpected counters: {stats}")
+    if ok:
+        logger.info(f"✅ {failures} transport errors and 1 cancellation counted, nothing left in flight")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(verify_http_pool()) else 1)
@@ -0,0 +1,85 @@
+"""
+Check of the daily ingestion when it resumes interrupted runs under the
+`end` commit policy.
+
+Every listed tender is indexed first, so no status has work of its own left.
+Then a checkpoint journal is left as a run that crashed after Solr accepted
+all of its batches but before its final commit, and the daily sequence runs:
+
+- sequential: the resumed status writes nothing itself, yet the single end
+  commit of the sequence must still be issued;
+- consolidated: the resumed run must report every status as ok and commit.
+
+Usage:
+    python verify_ingestion_resume.py
+"""
+import asyncio
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.application.active_ingestion_service import TenderIngestionService
+from app.application.daily_ingestion_runner import DailyIngestionRunner
+from app.domain.schemas import CommitPolicy
+from app.infrastructure.checkpoint.journal import CheckpointJournal
+from verify_change_detection import FixtureClient, MemoryRepository
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CommitCountingRepository(MemoryRepository):
+    def __init__(self):
+        super().__init__()
+        self.commits = 0
+
+    def commit(self, soft: bool = False) -> None:
+        self.commits += 1
+
+
+async def interrupted_daily_run(consolidated: bool) -> bool:
+    client, repo = FixtureClient(), CommitCountingRepository()
+    journal = CheckpointJournal(tempfile.mkdtemp())
+    service = TenderIngestionService(client, repo, fetch_concurrency=4, journal=journal)
+    await service.ingest_by_status_delta("publicada", resume=False)
+    repo.commits = 0
+
+    # A crashed run: plan and batches journaled, no finish record, no commit
+    statuses = [status.value for status in DailyIngestionRunner.STATUS_ORDER]
+    scope = f"consolidated:{','.join(statuses)}" if consolidated else f"status:{statuses[0]}"
+    ids = [item["CodigoExterno"] for item in client.listing["Listado"]]
+    run_id = journal.start(scope, ids, [])
+    journal.record_batch(run_id, "new", ids)
+
+    runner = DailyIngestionRunner(service, consolidated=consolidated)
+    summary = await runner.run_daily_sequence(commit_policy=CommitPolicy.end)
+    mode = summary["mode"]
+
+    ok = True
+    if repo.commits != 1:
+        ok = False
+        logger.error(f"❌ {mode}: {repo.commits} commits after resuming, expected 1")
+    failed = [run["estado"] for run in summary["runs"] if not run["ok"]]
+    if summary["status"] != "ok" or failed:
+        ok = False
+        logger.error(f"❌ {mode}: status {summary['status']}, failed statuses {failed}")
+    if journal.list_resumable():
+        ok = False
+        logger.error(f"❌ {mode}: the interrupted run is still resumable")
+    if ok:
+        logger.info(f"✅ {mode}: resumed run committed once, every status ok")
+    return ok
+
+
+async def verify_ingestion_resume() -> bool:
+    results = [await interrupted_daily_run(consolidated) for consolidated in (False, True)]
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(verify_ingestion_resume()) else 1)
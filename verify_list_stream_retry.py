@@ -0,0 +1,94 @@
+"""
+Check of the streamed status listing when the response body fails mid-way.
+
+Serves the checked-in listing fixture through a mock transport whose first
+response breaks after part of the body, then sends it whole:
+
+- truncated: the body just ends before the `Listado` array is closed;
+- read error: the connection drops while the body is being read.
+
+In both cases the listing must be retried, every code yielded exactly once,
+and the failed attempt reported to the rate limiter as an error.
+
+Usage:
+    python verify_list_stream_retry.py
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+import httpx
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.infrastructure.mercadopublico.client import MercadoPublicoClient
+from app.infrastructure.mercadopublico.rate_limiter import AdaptiveRateLimiter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).parent
+LISTING = (ROOT / "licitaciones_list publicada.json").read_bytes()
+
+
+class BrokenStream(httpx.AsyncByteStream):
+    """Sends the first half of the listing, then ends it or drops the connection."""
+
+    def __init__(self, raise_error: bool):
+        self.raise_error = raise_error
+
+    async def __aiter__(self):
+        yield LISTING[: len(LISTING) // 2]
+        if self.raise_error:
+            raise httpx.ReadError("connection reset by peer")
+
+
+async def interrupted_listing(raise_error: bool) -> bool:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return httpx.Response(200, stream=BrokenStream(raise_error))
+        return httpx.Response(200, content=LISTING)
+
+    limiter = AdaptiveRateLimiter(initial_rate=100.0)
+    client = MercadoPublicoClient(
+        "ticket",
+        "https://api.example.test",
+        rate_limiter=limiter,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    client.STREAM_WAIT_MIN_S = client.STREAM_WAIT_MAX_S = 0.0
+    codes = [item.codigo_externo async for item in client.iter_by_status("publicada")]
+    await client.client.aclose()
+
+    name = "read error" if raise_error else "truncated"
+    expected = LISTING.count(b'"CodigoExterno"')
+    stats = limiter.snapshot()
+    ok = True
+    if calls != 2:
+        ok = False
+        logger.error(f"❌ {name}: {calls} requests, expected 2")
+    if len(codes) != expected or len(set(codes)) != len(codes):
+        ok = False
+        logger.error(f"❌ {name}: {len(codes)} items ({len(set(codes))} distinct), expected {expected}")
+    if stats["errors"] != 1 or stats["successes"] != 1 or stats["in_flight"] != 0:
+        ok = False
+        logger.error(f"❌ {name}: rate limiter not told about the failed attempt: {stats}")
+    if ok:
+        logger.info(f"✅ {name}: listing retried, {len(codes)} items yielded once, failure reported to the limiter")
+    return ok
+
+
+async def verify_list_stream_retry() -> bool:
+    results = [await interrupted_listing(raise_error) for raise_error in (False, True)]
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(verify_list_stream_retry()) else 1)
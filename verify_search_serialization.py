@@ -0,0 +1,122 @@
+"""
+Golden check of the /search serialization fast path.
+
+Maps Solr documents with both paths, for every projection profile:
+
+- reference: DTO -> jsonable_encoder -> JSONResponse (what FastAPI renders);
+- fast: TenderTransformer.solr_doc_to_profile_item -> render_json;
+
+and requires byte-identical items and /search bodies (or the same validation
+error). Documents come from the checked-in fixtures plus edge cases: list
+valued and missing fields, date formats, int/str/NaN numbers, escapes.
+
+Usage:
+    python verify_search_serialization.py
+"""
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from app.application.fast_json import render_json
+from app.application.transformer_service import TenderTransformer
+from app.domain.schemas import LicitacionDetailResponse, SearchProfile
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).parent
+
+
+def fixture_docs() -> List[Dict[str, Any]]:
+    """Stored Solr documents shaped from the listings and the detail fixture."""
+    detail = LicitacionDetailResponse(**json.loads((ROOT / "licitacion 2732-49-LE25.json").read_bytes()))
+    template = TenderTransformer.to_index_doc(detail.listado[0]).model_dump(mode="json")
+    template["publish_date"] = f"{template['publish_date'][:19]}Z"
+    docs = []
+    for path in sorted(ROOT.glob("licitaciones_list *.json")):
+        for number, item in enumerate(json.loads(path.read_bytes())["Listado"]):
+            closing = item.get("FechaCierre")
+            docs.append({
+                **template,
+                "id": item["CodigoExterno"],
+                "title": item["Nombre"],
+                "status_code": item["CodigoEstado"],
+                "closing_date": f"{closing[:19]}Z" if closing else None,
+                "amount": [0, 5000, 1234.5, 1e20][number % 4],
+                "score": [3.21, 1, 0.0001234][number % 3],
+            })
+    return docs
+
+
+def edge_docs() -> List[Dict[str, Any]]:
+    base = {"id": "1-1-LE25", "title": "Servicio", "status_code": 5, "score": 1.5}
+    return [
+        {},
+        {"id": "2-2-LE25"},
+        {**base, "title": ["Título en lista"], "entity": [], "region": ["Región de Ñuble"], "status_code": [8]},
+        {**base, "title": 'Comillas " barra \\ salto\nfin   \U0001F600 \x01', "description": "<b>&</b>"},
+        {**base, "closing_date": "2025-12-09T16:37:40.38Z", "publish_date": "2025-12-09T16:37:40.380000Z"},
+        {**base, "closing_date": "2026-01-01T10:00:00-03:00", "publish_date": "2026-01-01T00:00:00"},
+        {**base, "closing_date": "2026-01-01", "publish_date": ["2026-01-01T00:00:00.000001+00:00"]},
+        {**base, "closing_date": 1767225600, "publish_date": "not a date"},
+        {**base, "closing_date": [None], "publish_date": None},
+        {**base, "amount": "5000", "complaints_count": 3.0, "products_count": "7"},
+        {**base, "amount": float("nan"), "score": float("inf")},
+        {**base, "amount": True, "complaints_count": False, "score": None},
+        {**base, "amount": [-0.0], "complaints_count": [12], "products_count": [], "type": ["LP"]},
+        {**base, "id": 12345, "currency": None, "complaints_level": ["medio"]},
+        {**base, "url": "", "comuna": 0, "type": "XX"},
+    ]
+
+
+def render(content: Any) -> bytes:
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def outcome(fn) -> Any:
+    try:
+        return fn()
+    except (ValidationError, ValueError, TypeError) as e:
+        return type(e)
+
+
+def verify_search_serialization() -> bool:
+    docs = fixture_docs() + edge_docs()
+    page = docs[:100]
+    envelope = {"query": "camión ñandú", "status_codes": [5, 6], "page": 1, "size": 100, "total": 12345, "totalPages": 124}
+    mismatches = 0
+    for profile in SearchProfile:
+        for doc in docs:
+            reference = outcome(lambda: render(TenderTransformer.solr_doc_to_profile_dto(doc, profile)))
+            fast = outcome(lambda: render_json(TenderTransformer.solr_doc_to_profile_item(doc, profile)))
+            if reference != fast:
+                mismatches += 1
+                logger.error(f"❌ {profile.value} item differs for {doc!r}:\n  reference: {reference!r}\n  fast:      {fast!r}")
+
+        # Whole /search body, envelope included
+        reference = render({**envelope, "items": [TenderTransformer.solr_doc_to_profile_dto(doc, profile) for doc in page]})
+        fast = render_json({**envelope, "items": [TenderTransformer.solr_doc_to_profile_item(doc, profile) for doc in page]})
+        if reference != fast:
+            mismatches += 1
+            logger.error(f"❌ {profile.value} /search body differs")
+
+    checked = len(docs) * len(SearchProfile)
+    if mismatches:
+        logger.error(f"❌ {mismatches} mismatches ({checked} items checked)")
+        return False
+    logger.info(f"✅ Fast path is byte-identical on {checked} items and {len(SearchProfile)} /search bodies")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify_search_serialization() else 1)